@@ -0,0 +1,104 @@
+"""
+Chat modelinin çıkarım backend'lerini (eager, quantized, torchscript) karşılaştırır.
+
+Kullanım (backend/api dizininden):
+    python -m benchmarks.backend_benchmark --model ./models/your_trained_model.pt \\
+        [--eval-set sorular.txt] [--batch-size 8] [--repeat 5]
+
+Her backend ayrı bir süreçte çalıştırılır; böylece tepe bellek kullanımı (peak RSS) diğer
+backend'lerden etkilenmez. Raporlanan değerler:
+- p50 / p99: Batch başına gecikme (ms)
+- throughput: Saniyede işlenen metin sayısı
+- peak RSS: Sürecin en yüksek bellek kullanımı (MB)
+- agreement: `postprocess_batch` etiketlerinin eager backend ile aynı olduğu metinlerin oranı
+"""
+import argparse
+import multiprocessing
+import resource
+import statistics
+import time
+
+from services.chat_model import INFERENCE_BACKENDS
+
+SIGNS = ["koç", "boğa", "ikizler", "yengeç", "aslan", "başak", "terazi", "akrep", "yay", "oğlak", "kova", "balık"]
+QUESTIONS = [
+    "bugün {} burcu için neler var",
+    "{} burcu bu hafta aşkta şanslı mı",
+    "{} için kariyer yorumu nedir",
+    "{} burcunun sağlık durumu nasıl olacak",
+    "what does today hold for {}",
+    "is {} lucky with money this month",
+    "{} burcu yeni bir işe başlamalı mı",
+    "{} ile hangi burçlar uyumlu",
+]
+
+def default_eval_set() -> list:
+    return [question.format(sign) for sign in SIGNS for question in QUESTIONS]
+
+def load_eval_set(path: str) -> list:
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+def percentile(values: list, q: float) -> float:
+    values = sorted(values)
+    index = min(int(round(q / 100 * (len(values) - 1))), len(values) - 1)
+    return values[index]
+
+def run_backend(model_path: str, backend: str, texts: list, batch_size: int, repeat: int) -> dict:
+    from services.chat_model import load_model, run_model
+
+    model = load_model(model_path, backend=backend)
+    batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+    labels = [label for batch in batches for label in run_model(model, batch)]
+
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for batch in batches:
+            batch_start = time.perf_counter()
+            run_model(model, batch)
+            latencies.append((time.perf_counter() - batch_start) * 1000)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "backend": backend,
+        "p50_ms": statistics.median(latencies),
+        "p99_ms": percentile(latencies, 99),
+        "throughput": len(texts) * repeat / elapsed,
+        # Linux'ta ru_maxrss KB cinsindendir
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "labels": labels,
+    }
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", required=True)
+    parser.add_argument("--eval-set")
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--backends", default=",".join(INFERENCE_BACKENDS))
+    args = parser.parse_args()
+
+    texts = load_eval_set(args.eval_set) if args.eval_set else default_eval_set()
+    backends = args.backends.split(",")
+    if "eager" not in backends:
+        backends.insert(0, "eager")
+
+    context = multiprocessing.get_context("spawn")
+    results = []
+    for backend in backends:
+        with context.Pool(1) as pool:
+            results.append(pool.apply(run_backend, (args.model, backend, texts, args.batch_size, args.repeat)))
+
+    baseline = next(result["labels"] for result in results if result["backend"] == "eager")
+    print(f"{len(texts)} texts, batch size {args.batch_size}, {args.repeat} repeats")
+    print(f"{'backend':<12} {'p50 ms':>8} {'p99 ms':>8} {'text/s':>9} {'peak RSS MB':>12} {'agreement':>10}")
+    for result in results:
+        agreement = sum(a == b for a, b in zip(result["labels"], baseline)) / len(baseline)
+        print(
+            f"{result['backend']:<12} {result['p50_ms']:>8.2f} {result['p99_ms']:>8.2f} "
+            f"{result['throughput']:>9.0f} {result['peak_rss_mb']:>12.1f} {agreement:>9.1%}"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Yoğun giriş (login storm) altında giriş hızını ve diğer endpoint'lerin gecikmesini ölçer.
+
+Kullanım (backend/api dizininden):
+    python -m benchmarks.login_benchmark [--concurrency 32] [--duration 10] [--users 50] \\
+        [--rounds 12] [--probe-paths /health/live,/users/users?limit=20] [--url http://127.0.0.1:8000]
+
+`--url` verilmezse uygulama geçici bir SQLite veritabanıyla ayrı bir uvicorn sürecinde başlatılır
+(`BCRYPT_ROUNDS` olarak `--rounds` kullanılır). İki sürümü karşılaştırırken ikisi de aynı bcrypt
+maliyetiyle çalıştırılmalıdır; `BCRYPT_ROUNDS` öncesi kod her zaman 12 kullanır. İki aşama çalıştırılır:
+1. baseline: Yalnızca diğer endpoint'lere istek atılır.
+2. storm: Aynı istekler `--concurrency` eşzamanlı giriş isteğiyle birlikte atılır.
+
+Raporlanan değerler:
+- login/s: Saniyede başarılı giriş sayısı ve reddedilen (503) giriş sayısı
+- p50 / p99: Giriş ve diğer endpoint'lerin istek gecikmeleri (ms)
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+PASSWORD = "benchmark-password"
+
+def percentile(values: list, q: float) -> float:
+    values = sorted(values)
+    index = min(int(round(q / 100 * (len(values) - 1))), len(values) - 1)
+    return values[index]
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def start_server(port: int, rounds: int, workdir: str) -> subprocess.Popen:
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{os.path.join(workdir, 'bench.db')}",
+        DB_AUTO_MIGRATE="true",
+        BCRYPT_ROUNDS=str(rounds),
+        AUTH_SECRET_KEY=os.getenv("AUTH_SECRET_KEY", "benchmark"),
+        AUTH_ALGORITHM=os.getenv("AUTH_ALGORITHM", "HS256"),
+    )
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        env=env,
+    )
+
+async def wait_until_live(client: httpx.AsyncClient, timeout: float = 60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get("/health/live")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("Server did not become live")
+
+async def create_users(client: httpx.AsyncClient, count: int) -> list:
+    usernames = [f"bench_{os.getpid()}_{i}" for i in range(count)]
+    for username in usernames:
+        await client.post("/auth/", json={"username": username, "password": PASSWORD})
+    return usernames
+
+async def probe(client: httpx.AsyncClient, paths: list, until: float, latencies: list):
+    # Sabit aralıklarla gönderilir; böylece ölçüm sunucunun yanıt hızından bağımsız kalır
+    while time.monotonic() < until:
+        for path in paths:
+            start = time.perf_counter()
+            await client.get(path)
+            latencies.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(0.01)
+
+async def login_loop(client: httpx.AsyncClient, usernames: list, offset: int, until: float, result: dict):
+    i = offset
+    while time.monotonic() < until:
+        username = usernames[i % len(usernames)]
+        i += 1
+        start = time.perf_counter()
+        response = await client.post("/auth/token", data={"username": username, "password": PASSWORD})
+        if response.status_code == 200:
+            result["latencies"].append((time.perf_counter() - start) * 1000)
+        else:
+            result["rejected"] += 1
+
+async def run_phase(client: httpx.AsyncClient, usernames: list, args, concurrency: int) -> dict:
+    until = time.monotonic() + args.duration
+    probe_latencies = []
+    login = {"latencies": [], "rejected": 0}
+    start = time.perf_counter()
+    await asyncio.gather(
+        probe(client, args.probe_paths.split(","), until, probe_latencies),
+        *(login_loop(client, usernames, i, until, login) for i in range(concurrency)),
+    )
+    elapsed = time.perf_counter() - start
+    return {
+        "logins_per_second": len(login["latencies"]) / elapsed,
+        "rejected": login["rejected"],
+        "login_p50_ms": statistics.median(login["latencies"]) if login["latencies"] else 0.0,
+        "login_p99_ms": percentile(login["latencies"], 99) if login["latencies"] else 0.0,
+        "probe_p50_ms": statistics.median(probe_latencies),
+        "probe_p99_ms": percentile(probe_latencies, 99),
+        "probes": len(probe_latencies),
+    }
+
+async def run(args):
+    limits = httpx.Limits(max_connections=args.concurrency + 8)
+    async with httpx.AsyncClient(base_url=args.url, timeout=60, limits=limits) as client:
+        await wait_until_live(client)
+        usernames = await create_users(client, args.users)
+        return {
+            "baseline": await run_phase(client, usernames, args, 0),
+            "storm": await run_phase(client, usernames, args, args.concurrency),
+        }
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=12)
+    parser.add_argument("--probe-paths", default="/health/live,/users/users?limit=20")
+    args = parser.parse_args()
+
+    server = None
+    with tempfile.TemporaryDirectory() as workdir:
+        if args.url is None:
+            port = free_port()
+            args.url = f"http://127.0.0.1:{port}"
+            server = start_server(port, args.rounds, workdir)
+        try:
+            results = asyncio.run(run(args))
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait()
+
+    print(f"{args.concurrency} concurrent logins, {args.duration:.0f}s per phase, probes: {args.probe_paths}")
+    print(
+        f"{'phase':<9} {'login/s':>8} {'rejected':>9} {'login p50':>10} {'login p99':>10} "
+        f"{'probe p50':>10} {'probe p99':>10}"
+    )
+    for phase, result in results.items():
+        print(
+            f"{phase:<9} {result['logins_per_second']:>8.1f} {result['rejected']:>9} "
+            f"{result['login_p50_ms']:>10.1f} {result['login_p99_ms']:>10.1f} "
+            f"{result['probe_p50_ms']:>10.1f} {result['probe_p99_ms']:>10.1f}"
+        )
+
+if __name__ == "__main__":
+    main()
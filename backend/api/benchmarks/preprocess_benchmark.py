@@ -0,0 +1,59 @@
+"""
+Metin ön/son işleme için tek tek ve batch halinde çalışan yolların karşılaştırması.
+
+Kullanım (backend/api dizininden):
+    python -m benchmarks.preprocess_benchmark [--repeat 200]
+
+Her batch boyutu için saniyede işlenen metin sayısını ve batch yolunun hızlanma oranını yazdırır.
+"""
+import argparse
+import random
+import time
+
+import torch
+from torch.nn.utils.rnn import pad_sequence
+
+from services.chat_model import (
+    postprocess_batch,
+    postprocess_output,
+    preprocess_batch,
+    preprocess_input,
+)
+
+BATCH_SIZES = [1, 2, 4, 8, 16, 32, 64]
+WORDS = "bugün yarın aşk para kariyer sağlık koç boğa ikizler yengeç aslan başak leo today love".split()
+
+def sample_texts(count: int) -> list:
+    return [" ".join(random.choices(WORDS, k=random.randint(3, 30))) for _ in range(count)]
+
+def per_item(texts, logits):
+    inputs = pad_sequence([preprocess_input(text) for text in texts], batch_first=True)
+    return inputs, [postprocess_output(row) for row in logits]
+
+def batched(texts, logits):
+    inputs, _ = preprocess_batch(texts)
+    return inputs, postprocess_batch(logits)
+
+def measure(fn, texts, logits, repeat: int) -> float:
+    fn(texts, logits)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(texts, logits)
+    return len(texts) * repeat / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    random.seed(0)
+    print(f"{'batch':>5} {'per-item text/s':>16} {'batched text/s':>15} {'speedup':>8}")
+    for size in BATCH_SIZES:
+        texts = sample_texts(size)
+        logits = torch.randn(size, 2)
+        item_rate = measure(per_item, texts, logits, args.repeat)
+        batch_rate = measure(batched, texts, logits, args.repeat)
+        print(f"{size:>5} {item_rate:>16.0f} {batch_rate:>15.0f} {batch_rate / item_rate:>7.2f}x")
+
+if __name__ == "__main__":
+    main()
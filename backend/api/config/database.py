@@ -1,10 +1,126 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from sqlalchemy.orm import sessionmaker
+from dotenv import load_dotenv
+import os
 
-SQL_ALCHEMY_URL = 'sqlite:///x_app.db'
+load_dotenv()
 
-engine = create_engine(SQL_ALCHEMY_URL, connect_args={"check_same_thread": False})
+SQL_ALCHEMY_URL = os.getenv("DATABASE_URL", "sqlite:///x_app.db")
+# Route'ların kullandığı asenkron sürücü; verilmezse DATABASE_URL'den türetilir
+ASYNC_SQL_ALCHEMY_URL = os.getenv("ASYNC_DATABASE_URL")
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+# Saniye; -1 bağlantıların hiç yenilenmemesi demektir
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_ECHO = os.getenv("DB_ECHO", "false").lower() in ("1", "true", "yes")
+# true: bekleyen migration'lar uygulama başlarken uygulanır (yalnızca geliştirme ortamı için)
+DB_AUTO_MIGRATE = os.getenv("DB_AUTO_MIGRATE", "false").lower() in ("1", "true", "yes")
+
+# Yalnızca SQLite için; her yeni bağlantıda PRAGMA olarak uygulanır
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+# Negatif değer KiB cinsindendir (-65536 = 64 MiB sayfa önbelleği)
+SQLITE_CACHE_SIZE = int(os.getenv("SQLITE_CACHE_SIZE", "-65536"))
+
+# Senkron sürücülerin asenkron karşılıkları
+ASYNC_DRIVERS = {
+  "sqlite": "sqlite+aiosqlite",
+  "postgresql": "postgresql+asyncpg",
+  "mysql": "mysql+aiomysql",
+}
+
+def to_async_url(url: str) -> str:
+  """Senkron bağlantı adresini aynı veritabanına giden asenkron sürücülü adrese çevirir."""
+  database_url = make_url(url)
+  backend = database_url.get_backend_name()
+  if backend not in ASYNC_DRIVERS:
+    raise ValueError(f"No async driver configured for '{backend}', set ASYNC_DATABASE_URL")
+  return database_url.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+def _is_in_memory(url) -> bool:
+  return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+def _engine_args(url: str) -> dict:
+  database_url = make_url(url)
+  engine_args = {"echo": DB_ECHO, "pool_pre_ping": DB_POOL_PRE_PING}
+  if database_url.get_backend_name() == "sqlite":
+    engine_args["connect_args"] = {"check_same_thread": False}
+  if not _is_in_memory(database_url):
+    # Bellek içi SQLite tek bir bağlantı kullanır; havuz ayarları yalnızca diğer durumlarda geçerlidir
+    engine_args.update(
+      pool_size=DB_POOL_SIZE,
+      max_overflow=DB_MAX_OVERFLOW,
+      pool_timeout=DB_POOL_TIMEOUT,
+      pool_recycle=DB_POOL_RECYCLE,
+    )
+  return engine_args
+
+def _set_sqlite_pragmas(sync_engine, in_memory: bool):
+  @event.listens_for(sync_engine, "connect")
+  def set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    if not in_memory:
+      cursor.execute(f"PRAGMA journal_mode={SQLITE_JOURNAL_MODE}")
+    cursor.execute(f"PRAGMA synchronous={SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+    cursor.execute(f"PRAGMA cache_size={SQLITE_CACHE_SIZE}")
+    cursor.close()
+
+def create_db_engine(url: str = SQL_ALCHEMY_URL):
+  """
+  Yapılandırmaya göre SQLAlchemy engine'i oluşturur.
+
+  Sunucu veritabanlarında (PostgreSQL, MySQL vb.) bağlantı havuzu `DB_POOL_*` ayarlarıyla
+  kurulur. SQLite'ta ayrıca her bağlantıda WAL, `synchronous`, `busy_timeout`, `mmap_size`
+  ve `cache_size` pragmaları uygulanır; WAL modunda okumalar yazma sürerken beklemez,
+  `busy_timeout` ise eşzamanlı yazmalarda anında "database is locked" hatası yerine
+  kilidin bırakılmasını bekletir.
+
+  Parametreler:
+  - url (str): Veritabanı bağlantı adresi.
+
+  Dönen Değer:
+  - Engine: Yapılandırılmış SQLAlchemy engine'i.
+  """
+  db_engine = create_engine(url, **_engine_args(url))
+  database_url = make_url(url)
+  if database_url.get_backend_name() == "sqlite":
+    _set_sqlite_pragmas(db_engine, _is_in_memory(database_url))
+  return db_engine
+
+def create_async_db_engine(url: str):
+  """
+  `create_db_engine` ile aynı havuz ve pragma ayarlarını kullanan asenkron engine'i oluşturur.
+
+  Route'lar bu engine üzerinden çalışır; sorgular event loop'u bloklamaz ve eşzamanlılık
+  thread havuzunun boyutuyla değil bağlantı havuzunun boyutuyla sınırlanır.
+  """
+  engine_args = _engine_args(url)
+  database_url = make_url(url)
+  if database_url.get_backend_name() == "sqlite" and not _is_in_memory(database_url):
+    # aiosqlite varsayılan olarak her oturumda yeni bağlantı açar (NullPool); bağlantılar ve
+    # üzerlerindeki pragmalar yeniden kullanılsın diye havuz açıkça seçilir
+    engine_args["poolclass"] = AsyncAdaptedQueuePool
+  db_engine = create_async_engine(url, **engine_args)
+  if database_url.get_backend_name() == "sqlite":
+    _set_sqlite_pragmas(db_engine.sync_engine, _is_in_memory(database_url))
+  return db_engine
+
+engine = create_db_engine()
 SessionLocal = sessionmaker(autoflush=False, bind=engine)
 
-Base = declarative_base()
\ No newline at end of file
+# Asenkron oturumlarda commit sonrası nesneler expire edilmez; expire edilmiş bir özniteliğe
+# erişmek event loop dışında tembel (lazy) bir sorgu gerektirirdi
+async_engine = create_async_db_engine(ASYNC_SQL_ALCHEMY_URL or to_async_url(SQL_ALCHEMY_URL))
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+Base = declarative_base()
@@ -0,0 +1,30 @@
+from dotenv import load_dotenv
+import os
+from services.media import MediaPipeline
+from services.media_storage import create_storage
+
+load_dotenv()
+
+# Medya dosyalarının saklandığı yer (`services.media_storage.STORAGE_BACKENDS`); "local" dosyaları
+# MEDIA_ROOT altına yazar ve MEDIA_URL_PATH altında sunar
+MEDIA_STORAGE_BACKEND = os.getenv("MEDIA_STORAGE_BACKEND", "cloudinary")
+MEDIA_ROOT = os.getenv("MEDIA_ROOT", "./media")
+MEDIA_URL_PATH = "/media"
+MEDIA_BASE_URL = os.getenv("MEDIA_BASE_URL", f"http://localhost:8000{MEDIA_URL_PATH}")
+# Medya türü başına en büyük dosya boyutu (bayt)
+MEDIA_IMAGE_MAX_BYTES = int(os.getenv("MEDIA_IMAGE_MAX_BYTES", str(5 * 1024 * 1024)))
+MEDIA_AUDIO_MAX_BYTES = int(os.getenv("MEDIA_AUDIO_MAX_BYTES", str(10 * 1024 * 1024)))
+MEDIA_VIDEO_MAX_BYTES = int(os.getenv("MEDIA_VIDEO_MAX_BYTES", str(50 * 1024 * 1024)))
+MEDIA_WORKERS = int(os.getenv("MEDIA_WORKERS", str(min(4, os.cpu_count() or 1))))
+MEDIA_MAX_PENDING = int(os.getenv("MEDIA_MAX_PENDING", "32"))
+MEDIA_IMAGE_MAX_DIMENSION = int(os.getenv("MEDIA_IMAGE_MAX_DIMENSION", "2048"))
+MEDIA_THUMBNAIL_SIZE = int(os.getenv("MEDIA_THUMBNAIL_SIZE", "320"))
+
+media_pipeline = MediaPipeline(
+  create_storage(MEDIA_STORAGE_BACKEND, root=MEDIA_ROOT, base_url=MEDIA_BASE_URL),
+  limits={"image": MEDIA_IMAGE_MAX_BYTES, "audio": MEDIA_AUDIO_MAX_BYTES, "video": MEDIA_VIDEO_MAX_BYTES},
+  max_workers=MEDIA_WORKERS,
+  max_pending=MEDIA_MAX_PENDING,
+  image_max_dimension=MEDIA_IMAGE_MAX_DIMENSION,
+  thumbnail_size=MEDIA_THUMBNAIL_SIZE,
+)
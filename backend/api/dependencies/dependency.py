@@ -1,17 +1,29 @@
 from typing import Annotated
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from passlib.context import CryptContext
 from jose import jwt, JWTError
 from dotenv import load_dotenv
 import os
-from config.database import SessionLocal
+from config.database import SessionLocal, AsyncSessionLocal
+from services.media import MediaError, MediaPipelineBusyError, MediaTooLargeError, UnsupportedMediaTypeError
+from services.passwords import PasswordHasher
+from services.token_cache import TokenCache
 
 load_dotenv()
 
 SECRET_KEY = os.getenv("AUTH_SECRET_KEY")
 ALGORITHM = os.getenv("AUTH_ALGORITHM")
+# Doğrulanmış token önbelleğindeki en fazla token sayısı; 0 önbelleği kapatır
+AUTH_TOKEN_CACHE_SIZE = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "10000"))
+
+token_cache = TokenCache(max_entries=AUTH_TOKEN_CACHE_SIZE, enabled=AUTH_TOKEN_CACHE_SIZE > 0)
+# bcrypt maliyet faktörü; değiştirildiğinde mevcut parolalar ilk başarılı girişte yeniden hash'lenir
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+# Aynı anda çalışan en fazla hash işlemi ve toplam bekleyen işlem sınırı (0 = sınırsız)
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))
 
 def get_db():
   db = SessionLocal()
@@ -22,20 +34,64 @@ def get_db():
 
 db_dependency = Annotated[Session, Depends(get_db)]
 
-bcrypt_context = CryptContext(schemes=['bcrypt'], deprecated='auto')
+async def get_async_db():
+  # Sorgular event loop'u bloklamadan asenkron engine'in bağlantı havuzu üzerinden çalışır
+  async with AsyncSessionLocal() as db:
+    yield db
+
+async_db_dependency = Annotated[AsyncSession, Depends(get_async_db)]
+
+password_hasher = PasswordHasher(
+  rounds=BCRYPT_ROUNDS,
+  max_workers=PASSWORD_HASH_WORKERS,
+  max_pending=PASSWORD_HASH_MAX_PENDING,
+)
+
+def media_error(error: Exception) -> HTTPException:
+  """Medya yükleme sırasında oluşan hatayı uygun HTTP hatasına çevirir."""
+  if isinstance(error, MediaTooLargeError):
+    return HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(error))
+  if isinstance(error, UnsupportedMediaTypeError):
+    return HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail=str(error))
+  if isinstance(error, MediaPipelineBusyError):
+    return HTTPException(
+      status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+      detail="Too many uploads in progress, please try again.",
+      headers={"Retry-After": "1"},
+    )
+  if isinstance(error, MediaError):
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(error))
+  return HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Media upload failed: {error}")
+
 oauth2_bearer = OAuth2PasswordBearer(tokenUrl='auth/token')
 oauth2_bearer_dependency = Annotated[str, Depends(oauth2_bearer)]
 
-async def get_current_user(token: oauth2_bearer_dependency):
-  try:
-    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-    username: str = payload.get("sub")
-    user_id: int = payload.get("id")
-    if username is None or user_id is None:
+def decode_token(token: str) -> dict:
+  """
+    JWT'yi doğrular ve claim'lerini döndürür.
+
+    Aynı token ile gelen isteklerde imza ve süre kontrolü tekrarlanmaz; claim'ler token'ın
+    `exp` zamanına kadar `token_cache` üzerinden okunur, süresi dolan token yeniden çözülür
+    ve `jwt.decode` tarafından reddedilir.
+
+    Hata Durumları:
+    - Token geçersizse, süresi dolmuşsa, `sub`/`id` içermiyorsa veya bir yenileme token'ıysa
+      401 Unauthorized hatası döner.
+  """
+  payload = token_cache.get(token)
+  if payload is None:
+    try:
+      payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
       raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-    
-    return {"username": username, "id": user_id}
-  except JWTError:
-    raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+    # Yenileme token'ları erişim token'ı olarak kabul edilmez
+    if payload.get("sub") is None or payload.get("id") is None or payload.get("type") == "refresh":
+      raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+    token_cache.set(token, payload)
+  return payload
+
+async def get_current_user(token: oauth2_bearer_dependency):
+  payload = decode_token(token)
+  return {"username": payload["sub"], "id": payload["id"]}
   
 user_dependency = Annotated[dict, Depends(get_current_user)]
\ No newline at end of file
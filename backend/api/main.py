@@ -1,12 +1,41 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.staticfiles import StaticFiles
+from starlette.concurrency import run_in_threadpool
 
-from routes import users, auth, messages, tweet, chat_messages
-from config.database import Base, engine
+from routes import users, auth, messages, tweet, chat_messages, health
+from config.database import DB_AUTO_MIGRATE, engine, async_engine
+from migrations.runner import ensure_up_to_date, upgrade
+from config.media import MEDIA_ROOT, MEDIA_STORAGE_BACKEND, MEDIA_URL_PATH, media_pipeline
+from dependencies.dependency import password_hasher
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+  # Şema `python -m migrations.cli upgrade` ile güncellenir; eski bir şemayla başlanmaz
+  if DB_AUTO_MIGRATE:
+    upgrade(engine)
+  ensure_up_to_date(engine)
+  if chat_messages.chat_writer is not None:
+    chat_messages.chat_writer.start()
+  await chat_messages.reply_batcher.start()
+  await messages.message_hub.start()
+  # Model arka planda yüklenir; hazır olana kadar /health/ready 503 döner
+  chat_messages.model_registry.load_in_background(chat_messages.MODEL_PATH)
+  yield
+  # Açık WebSocket bağlantıları kapatılır; aksi halde sunucu kapanırken onları bekler
+  await messages.message_hub.stop()
+  await chat_messages.reply_batcher.stop()
+  chat_messages.model_registry.close()
+  if chat_messages.chat_writer is not None:
+    # Tamponda bekleyen mesajlar kapanmadan önce yazılır
+    await run_in_threadpool(chat_messages.chat_writer.stop)
+  password_hasher.shutdown()
+  media_pipeline.shutdown()
+  # Havuzdaki asenkron bağlantılar kapatılmazsa süreç kapanırken bekler
+  await async_engine.dispose()
 
-Base.metadata.create_all(bind=engine)
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
   CORSMiddleware,
@@ -20,4 +49,9 @@ app.include_router(auth.router)
 app.include_router(users.router)
 app.include_router(messages.router)
 app.include_router(tweet.router)
-app.include_router(chat_messages.router)
\ No newline at end of file
+app.include_router(chat_messages.router)
+app.include_router(health.router)
+
+if MEDIA_STORAGE_BACKEND == "local":
+  # Yerel saklama alanındaki dosyalar geliştirme ortamında doğrudan API üzerinden sunulur
+  app.mount(MEDIA_URL_PATH, StaticFiles(directory=MEDIA_ROOT, check_dir=False), name="media")
\ No newline at end of file
@@ -0,0 +1,59 @@
+"""
+Şema migration komutları.
+
+Kullanım (backend/api dizininden):
+    python -m migrations.cli upgrade [--to SÜRÜM]
+    python -m migrations.cli status
+    python -m migrations.cli check-plans
+    python -m migrations.cli reconcile-counters [--batch-size N]
+    python -m migrations.cli prune-refresh-tokens
+
+`reconcile-counters` sayaç sütunlarındaki sapmaları düzeltir; `prune-refresh-tokens` süresi dolmuş
+yenileme token'ı kayıtlarını siler. İkisi de periyodik (ör. cron) çalıştırılabilir.
+"""
+import argparse
+import sys
+
+from config.database import engine
+from migrations.query_plans import check_query_plans
+from migrations.runner import discover, ensure_up_to_date, pending, upgrade
+from services.counters import RECONCILE_BATCH_SIZE, reconcile_counters
+from services.refresh_tokens import prune_refresh_tokens
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m migrations.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+    upgrade_parser = commands.add_parser("upgrade", help="Bekleyen migration'ları uygular")
+    upgrade_parser.add_argument("--to", dest="target", help="Bu sürüme kadar uygula (ör. 0002)")
+    commands.add_parser("status", help="Uygulanmış ve bekleyen migration'ları listeler")
+    commands.add_parser("check-plans", help="Route sorgularının indeks kullandığını doğrular")
+    reconcile_parser = commands.add_parser("reconcile-counters", help="Sayaçları gerçek sayılarla eşitler")
+    reconcile_parser.add_argument("--batch-size", type=int, default=RECONCILE_BATCH_SIZE)
+    commands.add_parser("prune-refresh-tokens", help="Süresi dolmuş yenileme token'larını siler")
+    args = parser.parse_args(argv)
+
+    if args.command == "upgrade":
+        applied = upgrade(engine, target=args.target)
+        print(f"{len(applied)} migration(s) applied" if applied else "Database is up to date")
+        return 0
+    if args.command == "status":
+        waiting = {migration.version for migration in pending(engine)}
+        for migration in discover():
+            print(f"{'pending' if migration.version in waiting else 'applied'}  {migration.version}_{migration.name}")
+        return 0
+    if args.command == "check-plans":
+        return 0 if check_query_plans(engine) else 1
+    if args.command == "reconcile-counters":
+        ensure_up_to_date(engine)
+        reconcile_counters(engine, batch_size=args.batch_size)
+        return 0
+    if args.command == "prune-refresh-tokens":
+        ensure_up_to_date(engine)
+        prune_refresh_tokens(engine)
+        return 0
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,39 @@
+from typing import Sequence
+
+from sqlalchemy import Column, Index, MetaData, Table, func, select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.schema import CreateColumn
+
+
+def reflect_table(connection: Connection, table_name: str) -> Table:
+    """Tablonun veritabanındaki güncel halini okur (model tanımlarından bağımsız)."""
+    return Table(table_name, MetaData(), autoload_with=connection)
+
+
+def create_index(connection: Connection, name: str, table_name: str, columns: Sequence[str], unique: bool = False):
+    """İndeksi yoksa oluşturur; önceden `create_all` ile oluşturulmuş veritabanlarında tekrar denenmez."""
+    table = reflect_table(connection, table_name)
+    Index(name, *(table.c[column] for column in columns), unique=unique).create(connection, checkfirst=True)
+
+
+def delete_duplicates(connection: Connection, table_name: str, columns: Sequence[str]) -> int:
+    """
+    `columns` değerleri aynı olan satırlardan yalnızca en eskisini (en küçük id) bırakır.
+
+    Benzersiz indeks eklenmeden önce çağrılır; aksi halde mevcut tekrarlar indeks oluşturmayı
+    başarısız kılar.
+
+    Dönen Değer:
+    - int: Silinen satır sayısı.
+    """
+    table = reflect_table(connection, table_name)
+    keep = select(func.min(table.c.id)).group_by(*(table.c[column] for column in columns))
+    return connection.execute(table.delete().where(table.c.id.not_in(keep))).rowcount
+
+
+def add_column(connection: Connection, table_name: str, column: Column):
+    """Sütunu yoksa `ALTER TABLE … ADD COLUMN` ile ekler."""
+    if column.name in reflect_table(connection, table_name).c:
+        return
+    definition = CreateColumn(column).compile(dialect=connection.dialect)
+    connection.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {definition}"))
@@ -0,0 +1,161 @@
+from datetime import datetime
+from typing import Dict, List
+
+from sqlalchemy import exists, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.sql import Select
+
+from models.user import User, follows
+from models.tweet import Tweet
+from models.message import Message
+from models.conversation import Conversation
+from models.chat_message import ChatMessage
+from models.feed import FeedEntry
+from models.refresh_token import RefreshToken
+from services.feed import feed_cutoff_query, followed_pull_authors_query
+from services.follow_graph import relationship_query
+from services.pagination import encode_cursor, keyset_condition
+
+# Bilinçli olarak tamamı okunan küçük tablolar (ör. yalnızca çok takipçili yazarlar)
+SMALL_TABLES = {"feed_pull_authors"}
+
+
+def route_queries() -> Dict[str, Select]:
+    """Her route'un ana sorgusunun örnek parametrelerle bir kopyası."""
+    page_cursor = encode_cursor(datetime(2024, 1, 1), 1)
+    return {
+        "POST /auth/token": select(User).where(User.username == "username"),
+        "POST /auth/refresh": select(RefreshToken).where(RefreshToken.jti == "jti"),
+        "POST /auth/refresh (revoke family)": select(RefreshToken.jti).where(
+            RefreshToken.family_id == "family", RefreshToken.revoked_at.is_(None)
+        ),
+        "prune-refresh-tokens": select(RefreshToken.jti).where(RefreshToken.expires_at <= datetime(2024, 1, 1)),
+        "GET /users/{user_id}": select(User).where(User.id == 1),
+        "GET /users/users?cursor=": (
+            select(User.id, User.username, User.first_name, User.last_name, User.profile)
+            .where(User.id > 1)
+            .order_by(User.id)
+            .limit(51)
+        ),
+        "GET /users/batch": select(User.id, User.username, User.profile).where(User.id.in_(range(1, 201))),
+        "GET /users/{user_id}/stats": (
+            select(User.follower_count, User.following_count, User.tweet_count).where(User.id == 1)
+        ),
+        "GET /users/{user_id}/following": (
+            select(User).join(follows, follows.c.following_id == User.id).where(follows.c.follower_id == 1)
+        ),
+        "GET /users/{user_id}/followers": (
+            select(User).join(follows, follows.c.follower_id == User.id).where(follows.c.following_id == 1)
+        ),
+        "GET /users/{user_id}/is-following": select(
+            exists().where(follows.c.follower_id == 1, follows.c.following_id == 2)
+        ),
+        "GET /users/relationships": relationship_query(1, range(2, 302)),
+        "GET /tweets/": select(Tweet).order_by(Tweet.created_at.desc(), Tweet.id.desc()).limit(21),
+        "GET /tweets/?cursor=": (
+            select(Tweet)
+            .where(keyset_condition(Tweet.created_at, Tweet.id, page_cursor, before=True))
+            .order_by(Tweet.created_at.desc(), Tweet.id.desc())
+            .limit(21)
+        ),
+        "GET /tweets/feed?cursor= (materialized)": (
+            select(Tweet)
+            .join(FeedEntry, FeedEntry.tweet_id == Tweet.id)
+            .where(
+                FeedEntry.user_id == 1,
+                keyset_condition(FeedEntry.created_at, FeedEntry.tweet_id, page_cursor, before=True),
+            )
+            .order_by(FeedEntry.created_at.desc(), FeedEntry.tweet_id.desc())
+            .limit(21)
+        ),
+        "GET /tweets/feed (followed pull authors)": followed_pull_authors_query(1),
+        "POST /tweets/ (trim feeds)": feed_cutoff_query(1),
+        "GET /tweets/my_tweets?cursor=": (
+            select(Tweet)
+            .where(Tweet.user_id == 1, keyset_condition(Tweet.created_at, Tweet.id, page_cursor, before=True))
+            .order_by(Tweet.created_at.desc(), Tweet.id.desc())
+            .limit(21)
+        ),
+        "GET /messages/conversations?cursor=": (
+            select(Conversation)
+            .where(
+                Conversation.user_id == 1,
+                keyset_condition(Conversation.last_message_at, Conversation.partner_id, page_cursor, before=True),
+            )
+            .order_by(Conversation.last_message_at.desc(), Conversation.partner_id.desc())
+            .limit(21)
+        ),
+        "GET /messages/conversations/{partner_id}?cursor= (one direction)": (
+            select(Message)
+            .where(
+                Message.sender_id == 1,
+                Message.receiver_id == 2,
+                keyset_condition(Message.created_at, Message.id, page_cursor, before=True),
+            )
+            .order_by(Message.created_at.desc(), Message.id.desc())
+            .limit(31)
+        ),
+        "GET /messages/ (sent)": select(Message).where(Message.sender_id == 1),
+        "GET /messages/ (received)": select(Message).where(Message.receiver_id == 1),
+        "GET /chat_messages/": (
+            select(ChatMessage)
+            .where(ChatMessage.user_id == 1)
+            .order_by(ChatMessage.created_at.desc(), ChatMessage.id.desc())
+            .limit(51)
+        ),
+        "GET /chat_messages/?before=": (
+            select(ChatMessage)
+            .where(
+                ChatMessage.user_id == 1,
+                keyset_condition(ChatMessage.created_at, ChatMessage.id, page_cursor, before=True),
+            )
+            .order_by(ChatMessage.created_at.desc(), ChatMessage.id.desc())
+            .limit(51)
+        ),
+    }
+
+
+def explain(engine: Engine, statement: Select) -> List[str]:
+    """Sorgunun SQLite `EXPLAIN QUERY PLAN` çıktısındaki adımları döndürür."""
+    compiled = statement.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True})
+    with engine.connect() as connection:
+        rows = connection.execute(text(f"EXPLAIN QUERY PLAN {compiled}")).all()
+    return [row.detail for row in rows]
+
+
+def plan_problems(plan: List[str]) -> List[str]:
+    # İndekssiz "SCAN <tablo>" tüm tablonun okunduğunu, "USE TEMP B-TREE" sıralamanın indeksle
+    # karşılanmadığını gösterir. "SCAN <tablo> USING INDEX" ise indeksin sırayla okunmasıdır;
+    # filtresiz ve LIMIT'li sayfalama sorgularında ilk `limit` satırdan sonra durur.
+    # "SCAN CONSTANT ROW" tablosuz `SELECT EXISTS(...)` gibi sorguların tek satırıdır.
+    return [
+        step for step in plan
+        if (
+            step.startswith("SCAN")
+            and "USING" not in step
+            and step != "SCAN CONSTANT ROW"
+            and step.split()[1] not in SMALL_TABLES
+        )
+        or "USE TEMP B-TREE" in step
+    ]
+
+
+def check_query_plans(engine: Engine, log=print) -> bool:
+    """
+    Her route'un ana sorgusunun bir indeks kullandığını doğrular.
+
+    Dönen Değer:
+    - bool: Tüm sorgular indeks kullanıyorsa True.
+
+    Hata Durumları:
+    - Veritabanı SQLite değilse ValueError fırlatır.
+    """
+    if engine.dialect.name != "sqlite":
+        raise ValueError("Query plan check is only implemented for SQLite")
+    ok = True
+    for route, statement in route_queries().items():
+        plan = explain(engine, statement)
+        problems = plan_problems(plan)
+        ok = ok and not problems
+        log(f"{'FAIL' if problems else 'ok  '} {route}: {' | '.join(plan)}")
+    return ok
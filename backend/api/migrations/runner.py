@@ -0,0 +1,113 @@
+import importlib
+import pkgutil
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+from sqlalchemy import Column, DateTime, MetaData, String, Table, inspect, select
+from sqlalchemy.engine import Connection, Engine
+
+from models.mixins import utc_now
+
+VERSIONS_PACKAGE = "migrations.versions"
+
+# Uygulanan migration'ların kaydı; şema sürümü bu tablodan okunur
+_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    _metadata,
+    Column("version", String, primary_key=True),
+    Column("name", String, nullable=False),
+    Column("applied_at", DateTime, nullable=False, default=utc_now),
+)
+
+
+class MigrationError(RuntimeError):
+    """Migration dosyaları tutarsız olduğunda veya şema güncel olmadığında fırlatılır."""
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: str
+    name: str
+    upgrade: Callable[[Connection], None]
+
+
+def discover() -> List[Migration]:
+    """
+    `migrations/versions` altındaki `v<sürüm>_<ad>.py` dosyalarını sürüm sırasıyla döndürür.
+
+    Her dosya, tek bir bağlantı parametresi alan bir `upgrade(connection)` fonksiyonu tanımlar.
+
+    Hata Durumları:
+    - Aynı sürüm numarası iki kez kullanılmışsa MigrationError fırlatır.
+    """
+    package = importlib.import_module(VERSIONS_PACKAGE)
+    migrations = {}
+    for module_info in pkgutil.iter_modules(package.__path__):
+        if not module_info.name.startswith("v"):
+            continue
+        version, _, name = module_info.name[1:].partition("_")
+        if version in migrations:
+            raise MigrationError(f"Duplicate migration version {version}")
+        module = importlib.import_module(f"{VERSIONS_PACKAGE}.{module_info.name}")
+        migrations[version] = Migration(version=version, name=name, upgrade=module.upgrade)
+    return [migrations[version] for version in sorted(migrations)]
+
+
+def applied_versions(connection: Connection) -> set:
+    if not inspect(connection).has_table(schema_migrations.name):
+        return set()
+    return set(connection.execute(select(schema_migrations.c.version)).scalars())
+
+
+def pending(engine: Engine) -> List[Migration]:
+    """Veritabanına henüz uygulanmamış migration'ları döndürür."""
+    with engine.connect() as connection:
+        applied = applied_versions(connection)
+    return [migration for migration in discover() if migration.version not in applied]
+
+
+def upgrade(engine: Engine, target: Optional[str] = None, log: Callable[[str], None] = print) -> List[Migration]:
+    """
+    Bekleyen migration'ları sırayla uygular.
+
+    Her migration kendi transaction'ında çalışır ve sürüm kaydı aynı transaction'da yazılır;
+    yarıda kalan bir migration kaydedilmez ve bir sonraki çalıştırmada baştan uygulanır.
+
+    Parametreler:
+    - engine (Engine): Şemanın güncelleneceği veritabanı.
+    - target (str, opsiyonel): Bu sürüme kadar (dahil) uygulanır; verilmezse tümü uygulanır.
+    - log (Callable): İlerleme mesajlarının yazılacağı fonksiyon.
+
+    Dönen Değer:
+    - List[Migration]: Uygulanan migration'lar.
+    """
+    _metadata.create_all(bind=engine)
+    applied = []
+    for migration in pending(engine):
+        if target is not None and migration.version > target:
+            break
+        log(f"Applying {migration.version}_{migration.name}")
+        with engine.begin() as connection:
+            migration.upgrade(connection)
+            connection.execute(
+                schema_migrations.insert().values(version=migration.version, name=migration.name)
+            )
+        applied.append(migration)
+    return applied
+
+
+def ensure_up_to_date(engine: Engine):
+    """
+    Uygulama başlarken şemanın güncel olduğunu doğrular.
+
+    Hata Durumları:
+    - Bekleyen migration varsa MigrationError fırlatır.
+    """
+    missing = pending(engine)
+    if missing:
+        versions = ", ".join(f"{m.version}_{m.name}" for m in missing)
+        raise MigrationError(
+            f"Database schema is out of date (pending: {versions}). "
+            "Run `python -m migrations.cli upgrade` first."
+        )
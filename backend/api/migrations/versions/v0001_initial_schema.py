@@ -0,0 +1,94 @@
+"""
+İlk şema: migration sistemi öncesinde `Base.metadata.create_all` ile oluşturulan tablolar.
+
+Tablolar burada modellerden bağımsız olarak sabitlenir; modeller sonradan değişse de bu
+migration her zaman aynı şemayı üretir. Tablolar zaten varsa (eski veritabanları) atlanır.
+"""
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, MetaData, String, Table, Text
+from sqlalchemy.engine import Connection
+
+metadata = MetaData()
+
+
+def _timestamps():
+    return [Column("created_at", DateTime), Column("updated_at", DateTime)]
+
+
+Table(
+    "users",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("username", String, unique=True, index=True),
+    Column("password", String),
+    Column("email", String, unique=True, index=True),
+    Column("first_name", String, nullable=True),
+    Column("last_name", String, nullable=True),
+    Column("profile", String, nullable=True),
+    Column("bio", String, nullable=True),
+    *_timestamps(),
+)
+
+Table(
+    "follows",
+    metadata,
+    Column("follower_id", Integer, ForeignKey("users.id"), primary_key=True),
+    Column("following_id", Integer, ForeignKey("users.id"), primary_key=True),
+)
+
+Table(
+    "tweets",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("content", Text, nullable=False),
+    Column("user_id", Integer, ForeignKey("users.id")),
+    Column("parent_tweet_id", Integer, ForeignKey("tweets.id"), nullable=True),
+    *_timestamps(),
+)
+
+for name in ("likes", "reposts", "bookmarks"):
+    Table(
+        name,
+        metadata,
+        Column("id", Integer, primary_key=True, index=True),
+        Column("tweet_id", Integer, ForeignKey("tweets.id"), nullable=False),
+        Column("user_id", Integer, ForeignKey("users.id"), nullable=False),
+        *_timestamps(),
+    )
+
+Table(
+    "comments",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("content", Text, nullable=False),
+    Column("tweet_id", Integer, ForeignKey("tweets.id"), nullable=False),
+    Column("user_id", Integer, ForeignKey("users.id"), nullable=False),
+    *_timestamps(),
+)
+
+Table(
+    "messages",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("sender_id", Integer, ForeignKey("users.id"), nullable=False),
+    Column("receiver_id", Integer, ForeignKey("users.id"), nullable=False),
+    Column("content", String, nullable=False),
+    Column("emoji", String, nullable=True),
+    Column("image_url", String, nullable=True),
+    Column("audio_url", String, nullable=True),
+    Column("video_url", String, nullable=True),
+    *_timestamps(),
+)
+
+Table(
+    "chat_messages",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("sender", String, nullable=False),
+    Column("user_id", Integer, ForeignKey("users.id"), nullable=False),
+    Column("text", Text, nullable=False),
+    *_timestamps(),
+)
+
+
+def upgrade(connection: Connection):
+    metadata.create_all(bind=connection, checkfirst=True)
@@ -0,0 +1,26 @@
+"""
+Sık kullanılan sorgular için bileşik indeksler ve etkileşim tablolarında benzersizlik.
+
+- `tweets (user_id, created_at)`: Kullanıcının tweet'leri, en yeniden eskiye.
+- `chat_messages (user_id, created_at)`: Sohbet geçmişi sayfalama.
+- `messages (sender_id)`, `messages (receiver_id)`: Gönderilen ve alınan mesajlar.
+- `follows (following_id, follower_id)`: Takipçi listesi; birincil anahtar yalnızca
+  `follower_id` ile başlayan sorgulara yarar.
+- `likes`, `reposts`, `bookmarks (tweet_id, user_id)`: Bir kullanıcı bir tweet'i en fazla bir kez
+  beğenebilir / paylaşabilir / kaydedebilir. Eklenmeden önce mevcut tekrarlar temizlenir.
+"""
+from sqlalchemy.engine import Connection
+
+from migrations.operations import create_index, delete_duplicates
+
+
+def upgrade(connection: Connection):
+    create_index(connection, "ix_tweets_user_id_created_at", "tweets", ["user_id", "created_at"])
+    create_index(connection, "ix_chat_messages_user_id_created_at", "chat_messages", ["user_id", "created_at"])
+    create_index(connection, "ix_messages_sender_id", "messages", ["sender_id"])
+    create_index(connection, "ix_messages_receiver_id", "messages", ["receiver_id"])
+    create_index(connection, "ix_follows_following_id_follower_id", "follows", ["following_id", "follower_id"])
+
+    for table_name in ("likes", "reposts", "bookmarks"):
+        delete_duplicates(connection, table_name, ["tweet_id", "user_id"])
+        create_index(connection, f"uq_{table_name}_tweet_id_user_id", table_name, ["tweet_id", "user_id"], unique=True)
@@ -0,0 +1,27 @@
+"""
+Eski satırların zaman damgalarını Python tarafında üretilen biçime çevirir.
+
+Migration öncesi satırlar SQLite'ın `CURRENT_TIMESTAMP` değeriyle (`YYYY-MM-DD HH:MM:SS`,
+mikrosaniyesiz) yazılmıştır; yeni satırlar ise `utc_now` ile `YYYY-MM-DD HH:MM:SS.ffffff`
+biçiminde saklanır. Metin olarak karşılaştırıldıklarından iki biçim `(created_at, id)`
+imleçleriyle birlikte doğru sıralanmaz. Diğer veritabanlarında sütunlar gerçek tarih
+tipinde olduğundan bu migration yalnızca SQLite'ta bir şey yapar.
+"""
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+TABLES = (
+    "users", "tweets", "likes", "reposts", "comments", "bookmarks", "messages", "chat_messages",
+)
+
+
+def upgrade(connection: Connection):
+    if connection.dialect.name != "sqlite":
+        return
+    for table_name in TABLES:
+        for column in ("created_at", "updated_at"):
+            connection.execute(text(
+                f"UPDATE {table_name} "
+                f"SET {column} = strftime('%Y-%m-%d %H:%M:%f000', {column}) "
+                f"WHERE {column} IS NOT NULL AND {column} NOT LIKE '%.%'"
+            ))
@@ -0,0 +1,13 @@
+"""
+Genel tweet akışının `(created_at, id)` imleçli sayfalaması için indeks.
+
+SQLite'ta her indeks satır kimliğini (id) de içerdiğinden `created_at` üzerindeki indeks
+`ORDER BY created_at DESC, id DESC` sıralamasını ek bir sıralama adımı olmadan karşılar.
+"""
+from sqlalchemy.engine import Connection
+
+from migrations.operations import create_index
+
+
+def upgrade(connection: Connection):
+    create_index(connection, "ix_tweets_created_at", "tweets", ["created_at"])
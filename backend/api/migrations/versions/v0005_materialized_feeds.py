@@ -0,0 +1,59 @@
+"""
+Ana sayfa akışları için `feed_entries` ve `feed_pull_authors` tabloları.
+
+Mevcut takip ilişkileri için akışlar, her yazarın en yeni `BACKFILL_COUNT` tweet'i ile
+bir kez doldurulur; bundan sonra akışlar tweet oluşturma ve takip işlemlerinde güncellenir.
+"""
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, MetaData, Table, func, insert, select
+from sqlalchemy.engine import Connection
+
+from migrations.operations import reflect_table
+
+BACKFILL_COUNT = 50
+
+metadata = MetaData()
+
+feed_entries = Table(
+    "feed_entries",
+    metadata,
+    Column("user_id", Integer, ForeignKey("users.id"), primary_key=True),
+    Column("tweet_id", Integer, ForeignKey("tweets.id"), primary_key=True),
+    Column("author_id", Integer, ForeignKey("users.id"), nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Index("ix_feed_entries_user_id_created_at", "user_id", "created_at", "tweet_id"),
+    Index("ix_feed_entries_user_id_author_id", "user_id", "author_id"),
+)
+
+Table(
+    "feed_pull_authors",
+    metadata,
+    Column("user_id", Integer, ForeignKey("users.id"), primary_key=True),
+    Column("created_at", DateTime),
+)
+
+
+def upgrade(connection: Connection):
+    # Bağımlı tablolar ForeignKey çözümlemesi için aynı MetaData'ya okunur
+    reflect_table(connection, "users").to_metadata(metadata)
+    reflect_table(connection, "tweets").to_metadata(metadata)
+    metadata.create_all(bind=connection, checkfirst=True)
+
+    follows = reflect_table(connection, "follows")
+    tweets = reflect_table(connection, "tweets")
+    ranked = select(
+        tweets.c.id,
+        tweets.c.user_id,
+        tweets.c.created_at,
+        func.row_number().over(
+            partition_by=tweets.c.user_id,
+            order_by=(tweets.c.created_at.desc(), tweets.c.id.desc()),
+        ).label("position"),
+    ).subquery()
+    connection.execute(
+        insert(feed_entries).from_select(
+            ["user_id", "tweet_id", "author_id", "created_at"],
+            select(follows.c.follower_id, ranked.c.id, ranked.c.user_id, ranked.c.created_at)
+            .join(ranked, ranked.c.user_id == follows.c.following_id)
+            .where(ranked.c.position <= BACKFILL_COUNT, ranked.c.created_at.is_not(None)),
+        )
+    )
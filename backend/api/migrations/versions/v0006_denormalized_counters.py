@@ -0,0 +1,39 @@
+"""
+Kullanıcılar (takipçi, takip edilen, tweet) ve tweet'ler (beğeni, repost, yorum, kaydetme)
+için sayaç sütunları.
+
+Sütunlar 0 varsayılanıyla eklenir ve mevcut satırlar için bir kez gerçek sayılarla doldurulur;
+bundan sonra sayaçlar yazma işlemleriyle aynı transaction'da güncellenir.
+Yorum sayıları için `comments.tweet_id` indeksi de eklenir.
+"""
+from sqlalchemy import Column, Integer, func, select, update
+from sqlalchemy.engine import Connection
+
+from migrations.operations import add_column, create_index, reflect_table
+
+COUNTERS = {
+    "users": {
+        "follower_count": ("follows", "following_id"),
+        "following_count": ("follows", "follower_id"),
+        "tweet_count": ("tweets", "user_id"),
+    },
+    "tweets": {
+        "like_count": ("likes", "tweet_id"),
+        "repost_count": ("reposts", "tweet_id"),
+        "comment_count": ("comments", "tweet_id"),
+        "bookmark_count": ("bookmarks", "tweet_id"),
+    },
+}
+
+
+def upgrade(connection: Connection):
+    create_index(connection, "ix_comments_tweet_id", "comments", ["tweet_id"])
+    for table_name, counters in COUNTERS.items():
+        for column_name in counters:
+            add_column(connection, table_name, Column(column_name, Integer, nullable=False, server_default="0"))
+
+        table = reflect_table(connection, table_name)
+        for column_name, (source_name, owner_column) in counters.items():
+            source = reflect_table(connection, source_name)
+            actual = select(func.count()).where(source.c[owner_column] == table.c.id).scalar_subquery()
+            connection.execute(update(table).values({table.c[column_name]: actual}))
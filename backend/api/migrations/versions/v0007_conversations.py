@@ -0,0 +1,70 @@
+"""
+Gelen kutusu için `conversations` özet tablosu ve mesajlaşma geçmişi indeksi.
+
+Mevcut mesajlar için her iki tarafın özeti son mesajla bir kez doldurulur. Eski mesajların
+okunma bilgisi olmadığından hepsi okunmuş kabul edilir (okunmamış sayısı 0).
+"""
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, MetaData, Table, insert, literal, select, union
+from sqlalchemy.engine import Connection
+
+from migrations.operations import create_index, reflect_table
+
+metadata = MetaData()
+
+conversations = Table(
+    "conversations",
+    metadata,
+    Column("user_id", Integer, ForeignKey("users.id"), primary_key=True),
+    Column("partner_id", Integer, ForeignKey("users.id"), primary_key=True),
+    Column("last_message_id", Integer, ForeignKey("messages.id"), nullable=False),
+    Column("last_message_at", DateTime, nullable=False),
+    Column("last_read_message_id", Integer, nullable=True),
+    Column("unread_count", Integer, nullable=False, server_default="0"),
+    Index("ix_conversations_user_id_last_message_at", "user_id", "last_message_at", "partner_id"),
+)
+
+
+def upgrade(connection: Connection):
+    create_index(
+        connection,
+        "ix_messages_sender_id_receiver_id_created_at",
+        "messages",
+        ["sender_id", "receiver_id", "created_at"],
+    )
+    # Bağımlı tablolar ForeignKey çözümlemesi için aynı MetaData'ya okunur
+    reflect_table(connection, "users").to_metadata(metadata)
+    reflect_table(connection, "messages").to_metadata(metadata)
+    metadata.create_all(bind=connection, checkfirst=True)
+
+    messages = reflect_table(connection, "messages")
+    pairs = union(
+        select(messages.c.sender_id.label("user_id"), messages.c.receiver_id.label("partner_id")),
+        select(messages.c.receiver_id.label("user_id"), messages.c.sender_id.label("partner_id")),
+    ).subquery()
+    # İki yöndeki mesajlardan en yenisi
+    latest = (
+        select(messages.c.id)
+        .where(
+            ((messages.c.sender_id == pairs.c.user_id) & (messages.c.receiver_id == pairs.c.partner_id))
+            | ((messages.c.sender_id == pairs.c.partner_id) & (messages.c.receiver_id == pairs.c.user_id))
+        )
+        .order_by(messages.c.created_at.desc(), messages.c.id.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    summaries = select(pairs.c.user_id, pairs.c.partner_id, latest.label("last_message_id")).subquery()
+    connection.execute(
+        insert(conversations).from_select(
+            ["user_id", "partner_id", "last_message_id", "last_message_at", "last_read_message_id", "unread_count"],
+            select(
+                summaries.c.user_id,
+                summaries.c.partner_id,
+                summaries.c.last_message_id,
+                messages.c.created_at,
+                summaries.c.last_message_id,
+                literal(0),
+            )
+            .join(messages, messages.c.id == summaries.c.last_message_id)
+            .where(messages.c.created_at.is_not(None)),
+        )
+    )
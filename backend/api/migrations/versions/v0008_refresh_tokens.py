@@ -0,0 +1,28 @@
+"""
+Yenileme token'larının iptal kayıtları için `refresh_tokens` tablosu.
+"""
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, MetaData, String, Table
+from sqlalchemy.engine import Connection
+
+from migrations.operations import reflect_table
+
+metadata = MetaData()
+
+Table(
+    "refresh_tokens",
+    metadata,
+    Column("jti", String(32), primary_key=True),
+    Column("family_id", String(32), nullable=False),
+    Column("user_id", Integer, ForeignKey("users.id"), nullable=False),
+    Column("expires_at", DateTime, nullable=False),
+    Column("revoked_at", DateTime, nullable=True),
+    Column("created_at", DateTime),
+    Index("ix_refresh_tokens_family_id", "family_id"),
+    Index("ix_refresh_tokens_expires_at", "expires_at"),
+)
+
+
+def upgrade(connection: Connection):
+    # Bağımlı tablolar ForeignKey çözümlemesi için aynı MetaData'ya okunur
+    reflect_table(connection, "users").to_metadata(metadata)
+    metadata.create_all(bind=connection, checkfirst=True)
@@ -0,0 +1,26 @@
+"""
+Mesajlaşma özetlerine okunan son mesajın zamanı (`last_read_at`).
+
+SQLite silinen en büyük mesaj kimliğini yeni mesaja yeniden verebilir; bir mesajın okunup
+okunmadığı bu yüzden yalnızca kimlikle değil `(created_at, id)` sırasıyla belirlenir. Mevcut
+özetler okunan mesajın `created_at` değeriyle doldurulur.
+"""
+from sqlalchemy import Column, DateTime, select, update
+from sqlalchemy.engine import Connection
+
+from migrations.operations import add_column, reflect_table
+
+
+def upgrade(connection: Connection):
+    add_column(connection, "conversations", Column("last_read_at", DateTime, nullable=True))
+    conversations = reflect_table(connection, "conversations")
+    messages = reflect_table(connection, "messages")
+    connection.execute(
+        update(conversations)
+        .where(conversations.c.last_read_message_id.is_not(None), conversations.c.last_read_at.is_(None))
+        .values(
+            last_read_at=select(messages.c.created_at)
+            .where(messages.c.id == conversations.c.last_read_message_id)
+            .scalar_subquery()
+        )
+    )
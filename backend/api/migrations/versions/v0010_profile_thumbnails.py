@@ -0,0 +1,14 @@
+"""
+Profil resminin küçük resmi için `users.profile_thumbnail` sütunu.
+
+Mevcut profiller için küçük resim yoktur; sütun boş kalır ve yeni bir profil resmi
+yüklendiğinde doldurulur.
+"""
+from sqlalchemy import Column, String
+from sqlalchemy.engine import Connection
+
+from migrations.operations import add_column
+
+
+def upgrade(connection: Connection):
+    add_column(connection, "users", Column("profile_thumbnail", String, nullable=True))
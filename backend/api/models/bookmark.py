@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey
+from sqlalchemy import Column, Integer, ForeignKey, Index
 from sqlalchemy.orm import relationship
 
 from .user import User
@@ -11,6 +11,11 @@ class Bookmark(Base, TimestampMixin):
     id = Column(Integer, primary_key=True, index=True)
     tweet_id = Column(Integer, ForeignKey("tweets.id"), nullable=False)  # Kaydedilen tweet'in ID'si
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)  # Kaydeden kullanıcı
+
+    # Bir kullanıcı aynı tweet için en fazla bir kayıt oluşturabilir
+    __table_args__ = (
+        Index("uq_bookmarks_tweet_id_user_id", "tweet_id", "user_id", unique=True),
+    )
     
     tweet = relationship("Tweet", back_populates="bookmarks")
     user = relationship("User", back_populates="bookmarked_tweets")
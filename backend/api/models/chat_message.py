@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Text, ForeignKey, String
+from sqlalchemy import Column, Integer, Text, ForeignKey, String, Index
 from sqlalchemy.orm import relationship
 from config.database import Base
 from models.mixins import TimestampMixin
@@ -11,5 +11,10 @@ class ChatMessage(Base, TimestampMixin):
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     text = Column(Text, nullable=False)
 
+    # Sohbet geçmişi kullanıcıya göre ve zaman sırasıyla sayfalandığından bileşik indeks
+    __table_args__ = (
+        Index("ix_chat_messages_user_id_created_at", "user_id", "created_at"),
+    )
+
     # İlişki tanımı
     user = relationship("User", back_populates="chat_messages")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, Text
+from sqlalchemy import Column, Integer, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 
 from .user import User
@@ -12,6 +12,11 @@ class Comment(Base, TimestampMixin):
     content = Column(Text, nullable=False)  # Yorum içeriği
     tweet_id = Column(Integer, ForeignKey("tweets.id"), nullable=False)  # Yorum yapılan tweet'in ID'si
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)  # Yorum yapan kullanıcı
+
+    # Tweet'in yorum sayısı bu indeksle hesaplanır
+    __table_args__ = (
+        Index("ix_comments_tweet_id", "tweet_id"),
+    )
     
     tweet = relationship("Tweet", back_populates="comments")
     user = relationship("User", back_populates="comments")
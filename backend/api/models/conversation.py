@@ -0,0 +1,32 @@
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, Index
+from sqlalchemy.orm import relationship
+
+from config.database import Base
+
+class Conversation(Base):
+  """
+  Bir kullanıcının bir kişiyle olan mesajlaşmasının özeti (gelen kutusundaki tek bir satır).
+
+  Her mesajlaşma için iki satır tutulur, her iki taraf için bir tane. Böylece gelen kutusu
+  `(user_id, last_message_at)` indeksiyle mesaj tablosuna gitmeden sayfalanır. Satırlar
+  mesaj oluşturma ve silme işlemleriyle aynı transaction'da güncellenir
+  (bkz. services.conversations).
+  """
+  __tablename__ = "conversations"
+
+  user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+  partner_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+  last_message_id = Column(Integer, ForeignKey("messages.id"), nullable=False)
+  last_message_at = Column(DateTime, nullable=False)
+  # Kullanıcının okuduğu en son mesaj ve zamanı; okunmamış sayısı silmelerde `(created_at, id)`
+  # sırasına göre düzeltilir (SQLite silinen mesajın kimliğini yeniden kullanabilir)
+  last_read_message_id = Column(Integer, nullable=True)
+  last_read_at = Column(DateTime, nullable=True)
+  unread_count = Column(Integer, nullable=False, default=0, server_default="0")
+
+  __table_args__ = (
+    Index("ix_conversations_user_id_last_message_at", "user_id", "last_message_at", "partner_id"),
+  )
+
+  partner = relationship("User", foreign_keys=[partner_id])
+  last_message = relationship("Message", foreign_keys=[last_message_id])
@@ -0,0 +1,36 @@
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, Index
+
+from config.database import Base
+from .mixins import utc_now
+
+class FeedEntry(Base):
+    """
+    Bir kullanıcının önceden oluşturulmuş (materialized) ana sayfa akışındaki tek bir tweet.
+
+    `created_at` tweet'in oluşturulma zamanının kopyasıdır; akış tweets tablosuna gitmeden
+    `(user_id, created_at, tweet_id)` indeksi üzerinden sayfalanır.
+    """
+    __tablename__ = "feed_entries"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    tweet_id = Column(Integer, ForeignKey("tweets.id"), primary_key=True)
+    author_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    created_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index("ix_feed_entries_user_id_created_at", "user_id", "created_at", "tweet_id"),
+        # Takipten çıkınca yazarın tweet'leri akıştan bu indeksle silinir
+        Index("ix_feed_entries_user_id_author_id", "user_id", "author_id"),
+    )
+
+class FeedPullAuthor(Base):
+    """
+    Tweet'leri takipçilerin akışlarına yazılmayan, okuma sırasında akışa eklenen yazarlar.
+
+    Takipçi sayısı `FEED_FANOUT_MAX_FOLLOWERS` sınırını aşan yazarlar buraya eklenir; tek bir
+    tweet için binlerce akış satırı yazmak yerine tweet'leri okuma anında birleştirilir.
+    """
+    __tablename__ = "feed_pull_authors"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    created_at = Column(DateTime, default=utc_now)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 
 from .mixins import TimestampMixin
@@ -16,6 +16,13 @@ class Message(Base, TimestampMixin):
   audio_url = Column(String, nullable=True)
   video_url = Column(String, nullable=True)
 
+  __table_args__ = (
+    Index("ix_messages_sender_id", "sender_id"),
+    Index("ix_messages_receiver_id", "receiver_id"),
+    # Mesajlaşma geçmişi her yön için ayrı ayrı, en yeniden eskiye bu indeksle okunur
+    Index("ix_messages_sender_id_receiver_id_created_at", "sender_id", "receiver_id", "created_at"),
+  )
+
   sender = relationship("User", foreign_keys=[sender_id], backref="sent_messages")
   receiver = relationship("User", foreign_keys=[receiver_id], backref="received_messages")
   
\ No newline at end of file
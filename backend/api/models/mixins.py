@@ -1,5 +1,11 @@
-from sqlalchemy import DateTime, func, Column
+from datetime import datetime, timezone
+from sqlalchemy import DateTime, Column
+
+def utc_now() -> datetime:
+  # Zaman damgaları Python tarafında üretilir; böylece tüm satırlar aynı (mikrosaniyeli)
+  # biçimde saklanır ve `(created_at, id)` imleçleriyle birebir karşılaştırılabilir
+  return datetime.now(timezone.utc).replace(tzinfo=None)
 
 class TimestampMixin:
-  created_at = Column(DateTime, default=func.now())
-  updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
\ No newline at end of file
+  created_at = Column(DateTime, default=utc_now)
+  updated_at = Column(DateTime, default=utc_now, onupdate=utc_now)
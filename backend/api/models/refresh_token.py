@@ -0,0 +1,29 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Index
+
+from config.database import Base
+from .mixins import utc_now
+
+class RefreshToken(Base):
+    """
+    Verilmiş bir yenileme (refresh) token'ının sunucu tarafındaki kaydı.
+
+    Token'ın kendisi imzalı bir JWT'dir; tabloda yalnızca `jti` claim'i tutulur ve token birincil
+    anahtarla tek okumada doğrulanır. Her yenilemede token iptal edilip aynı ailede (`family_id`)
+    yenisi verilir. İptal edilmiş bir token tekrar kullanılırsa token çalınmış kabul edilir ve
+    ailenin tamamı iptal edilir.
+    """
+    __tablename__ = "refresh_tokens"
+
+    jti = Column(String(32), primary_key=True)
+    family_id = Column(String(32), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+    revoked_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=utc_now)
+
+    __table_args__ = (
+        # Çıkışta ve tekrar kullanımda ailenin tüm token'ları bu indeksle iptal edilir
+        Index("ix_refresh_tokens_family_id", "family_id"),
+        # Süresi dolan kayıtlar `prune-refresh-tokens` ile bu indeksle silinir
+        Index("ix_refresh_tokens_expires_at", "expires_at"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey
+from sqlalchemy import Column, Integer, ForeignKey, Index
 from sqlalchemy.orm import relationship
 
 from config.database import Base
@@ -12,6 +12,11 @@ class Repost(Base, TimestampMixin):
     tweet_id = Column(Integer, ForeignKey("tweets.id"), nullable=False)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
 
+    # Bir kullanıcı aynı tweet için en fazla bir kayıt oluşturabilir
+    __table_args__ = (
+        Index("uq_reposts_tweet_id_user_id", "tweet_id", "user_id", unique=True),
+    )
+
     tweet = relationship("Tweet", back_populates="reposts")
     user = relationship("User", back_populates="reposted_tweets")
 
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 
 from .user import User
@@ -13,6 +13,17 @@ class Tweet(Base, TimestampMixin):
     user_id = Column(Integer, ForeignKey("users.id"))
     parent_tweet_id = Column(Integer, ForeignKey("tweets.id"), nullable=True)
 
+    # Etkileşim sayaçları (bkz. services.counters)
+    like_count = Column(Integer, nullable=False, default=0, server_default="0")
+    repost_count = Column(Integer, nullable=False, default=0, server_default="0")
+    comment_count = Column(Integer, nullable=False, default=0, server_default="0")
+    bookmark_count = Column(Integer, nullable=False, default=0, server_default="0")
+
+    __table_args__ = (
+        Index("ix_tweets_user_id_created_at", "user_id", "created_at"),
+        Index("ix_tweets_created_at", "created_at"),
+    )
+
     user = relationship("User", back_populates="tweets")
     parent_tweet = relationship("Tweet", remote_side=[id], backref="replies")
     likes = relationship("Like", back_populates="tweet")
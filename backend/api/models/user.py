@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Table
+from sqlalchemy import Column, Integer, String, ForeignKey, Table, Index
 from sqlalchemy.orm import relationship
 from config.database import Base
 from .mixins import TimestampMixin
@@ -8,7 +8,9 @@ follows = Table(
     "follows",
     Base.metadata,
     Column("follower_id", Integer, ForeignKey("users.id"), primary_key=True),
-    Column("following_id", Integer, ForeignKey("users.id"), primary_key=True)
+    Column("following_id", Integer, ForeignKey("users.id"), primary_key=True),
+    # Birincil anahtar follower_id ile başladığından takipçi listesi için ayrı indeks
+    Index("ix_follows_following_id_follower_id", "following_id", "follower_id")
 )
 
 class User(Base, TimestampMixin):
@@ -20,8 +22,15 @@ class User(Base, TimestampMixin):
     first_name = Column(String, nullable=True)
     last_name = Column(String, nullable=True)
     profile = Column(String, nullable=True)
+    # Profil resmi yüklenirken üretilen küçük resim; `profile` elle değiştirilirse temizlenir
+    profile_thumbnail = Column(String, nullable=True)
     bio = Column(String, nullable=True)
 
+    # Sayaçlar takip ve tweet yazmalarıyla aynı transaction'da güncellenir (bkz. services.counters)
+    follower_count = Column(Integer, nullable=False, default=0, server_default="0")
+    following_count = Column(Integer, nullable=False, default=0, server_default="0")
+    tweet_count = Column(Integer, nullable=False, default=0, server_default="0")
+
     # Takip ilişkileri
     following = relationship(
         "User",
@@ -53,4 +62,8 @@ from .like import Like
 from .repost import Repost
 from .comment import Comment
 from .bookmark import Bookmark
-from .chat_message import ChatMessage
\ No newline at end of file
+from .chat_message import ChatMessage
+from .feed import FeedEntry, FeedPullAuthor
+from .message import Message
+from .conversation import Conversation
+from .refresh_token import RefreshToken
\ No newline at end of file
@@ -6,10 +6,15 @@ from fastapi.security import OAuth2PasswordRequestForm, OAuth2PasswordBearer
 from jose import jwt, JWTError
 from dotenv import load_dotenv
 import os
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from models.user import User
-from dependencies.dependency import db_dependency, bcrypt_context
+from dependencies.dependency import async_db_dependency, decode_token, password_hasher
+from models.mixins import utc_now
+from services.passwords import PasswordHasherBusyError
+from services.refresh_tokens import issue_refresh_token, revoke_refresh_token, rotate_refresh_token
+from services.user_profiles import load_profiles
 
 load_dotenv()
 
@@ -22,6 +27,8 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/token")
 
 SECRET_KEY = os.getenv("AUTH_SECRET_KEY")
 ALGORITHM = os.getenv("AUTH_ALGORITHM")
+ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "20"))
+REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "14"))
 
 class UserCreateRequest(BaseModel):
   username: str
@@ -41,11 +48,28 @@ class UserPydantic(BaseModel):
 
 class Token(BaseModel):
   access_token: str
+  refresh_token: str
   token_type: str
   user: UserPydantic
 
+class RefreshTokenRequest(BaseModel):
+  refresh_token: str
 
-def authenticate_user(username: str, password: str, db) -> Union[bool, User]:
+class RefreshedToken(BaseModel):
+  access_token: str
+  refresh_token: str
+  token_type: str
+
+
+def password_hasher_busy() -> HTTPException:
+  """Parola havuzu dolu olduğunda istemcinin kısa süre sonra yeniden denemesi için 503 döndürür."""
+  return HTTPException(
+    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+    detail="Too many login attempts in progress, please try again.",
+    headers={"Retry-After": "1"},
+  )
+
+async def authenticate_user(username: str, password: str, db: AsyncSession) -> Union[bool, User]:
   """
     Kullanıcının kimlik doğrulamasını yapar.
 
@@ -53,10 +77,13 @@ def authenticate_user(username: str, password: str, db) -> Union[bool, User]:
     bir kullanıcının kimlik doğrulamasını gerçekleştirir. Eğer kullanıcı adı veya parola 
     yanlışsa `False`, doğruysa `User` modeli döndürülür.
 
+    Parola doğrulaması `password_hasher` thread havuzunda yapılır. Parolanın hash'i güncel
+    bcrypt parametreleriyle üretilmemişse (ör. `BCRYPT_ROUNDS` değiştiyse) yeni hash kaydedilir.
+
     Args:
         username (str): Doğrulama için kullanılan kullanıcı adı.
         password (str): Doğrulama için kullanılan parola.
-        db (Session): Veritabanı bağlantısı için SQLAlchemy oturumu.
+        db (AsyncSession): Veritabanı bağlantısı için SQLAlchemy oturumu.
 
     Returns:
         Union[bool, User]: 
@@ -64,11 +91,20 @@ def authenticate_user(username: str, password: str, db) -> Union[bool, User]:
             - Kullanıcı başarıyla doğrulanırsa `User` modeli.
 
     Raises:
-        Bu fonksiyon herhangi bir özel hata fırlatmaz. Ancak, çağıran yer hataları yönetebilir.
+        HTTPException: Parola havuzu doluysa 503 Service Unavailable döner.
     """
-  user = db.query(User).filter(User.username == username).first()
-  if not user or not bcrypt_context.verify(password, user.password):
+  user = (await db.execute(select(User).where(User.username == username))).scalars().first()
+  if not user:
+    return False
+  try:
+    valid, new_hash = await password_hasher.verify_and_update(password, user.password)
+  except PasswordHasherBusyError:
+    raise password_hasher_busy()
+  if not valid:
     return False
+  if new_hash is not None:
+    user.password = new_hash
+    await db.commit()
   return user
 
 def create_access_token(username: str, user_id: int, expires_delta: timedelta):
@@ -88,59 +124,94 @@ def create_access_token(username: str, user_id: int, expires_delta: timedelta):
   encode.update({"exp": expires})
   return jwt.encode(encode, SECRET_KEY, algorithm=ALGORITHM)
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(db_dependency)):
+def create_refresh_token(username: str, user_id: int, jti: str, expires_at: datetime) -> str:
   """
-    Kullanıcıyı JWT token'ı ile doğrular ve veritabanından kullanıcıyı döndürür.
-    
+    Yenileme token'ı (refresh token) oluşturur.
+
+    Token `type: refresh` claim'i taşır; erişim token'ı yerine kullanılamaz. Sunucu tarafındaki
+    kaydı `jti` ile bulunur.
+
     Args:
-        token (str): Authorization başlığından alınan JWT token.
-        db (Session): Veritabanı bağlantısı.
+        username (str): Kullanıcının kullanıcı adı.
+        user_id (int): Kullanıcının benzersiz kimliği.
+        jti (str): `refresh_tokens` tablosundaki kaydın kimliği.
+        expires_at (datetime): Token'ın geçerlilik sonu (UTC).
 
     Returns:
-        User: Geçerli kullanıcıyı döndürür.
+        str: Oluşturulan JWT.
+    """
+  encode = {"sub": username, "id": user_id, "jti": jti, "type": "refresh"}
+  encode.update({"exp": expires_at.replace(tzinfo=timezone.utc)})
+  return jwt.encode(encode, SECRET_KEY, algorithm=ALGORITHM)
+
+def decode_refresh_token(token: str, verify_exp: bool = True) -> dict:
+  """
+    Yenileme token'ının imzasını (ve varsayılan olarak süresini) doğrular.
+
+    Raises:
+        HTTPException: Token geçersizse veya bir yenileme token'ı değilse 401 Unauthorized döner.
     """
   try:
-    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-    username: str = payload.get("sub")
-    user_id: int = payload.get("id")
+    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM], options={"verify_exp": verify_exp})
+  except JWTError:
+    raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
+  if payload.get("type") != "refresh" or payload.get("jti") is None or payload.get("id") is None:
+    raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
+  return payload
 
-    if username is None or user_id is None:
-      raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+def refresh_token_expiry() -> datetime:
+  return utc_now() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
 
-    user = db.query(User).filter(User.username == username).first()
+async def get_current_user(db: async_db_dependency, token: str = Depends(oauth2_scheme)):
+  """
+    Kullanıcıyı JWT token'ı ile doğrular ve kullanıcının profilini döndürür.
 
-    if user is None:
-      raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found.")
+    Token `decode_token` ile doğrulanır, profil ise kimliğe göre kısa süreli profil
+    önbelleğinden okunur; kimliği doğrulanmış isteklerde çoğunlukla veritabanına gidilmez.
     
+    Args:
+        token (str): Authorization başlığından alınan JWT token.
+        db (AsyncSession): Veritabanı bağlantısı.
 
-    return user
-  except JWTError: 
-    raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+    Returns:
+        dict: Geçerli kullanıcının profil alanları (parola hariç).
+    """
+  payload = decode_token(token)
+  user = (await load_profiles(db, [payload["id"]])).get(payload["id"])
+
+  if user is None:
+    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found.")
+
+  return user
 
 
 @router.post("/", status_code=status.HTTP_201_CREATED)
-async def create_user(db: db_dependency, create_user_request: UserCreateRequest):
+async def create_user(db: async_db_dependency, create_user_request: UserCreateRequest):
   """
     Yeni bir kullanıcı oluşturur.
 
     Kullanıcının kullanıcı adı ve şifre bilgilerini alır, şifreyi hashleyerek veritabanına kaydeder.
 
     Args:
-        db (Session): Veritabanı bağlantısı için SQLAlchemy oturumu.
+        db (AsyncSession): Veritabanı bağlantısı için SQLAlchemy oturumu.
         create_user_request (UserCreateRequest): Kullanıcının `username` ve `password` bilgilerini içeren istek.
 
     Returns:
         None: HTTP 201 yanıt kodu döner.
     """
+  try:
+    hashed_password = await password_hasher.hash(create_user_request.password)
+  except PasswordHasherBusyError:
+    raise password_hasher_busy()
   create_user_model = User(
     username=create_user_request.username,
-    password=bcrypt_context.hash(create_user_request.password),
+    password=hashed_password,
   )
   db.add(create_user_model)
-  db.commit()
+  await db.commit()
 
 @router.post("/token", response_model=Token)
-async def login_for_access_token(form_data: Annotated[OAuth2PasswordRequestForm, Depends()], db: db_dependency) -> Union[dict, HTTPException]:
+async def login_for_access_token(form_data: Annotated[OAuth2PasswordRequestForm, Depends()], db: async_db_dependency) -> Union[dict, HTTPException]:
   """
     Kullanıcı girişi yapar ve bir erişim token'i döner.
 
@@ -149,7 +220,7 @@ async def login_for_access_token(form_data: Annotated[OAuth2PasswordRequestForm,
 
     Args:
         form_data (OAuth2PasswordRequestForm): Kullanıcının `username` ve `password` bilgilerini içeren form.
-        db (Session): Veritabanı bağlantısı için SQLAlchemy oturumu.
+        db (AsyncSession): Veritabanı bağlantısı için SQLAlchemy oturumu.
 
     Returns:
         dict: 
@@ -159,10 +230,12 @@ async def login_for_access_token(form_data: Annotated[OAuth2PasswordRequestForm,
     Raises:
         HTTPException: Kullanıcı doğrulaması başarısız olursa 401 Unauthorized döner.
     """
-  user = authenticate_user(form_data.username, form_data.password, db)
+  user = await authenticate_user(form_data.username, form_data.password, db)
   if not user:
     raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid username or password")
-  token = create_access_token(user.username, user.id, timedelta(minutes=20))
+  token = create_access_token(user.username, user.id, timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
+  refresh = issue_refresh_token(db, user.id, refresh_token_expiry())
+  await db.commit()
 
   user_data = {
     "id": user.id,
@@ -174,7 +247,58 @@ async def login_for_access_token(form_data: Annotated[OAuth2PasswordRequestForm,
     "bio": user.bio,
   }
 
-  return { "access_token" : token, "token_type": "bearer", "user": user_data } 
+  return {
+    "access_token" : token,
+    "refresh_token": create_refresh_token(user.username, user.id, refresh.jti, refresh.expires_at),
+    "token_type": "bearer",
+    "user": user_data,
+  }
+
+@router.post("/refresh", response_model=RefreshedToken)
+async def refresh_access_token(db: async_db_dependency, request: RefreshTokenRequest):
+  """
+    Yenileme token'ı ile parola sormadan yeni bir erişim token'ı verir.
+
+    Parola hash'i hesaplanmaz; yalnızca token imzası doğrulanır ve `refresh_tokens` tablosundan
+    birincil anahtarla tek kayıt okunur. Kullanılan yenileme token'ı iptal edilir ve yerine yenisi
+    verilir (rotation). İptal edilmiş bir token tekrar gelirse oturumun tüm token'ları iptal edilir.
+
+    Args:
+        request (RefreshTokenRequest): Girişte veya son yenilemede alınan `refresh_token`.
+        db (AsyncSession): Veritabanı bağlantısı için SQLAlchemy oturumu.
+
+    Returns:
+        dict: Yeni `access_token`, yeni `refresh_token` ve `token_type`.
+
+    Raises:
+        HTTPException: Token geçersizse, süresi dolmuşsa, iptal edilmişse veya daha önce
+        kullanılmışsa 401 Unauthorized döner.
+    """
+  payload = decode_refresh_token(request.refresh_token)
+  refresh = await rotate_refresh_token(db, payload["jti"], payload["id"], refresh_token_expiry())
+  await db.commit()
+  if refresh is None:
+    raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
+
+  return {
+    "access_token": create_access_token(payload["sub"], payload["id"], timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)),
+    "refresh_token": create_refresh_token(payload["sub"], payload["id"], refresh.jti, refresh.expires_at),
+    "token_type": "bearer",
+  }
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(db: async_db_dependency, request: RefreshTokenRequest):
+  """
+    Oturumu kapatır; yenileme token'ı ve aynı oturumda ondan türetilen tüm token'lar iptal edilir.
+
+    Süresi dolmuş bir token da kabul edilir; yalnızca imzası doğrulanır.
+
+    Raises:
+        HTTPException: Token geçersizse 401 Unauthorized döner.
+    """
+  payload = decode_refresh_token(request.refresh_token, verify_exp=False)
+  await revoke_refresh_token(db, payload["jti"])
+  await db.commit()
   
 @router.get("/me", response_model=UserPydantic)
 async def get_me(current_user: UserPydantic = Depends(get_current_user)):
@@ -1,56 +1,262 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import AsyncIterator, List, Optional
 from pydantic import BaseModel, field_validator
-import torch
 from datetime import datetime
+import asyncio
+import json
+import os
+import re
 
+from config.database import SessionLocal, AsyncSessionLocal
 from models.chat_message import ChatMessage
+from models.mixins import utc_now
 from models.user import User
-from dependencies.dependency import db_dependency, get_current_user
+from dependencies.dependency import async_db_dependency, get_current_user
+from services.batching import MicroBatcher, BatchQueueFullError
+from services.inference_pool import InferencePool, InferenceTimeoutError
+from services.model_registry import ModelRegistry, ModelNotReadyError
+from services.reply_cache import ReplyCache
+from services.pagination import InvalidCursorError, cursor_for, keyset_condition
+from services.chat_model import get_tokenizer, load_model, run_model
+from services.conversation_context import ConversationContextStore
+from services.write_behind import WriteBehindWriter
 
 router = APIRouter(
     prefix="/chat_messages",
     tags=["chat_messages"]
 )
 
-# MODEL_PATH = "./models/your_trained_model.pt"
-# model = torch.load(MODEL_PATH)
-# model.eval()
+MODEL_PATH = os.getenv("CHAT_MODEL_PATH", "./models/your_trained_model.pt")
+CHAT_BATCH_MAX_SIZE = int(os.getenv("CHAT_BATCH_MAX_SIZE", "16"))
+CHAT_BATCH_MAX_WAIT_MS = float(os.getenv("CHAT_BATCH_MAX_WAIT_MS", "10"))
+CHAT_REPLY_TIMEOUT = float(os.getenv("CHAT_REPLY_TIMEOUT", "30"))
 
-def preprocess_input(text: str):
+CHAT_WARMUP_ROUNDS = int(os.getenv("CHAT_WARMUP_ROUNDS", "3"))
+CHAT_QUEUE_MAX_SIZE = int(os.getenv("CHAT_QUEUE_MAX_SIZE", "256"))
+# 0: çıkarım API sürecinde yapılır; >0: bu sayıda ayrı worker sürecinde yapılır
+CHAT_INFERENCE_WORKERS = int(os.getenv("CHAT_INFERENCE_WORKERS", "0"))
+CHAT_INFERENCE_THREADS_PER_WORKER = int(os.getenv("CHAT_INFERENCE_THREADS_PER_WORKER", "1"))
+CHAT_INFERENCE_TIMEOUT = float(os.getenv("CHAT_INFERENCE_TIMEOUT", "20"))
+CHAT_REPLY_CACHE_ENABLED = os.getenv("CHAT_REPLY_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+CHAT_REPLY_CACHE_SIZE = int(os.getenv("CHAT_REPLY_CACHE_SIZE", "10000"))
+CHAT_REPLY_CACHE_TTL = float(os.getenv("CHAT_REPLY_CACHE_TTL", str(24 * 60 * 60)))
+HOROSCOPE_ROLLOVER_HOUR = int(os.getenv("HOROSCOPE_ROLLOVER_HOUR", "0"))
+HOROSCOPE_TIMEZONE = os.getenv("HOROSCOPE_TIMEZONE", "Europe/Istanbul")
+# 0: her mesaj tek başına yanıtlanır; >0: son bu kadar tur modele bağlam olarak verilir
+CHAT_CONTEXT_TURNS = int(os.getenv("CHAT_CONTEXT_TURNS", "0"))
+CHAT_CONTEXT_MAX_TOKENS = int(os.getenv("CHAT_CONTEXT_MAX_TOKENS", "512"))
+CHAT_CONTEXT_TRUNCATION = os.getenv("CHAT_CONTEXT_TRUNCATION", "turns")
+CHAT_CONTEXT_MAX_TOTAL_TOKENS = int(os.getenv("CHAT_CONTEXT_MAX_TOTAL_TOKENS", "5000000"))
+CHAT_CONTEXT_IDLE_SECONDS = float(os.getenv("CHAT_CONTEXT_IDLE_SECONDS", str(30 * 60)))
+# true: mesajlar tamponda toplanıp kısa aralıklarla tek transaction'da toplu yazılır
+CHAT_WRITE_BEHIND = os.getenv("CHAT_WRITE_BEHIND", "false").lower() in ("1", "true", "yes")
+CHAT_WRITE_BEHIND_INTERVAL_MS = float(os.getenv("CHAT_WRITE_BEHIND_INTERVAL_MS", "50"))
+CHAT_WRITE_BEHIND_MAX_BATCH = int(os.getenv("CHAT_WRITE_BEHIND_MAX_BATCH", "500"))
+
+# Warm-up sırasında modele verilen örnek girdiler
+WARMUP_TEXTS = [
+    "Bugün Koç burcu için neler var?",
+    "what does today hold for leo",
+    "aşk hayatım bu hafta nasıl olacak",
+]
+
+def create_inference_pool(path: str) -> InferencePool:
+    return InferencePool(
+        path,
+        workers=CHAT_INFERENCE_WORKERS,
+        timeout=CHAT_INFERENCE_TIMEOUT,
+        threads_per_worker=CHAT_INFERENCE_THREADS_PER_WORKER,
+    )
+
+def infer(model, texts: List[str]) -> List[str]:
+    """Metinleri, modelin API sürecinde mi yoksa worker havuzunda mı olduğuna göre çalıştırır."""
+    if isinstance(model, InferencePool):
+        return model.run(texts)
+    return run_model(model, texts)
+
+def warmup_model(model):
     """
-    Kullanıcıdan gelen metni modelin kabul edebileceği bir formata dönüştürür.
-    
-    İşlem Adımları:
-    1. Metni küçük harflere çevirir.
-    2. Metni kelimelerine ayırır (tokenize eder).
-    3. Kelime sayısını bir tensör olarak döndürür.
+    Yeni yüklenen modeli tek elemanlı ve tam boyutlu batch'lerle birkaç kez çalıştırır.
 
-    Parametreler:
-    - text (str): Kullanıcıdan gelen metin.
+    Worker havuzunda her worker'ın başlatılıp ısınması için batch'ler eşzamanlı gönderilir.
+    """
+    texts = (WARMUP_TEXTS * CHAT_BATCH_MAX_SIZE)[:CHAT_BATCH_MAX_SIZE]
+    if isinstance(model, InferencePool):
+        model.warm_up([texts[:1], texts] * CHAT_WARMUP_ROUNDS * model.workers)
+        return
+    for _ in range(CHAT_WARMUP_ROUNDS):
+        run_model(model, texts[:1])
+        run_model(model, texts)
 
-    Dönen Değer:
-    - torch.Tensor: Metnin uzunluğunu içeren bir PyTorch tensörü.
+if CHAT_INFERENCE_WORKERS > 0:
+    model_registry = ModelRegistry(
+        loader=create_inference_pool,
+        warmup=warmup_model,
+        unload=lambda pool: pool.shutdown(wait=False),
+    )
+else:
+    model_registry = ModelRegistry(loader=load_model, warmup=warmup_model)
+
+def predict_batch(texts: List[str]) -> List[str]:
     """
-    tokens = text.lower().split()
-    return torch.tensor([len(tokens)])
+    Kayıttaki aktif modelle bir batch çalıştırır.
 
-def postprocess_output(output):
+    Hata Durumları:
+    - Model henüz hazır değilse ModelNotReadyError fırlatır.
     """
-    Modelden dönen çıktıyı anlamlı bir metne dönüştürür.
-    
-    İşlem Adımları:
-    1. Model çıktısındaki en yüksek olasılığa sahip sınıfı seçer.
-    2. Sınıfa göre 'Positive' (Olumlu) veya 'Negative' (Olumsuz) döner.
+    return infer(model_registry.get(), texts)
 
-    Parametreler:
-    - output: Modelden dönen PyTorch tensörü.
+# Tekrarlanan sorular için yanıt önbelleği; anahtara model sürümü de eklenir,
+# böylece hot-swap sonrası eski modelin yanıtları kullanılmaz
+reply_cache = ReplyCache(
+    max_entries=CHAT_REPLY_CACHE_SIZE,
+    ttl_seconds=CHAT_REPLY_CACHE_TTL,
+    rollover_hour=HOROSCOPE_ROLLOVER_HOUR,
+    timezone=HOROSCOPE_TIMEZONE,
+    enabled=CHAT_REPLY_CACHE_ENABLED,
+)
 
-    Dönen Değer:
-    - str: Tahmin edilen sınıf etiketi ('Positive' veya 'Negative').
+# Çok turlu modda kullanıcı başına tokenize edilmiş son turlar
+conversation_store = ConversationContextStore(
+    tokenize=lambda text: get_tokenizer().encode(text),
+    max_turns=CHAT_CONTEXT_TURNS,
+    max_tokens=CHAT_CONTEXT_MAX_TOKENS,
+    truncation=CHAT_CONTEXT_TRUNCATION,
+    max_total_tokens=CHAT_CONTEXT_MAX_TOTAL_TOKENS,
+    idle_seconds=CHAT_CONTEXT_IDLE_SECONDS,
+) if CHAT_CONTEXT_TURNS > 0 else None
+
+def load_recent_turns(user_id: int) -> List[tuple]:
+    """Kullanıcının son `CHAT_CONTEXT_TURNS` mesajını eskiden yeniye `(sender, text)` olarak okur."""
+    with SessionLocal() as db:
+        rows = (
+            db.query(ChatMessage.sender, ChatMessage.text)
+            .filter(ChatMessage.user_id == user_id)
+            .order_by(ChatMessage.created_at.desc(), ChatMessage.id.desc())
+            .limit(CHAT_CONTEXT_TURNS)
+            .all()
+        )
+    return [(row.sender, row.text) for row in reversed(rows)]
+
+def build_model_input(user_id: int, text: str):
+    """
+    Kullanıcı mesajı için modele verilecek girdiyi hazırlar ve yanıtın önbelleğe alınıp
+    alınamayacağını döndürür.
+
+    Tek turlu modda girdi metnin kendisidir ve yanıt önbelleğe alınabilir. Çok turlu modda
+    mesaj kullanıcının bağlamına eklenir ve bağlamın token kimlikleri döndürülür; bağlam her
+    mesajla değiştiğinden aynı anahtar tekrar gelmez, bu yüzden `reply_cache` kullanılmaz.
+
+    Kullanıcı mesajı veritabanına yazılmadan önce çağrılmalıdır; aksi halde bağlam
+    veritabanından ilk kez yüklenirken mesaj iki kez eklenir.
+    """
+    if conversation_store is None:
+        return text, True
+    conversation_store.ensure(user_id, lambda: load_recent_turns(user_id))
+    return conversation_store.append(user_id, "user", text), False
+
+def remember_message(user_id: int, sender: str, text: str):
+    """Kaydedilen mesajı (bağlamı bellekteyse) kullanıcının sohbet bağlamına ekler."""
+    if conversation_store is not None:
+        conversation_store.append(user_id, sender, text, create=False)
+
+# Eşzamanlı /reply isteklerini tek bir batch'te toplayan zamanlayıcı (main.py lifespan'inde başlatılır)
+reply_batcher = MicroBatcher(
+    predict_batch=predict_batch,
+    max_batch_size=CHAT_BATCH_MAX_SIZE,
+    max_wait_ms=CHAT_BATCH_MAX_WAIT_MS,
+    max_concurrency=max(CHAT_INFERENCE_WORKERS, 1),
+    max_queue_size=CHAT_QUEUE_MAX_SIZE,
+)
+
+async def stream_reply_tokens(model_input, cache_key: Optional[tuple] = None) -> AsyncIterator[str]:
+    """
+    Bot yanıtını parça parça üretir.
+
+    - Model `generate_stream(text)` sağlıyorsa (üretken model), parçalar üretildikçe
+      thread havuzunda okunur ve hemen döndürülür.
+    - Aksi halde yanıt `reply_cache`'ten (`cache_key` verildiyse) veya `reply_batcher`
+      üzerinden tek seferde alınır ve kelime kelime döndürülür.
+
+    Jeneratör erken kapatılırsa (istemci bağlantıyı kestiyse) model üretimi de durdurulur.
+
+    Hata Durumları:
+    - Model henüz hazır değilse ModelNotReadyError fırlatır.
+    """
+    model = model_registry.get()
+    if hasattr(model, "generate_stream"):
+        generator = model.generate_stream(model_input)
+        try:
+            async for token in iterate_in_threadpool(generator):
+                yield token
+        finally:
+            generator.close()
+    else:
+        reply = reply_cache.get(cache_key) if cache_key is not None else None
+        if reply is None:
+            reply = await reply_batcher.submit(model_input)
+            if cache_key is not None:
+                reply_cache.set(cache_key, reply)
+        for token in re.findall(r"\S+\s*", reply):
+            yield token
+
+# Write-behind modunda mesajları toplu yazan yazıcı (main.py lifespan'inde başlatılır ve
+# kapanışta tamponu boşaltır)
+chat_writer = WriteBehindWriter(
+    session_factory=SessionLocal,
+    serialize=lambda chat_message: MessageOut.model_validate(chat_message),
+    flush_interval_ms=CHAT_WRITE_BEHIND_INTERVAL_MS,
+    max_batch_size=CHAT_WRITE_BEHIND_MAX_BATCH,
+) if CHAT_WRITE_BEHIND else None
+
+async def save_chat_messages(messages: List[ChatMessage], db: Optional[AsyncSession] = None) -> List["MessageOut"]:
     """
-    return "Positive" if output.argmax().item() == 1 else "Negative"
+    Mesajları tek bir transaction'da kaydeder ve kaydedilmiş hallerini döndürür.
+
+    Kimlikler ve zaman damgaları flush sırasında nesnelere yazıldığından commit sonrası
+    `refresh` ile ek SELECT yapılmaz. Write-behind modunda mesajlar `chat_writer` tamponuna
+    eklenir ve diğer isteklerin mesajlarıyla aynı commit'te yazılmaları beklenir.
+
+    Streaming yanıtlarda istek kapsamındaki oturum yanıt gövdesi gönderilmeden kapatıldığından,
+    `db` verilmezse kayıt ayrı bir oturumla yapılır.
+    """
+    if chat_writer is not None and chat_writer.running:
+        return await asyncio.wait_for(asyncio.wrap_future(chat_writer.submit(messages)), CHAT_REPLY_TIMEOUT)
+    if db is None:
+        async with AsyncSessionLocal() as db:
+            return await save_chat_messages(messages, db)
+    db.add_all(messages)
+    await db.commit()
+    return [MessageOut.model_validate(chat_message) for chat_message in messages]
+
+def reply_error(error: Exception) -> HTTPException:
+    """Yanıt üretimi sırasında oluşan hatayı uygun HTTP hatasına çevirir."""
+    if isinstance(error, ModelNotReadyError):
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Model is not ready yet."
+        )
+    if isinstance(error, BatchQueueFullError):
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Chatbot is busy, please try again."
+        )
+    if isinstance(error, (TimeoutError, asyncio.TimeoutError, InferenceTimeoutError)):
+        return HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="Model prediction timed out."
+        )
+    return HTTPException(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        detail=f"Model prediction failed: {str(error)}"
+    )
+
+def sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
 
 class MessageCreate(BaseModel):
     sender: str # "user" | "bot"
@@ -77,68 +283,86 @@ class MessageOut(BaseModel):
     class Config:
         from_attributes = True
 
+class MessagePage(BaseModel):
+    items: List[MessageOut]
+    has_more: bool
+    before_cursor: Optional[str] = None
+    after_cursor: Optional[str] = None
+
+CHAT_HISTORY_PAGE_SIZE = 50
+CHAT_HISTORY_MAX_PAGE_SIZE = 200
+
 @router.post("/reply", response_model=MessageOut, status_code=status.HTTP_201_CREATED)
-def reply_message(
+async def reply_message(
     message: MessageCreate,
-    db: db_dependency,
-    current_user: User = Depends(get_current_user)
+    db: async_db_dependency,
+    current_user: User = Depends(get_current_user),
+    no_cache: bool = False
 ):
     """
     Kullanıcıdan alınan bir mesajı işleyip modele iletir ve modelin cevabını kaydederek döndürür.
 
     İşlem Adımları:
-    1. Kullanıcı mesajını veritabanına kaydeder (`create_message` çağrısı).
-    2. Mesaj metnini modelin anlayacağı şekilde ön işler (`preprocess_input`).
-    3. Model çıktısını alır ve anlamlı bir yanıta dönüştürür (`postprocess_output`).
-    4. Modelin yanıtını "bot" tarafından gönderilmiş bir mesaj olarak veritabanına kaydeder.
+    1. Çok turlu modda mesajı kullanıcının sohbet bağlamına ekler (`build_model_input`).
+    2. Tek turlu modda aynı soru bugün daha önce yanıtlandıysa yanıtı `reply_cache`'ten alır.
+    3. Aksi halde mesaj metnini (veya bağlamı) `reply_batcher` kuyruğuna ekler; eşzamanlı
+       isteklerle birlikte tek bir batch halinde modele verilir (`predict_batch`) ve yanıt
+       önbelleğe yazılır.
+    4. Kullanıcı mesajını ve modelin yanıtını ("bot" mesajı) tek bir transaction'da kaydeder.
+       Yanıt üretilemezse yalnızca kullanıcı mesajı kaydedilir.
     5. Bot mesajını döndürür.
 
     Parametreler:
     - message (MessageCreate): Kullanıcıdan alınan mesajın içeriği.
-    - db (Session): Veritabanı oturumu (db_dependency) ile sağlanır.
+    - db (AsyncSession): Veritabanı oturumu (async_db_dependency) ile sağlanır.
     - current_user (User): Şu anki oturum açmış kullanıcı (get_current_user ile alınır).
+    - no_cache (bool): True ise önbellek atlanır ve yanıt modelden üretilir.
 
     Dönen Değer:
     - MessageOut: Veritabanına kaydedilmiş bot mesajı bilgileri.
 
     Hata Durumları:
+    - Model henüz yüklenmediyse (veya warm-up sürüyorsa) HTTP 503 döner.
+    - Çıkarım kuyruğu doluysa HTTP 503 döner.
+    - Model tahmini zaman aşımına uğrarsa HTTP 504 döner.
     - Eğer model tahmini sırasında bir hata oluşursa, HTTP 500 döner ve hata mesajı içerir.
     """
-    user_messages = ChatMessage(
+    # Bağlam ilk kez yüklenirken senkron bir sorgu yapılabileceğinden thread havuzunda çalıştırılır
+    model_input, cacheable = await run_in_threadpool(build_model_input, current_user["id"], message.text)
+
+    # Mesajın zamanı yanıt beklenmeden alınır; iki mesaj birlikte yazılsa da sıra korunur
+    user_message = ChatMessage(
         sender="user",
         text=message.text,
-        user_id=current_user["id"]
+        user_id=current_user["id"],
+        created_at=utc_now()
     )
-    db.add(user_messages)
-    db.commit()
-    db.refresh(user_messages)
-    
+
+    cache_key = reply_cache.make_key(message.text, model_registry.version) if cacheable and not no_cache else None
+    bot_response_text = reply_cache.get(cache_key) if cache_key is not None else None
     try:
-        pass
-        #input_tensor = preprocess_input(message.text)
-        #model_output = model(input_tensor)
-        #bot_response_text = postprocess_output(model_output)
+        if bot_response_text is None:
+            bot_response_text = await asyncio.wait_for(reply_batcher.submit(model_input), CHAT_REPLY_TIMEOUT)
+            if cache_key is not None:
+                reply_cache.set(cache_key, bot_response_text)
     except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Model prediction failed: {str(e)}"
-        )
-    
+        await save_chat_messages([user_message], db)
+        raise reply_error(e)
+
     bot_message = ChatMessage(
         sender="bot",
-        #text=bot_response_text,
+        text=bot_response_text,
         user_id=current_user["id"]
     )
-    db.add(bot_message)
-    db.commit()
-    db.refresh(bot_message)
-    return bot_message
+    _, saved_bot_message = await save_chat_messages([user_message, bot_message], db)
+    remember_message(current_user["id"], "bot", bot_response_text)
+    return saved_bot_message
 
 # Mesaj Oluşturma Endpoint'i
 @router.post("/", response_model=MessageOut, status_code=status.HTTP_201_CREATED)
-def create_message(
+async def create_message(
     message: MessageCreate,
-    db: db_dependency,
+    db: async_db_dependency,
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -146,7 +370,7 @@ def create_message(
     
     Parametreler:
     - message: MessageCreate modeline göre mesaj içeriği.
-    - db: Veritabanı oturumu (db_dependency) sağlanır.
+    - db: Veritabanı oturumu (async_db_dependency) sağlanır.
     - current_user: Kullanıcının kimliği, get_current_user fonksiyonu ile doğrulanır.
     
     Dönen Değer:
@@ -157,30 +381,134 @@ def create_message(
         text=message.text,
         user_id=current_user["id"] 
     )
-    db.add(new_message)
-    db.commit()
-    db.refresh(new_message)  # Eksik parametre düzeltildi
-    return new_message
-
-@router.get("/", response_model=List[MessageOut], status_code=status.HTTP_200_OK)
-def get_messages(
-    db: db_dependency,
+    saved_message, = await save_chat_messages([new_message], db)
+    remember_message(current_user["id"], saved_message.sender, saved_message.text)
+    return saved_message
+
+@router.get("/", response_model=MessagePage, status_code=status.HTTP_200_OK)
+async def get_messages(
+    db: async_db_dependency,
     current_user=Depends(get_current_user),
+    before: Optional[str] = None,
+    after: Optional[str] = None,
+    limit: int = Query(default=CHAT_HISTORY_PAGE_SIZE, ge=1, le=CHAT_HISTORY_MAX_PAGE_SIZE),
 ):
     """
-    Bu endpoint, kullanıcının tüm mesajlarını getirir.
-    
+    Bu endpoint, kullanıcının mesaj geçmişini imleç (cursor) tabanlı sayfalar halinde getirir.
+
+    İlk istek en yeni `limit` mesajı döndürür. Daha eski mesajlar için `before_cursor`
+    değeri `before` parametresiyle, sonradan gelen yeni mesajlar için `after_cursor` değeri
+    `after` parametresiyle gönderilir. Sorgu `(user_id, created_at)` indeksini kullanır;
+    OFFSET kullanılmadığından sayfa maliyeti geçmişin uzunluğundan bağımsızdır.
+
     Parametreler:
-    - db: Veritabanı oturumu (db_dependency) sağlanır.
+    - db: Veritabanı oturumu (async_db_dependency) sağlanır.
     - current_user: Kullanıcının kimliği, get_current_user fonksiyonu ile doğrulanır.
-    
+    - before (str, opsiyonel): Bu imleçten daha eski mesajları getirir.
+    - after (str, opsiyonel): Bu imleçten daha yeni mesajları getirir.
+    - limit (int): Sayfadaki en fazla mesaj sayısı.
+
     Dönen Değer:
-    - Kullanıcıya ait mesajların listesi, MessageOut modeline göre döndürülür.
+    - MessagePage: Kronolojik sırada mesajlar, devamı olup olmadığı ve sonraki istekler için imleçler.
+      Mesaj yoksa boş bir sayfa döner.
+
+    Hata Durumları:
+    - İmleç geçersizse veya `before` ile `after` birlikte verilirse HTTP 400 döner.
     """
-    messages = db.query(ChatMessage).filter(ChatMessage.user_id == current_user["id"]).order_by(ChatMessage.created_at.asc()).all()
-    if not messages:
+    if before and after:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="No messages found for this user."
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Use either 'before' or 'after', not both."
         )
-    return messages
\ No newline at end of file
+
+    query = select(ChatMessage).where(ChatMessage.user_id == current_user["id"])
+    try:
+        if after:
+            query = query.where(keyset_condition(ChatMessage.created_at, ChatMessage.id, after, before=False))
+        elif before:
+            query = query.where(keyset_condition(ChatMessage.created_at, ChatMessage.id, before, before=True))
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    if after:
+        query = query.order_by(ChatMessage.created_at.asc(), ChatMessage.id.asc()).limit(limit + 1)
+        messages = (await db.execute(query)).scalars().all()
+        has_more = len(messages) > limit
+        messages = messages[:limit]
+    else:
+        # En yeniden geriye doğru okunur, istemciye kronolojik sırada döndürülür
+        query = query.order_by(ChatMessage.created_at.desc(), ChatMessage.id.desc()).limit(limit + 1)
+        messages = (await db.execute(query)).scalars().all()
+        has_more = len(messages) > limit
+        messages = messages[:limit][::-1]
+
+    return MessagePage(
+        items=messages,
+        has_more=has_more,
+        before_cursor=cursor_for(messages[0]) if messages else before,
+        after_cursor=cursor_for(messages[-1]) if messages else after,
+    )
+
+@router.post("/reply/stream", status_code=status.HTTP_200_OK)
+async def reply_message_stream(
+    message: MessageCreate,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    no_cache: bool = False
+):
+    """
+    `/reply` endpoint'inin Server-Sent Events (SSE) ile akış yapan versiyonu.
+
+    İşlem Adımları:
+    1. Bot yanıtını üretildikçe `token` olayları halinde gönderir.
+    2. Akış bittiğinde kullanıcı ve bot mesajlarını tek bir transaction'da kaydeder ve bot
+       mesajını `done` olayı ile döndürür.
+
+    Olaylar:
+    - `token`: `{"text": "<parça>"}`
+    - `done`: Kaydedilmiş bot mesajı (MessageOut).
+    - `error`: `{"detail": "<hata>"}`
+
+    Hata Durumları:
+    - Model henüz hazır değilse akış başlamadan HTTP 503 döner.
+    - İstemci bağlantıyı keserse veya üretim hata verirse yalnızca kullanıcı mesajı kaydedilir.
+    """
+    if not model_registry.ready:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Model is not ready yet."
+        )
+
+    user_id = current_user["id"]
+    model_input, cacheable = await run_in_threadpool(build_model_input, user_id, message.text)
+    user_message = ChatMessage(sender="user", text=message.text, user_id=user_id, created_at=utc_now())
+    cache_key = reply_cache.make_key(message.text, model_registry.version) if cacheable and not no_cache else None
+
+    async def event_stream():
+        parts = []
+        tokens = stream_reply_tokens(model_input, cache_key)
+        try:
+            async for token in tokens:
+                if await request.is_disconnected():
+                    await save_chat_messages([user_message])
+                    return
+                parts.append(token)
+                yield sse_event("token", {"text": token})
+        except Exception as e:
+            await save_chat_messages([user_message])
+            yield sse_event("error", {"detail": f"Model prediction failed: {str(e)}"})
+            return
+        finally:
+            await tokens.aclose()
+
+        bot_text = "".join(parts).strip()
+        bot_message = ChatMessage(sender="bot", text=bot_text, user_id=user_id)
+        _, saved_bot_message = await save_chat_messages([user_message, bot_message])
+        remember_message(user_id, "bot", bot_text)
+        yield sse_event("done", saved_bot_message.model_dump(mode="json"))
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
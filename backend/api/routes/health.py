@@ -0,0 +1,137 @@
+import os
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from config.media import media_pipeline
+from dependencies.dependency import password_hasher, token_cache
+from routes.chat_messages import model_registry, reply_cache, conversation_store
+from routes.messages import message_hub
+from routes.users import follow_cache
+from services.user_profiles import profile_cache
+
+router = APIRouter(
+  prefix="/health",
+  tags=["health"]
+)
+
+# Model hot-swap işlemi için yönetici anahtarı; tanımlı değilse reload endpoint'i kapalıdır
+MODEL_ADMIN_TOKEN = os.getenv("MODEL_ADMIN_TOKEN")
+MODEL_DIR = os.path.abspath(os.getenv("CHAT_MODEL_DIR", "./models"))
+
+class ModelReloadRequest(BaseModel):
+  filename: str
+  version: Optional[str] = None
+
+@router.get("/live")
+def liveness():
+  """
+    Sürecin ayakta olduğunu bildirir. Model durumundan bağımsızdır.
+  """
+  return {"status": "ok"}
+
+@router.get("/ready")
+def readiness():
+  """
+    Worker'ın chat trafiği almaya hazır olup olmadığını bildirir.
+
+    Dönüş:
+    - Model yüklenip ısındıysa 200 OK ve model bilgileri.
+    - Model henüz hazır değilse 503 Service Unavailable ve yükleme durumu.
+  """
+  model_status = model_registry.status()
+  if not model_status["ready"]:
+    return JSONResponse(
+      status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+      content={"status": "loading", "model": jsonable_encoder(model_status)}
+    )
+  return {"status": "ready", "model": model_status}
+
+@router.get("/reply-cache")
+def reply_cache_stats():
+  """
+    Bot yanıt önbelleğinin isabet/ıskalama sayaçlarını ve doluluğunu döndürür.
+  """
+  return reply_cache.stats()
+
+@router.get("/follow-cache")
+def follow_cache_stats():
+  """
+    Takip durumu önbelleğinin isabet/ıskalama sayaçlarını ve doluluğunu döndürür.
+  """
+  return follow_cache.stats()
+
+@router.get("/user-profile-cache")
+def user_profile_cache_stats():
+  """
+    Kullanıcı profili önbelleğinin isabet/ıskalama sayaçlarını ve doluluğunu döndürür.
+  """
+  return profile_cache.stats()
+
+@router.get("/token-cache")
+def token_cache_stats():
+  """
+    Doğrulanmış token önbelleğinin isabet/ıskalama sayaçlarını ve doluluğunu döndürür.
+  """
+  return token_cache.stats()
+
+@router.get("/password-hasher")
+def password_hasher_stats():
+  """
+    Parola hash havuzunun bekleyen, reddedilen ve yeniden hash'lenen işlem sayılarını döndürür.
+  """
+  return password_hasher.stats()
+
+@router.get("/media")
+def media_pipeline_stats():
+  """
+    Medya iş hattının bekleyen, işlenen, reddedilen ve başarısız yükleme sayılarını döndürür.
+  """
+  return media_pipeline.stats()
+
+@router.get("/message-hub")
+def message_hub_stats():
+  """
+    Açık WebSocket bağlantı sayısını ve yayınlanan/iletilen/düşürülen olay sayılarını döndürür.
+  """
+  return message_hub.stats()
+
+@router.get("/conversation-context")
+def conversation_context_stats():
+  """
+    Bellekteki sohbet bağlamlarının sayısını ve toplam token kullanımını döndürür.
+  """
+  if conversation_store is None:
+    return {"enabled": False}
+  return {"enabled": True, **conversation_store.stats()}
+
+@router.post("/model/reload", status_code=status.HTTP_202_ACCEPTED)
+def reload_model(request: ModelReloadRequest, x_admin_token: Optional[str] = Header(default=None)):
+  """
+    Yeni bir model sürümünü yeniden başlatmadan arka planda yükler (hot-swap).
+
+    Yeni model yüklenip ısınana kadar mevcut model hizmet vermeye devam eder.
+
+    Parametreler:
+    - `filename` (str): `CHAT_MODEL_DIR` içindeki model dosyasının adı.
+    - `version` (str, opsiyonel): Sürüm etiketi.
+    - `X-Admin-Token` başlığı: `MODEL_ADMIN_TOKEN` ile eşleşmelidir.
+
+    Hata Durumları:
+    - Yönetici anahtarı tanımlı değilse veya eşleşmiyorsa 403 döner.
+    - Dosya bulunamazsa 404 döner.
+    - Devam eden bir yükleme varsa 409 döner.
+  """
+  if not MODEL_ADMIN_TOKEN or x_admin_token != MODEL_ADMIN_TOKEN:
+    raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allowed to reload the model.")
+
+  path = os.path.abspath(os.path.join(MODEL_DIR, request.filename))
+  if os.path.dirname(path) != MODEL_DIR or not os.path.isfile(path):
+    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Model file not found.")
+
+  if not model_registry.load_in_background(path, request.version):
+    raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="A model is already being loaded.")
+
+  return {"detail": "Model reload started", "model": model_registry.status()}
@@ -1,11 +1,21 @@
+import asyncio
+import os
+from datetime import datetime
 from pydantic import BaseModel
-from fastapi import APIRouter, HTTPException
-from sqlalchemy.orm import joinedload
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Query, Request, WebSocket, WebSocketDisconnect, status
+from starlette.websockets import WebSocketState
+from sqlalchemy import select
 from typing import Optional, List
 
+from models.mixins import utc_now
 from models.user import User
 from models.message import Message
-from dependencies.dependency import db_dependency, user_dependency
+from config.media import media_pipeline
+from dependencies.dependency import async_db_dependency, get_current_user, media_error, user_dependency
+from services.conversations import mark_read, read_history, read_inbox, record_message, remove_message
+from services.media import MEDIA_KINDS
+from services.pagination import InvalidCursorError
+from services.pubsub import SubscriptionClosed, create_hub
 
 router = APIRouter(
   prefix="/messages",
@@ -24,10 +34,122 @@ class MessageBase(BaseModel):
 class MessageCreate(MessageBase):
   messages: List[int] =[]
 
+class MessageOut(MessageBase):
+  id: int
+  created_at: datetime
+
+  class Config:
+    from_attributes = True
+
+class MessagePage(BaseModel):
+  items: List[MessageOut]
+  next_cursor: Optional[str] = None
+
+class ConversationOut(BaseModel):
+  partner_id: int
+  partner_username: str
+  partner_profile: Optional[str] = None
+  last_message: MessageOut
+  last_message_at: datetime
+  unread_count: int
+
+class InboxPage(BaseModel):
+  items: List[ConversationOut]
+  next_cursor: Optional[str] = None
+
+MESSAGE_PAGE_SIZE = 30
+INBOX_PAGE_SIZE = 20
+MESSAGE_MAX_PAGE_SIZE = 100
+
+# Gerçek zamanlı olayların dağıtıldığı hub (`services.pubsub.HUB_BACKENDS`)
+MESSAGE_HUB_BACKEND = os.getenv("MESSAGE_HUB_BACKEND", "memory")
+# Bağlantı başına bekleyebilecek en fazla olay; aşılırsa bağlantı kapatılır
+MESSAGE_WS_QUEUE_SIZE = int(os.getenv("MESSAGE_WS_QUEUE_SIZE", "100"))
+# Bu süre boyunca olay gönderilmezse istemciye ping gönderilir; istemciden iki katı süre
+# boyunca hiçbir şey gelmezse bağlantı kapatılır
+MESSAGE_WS_HEARTBEAT_SECONDS = float(os.getenv("MESSAGE_WS_HEARTBEAT_SECONDS", "25"))
+MESSAGE_WS_SEND_TIMEOUT = float(os.getenv("MESSAGE_WS_SEND_TIMEOUT", "10"))
+
+message_hub = create_hub(MESSAGE_HUB_BACKEND, max_queue_size=MESSAGE_WS_QUEUE_SIZE)
+
+async def publish_message_event(event_type: str, message: Message):
+  # Olay alıcının ve göndericinin (diğer cihazları için) açık bağlantılarına iletilir
+  event = {"type": event_type, "message": MessageOut.model_validate(message).model_dump(mode="json")}
+  for user_id in {message.sender_id, message.receiver_id}:
+    await message_hub.publish(user_id, event)
+
+async def send_events(websocket: WebSocket, subscription):
+  while True:
+    try:
+      event = await asyncio.wait_for(subscription.get(), MESSAGE_WS_HEARTBEAT_SECONDS)
+    except asyncio.TimeoutError:
+      event = {"type": "ping"}
+    except SubscriptionClosed as e:
+      code = status.WS_1001_GOING_AWAY if e.reason == "shutdown" else status.WS_1013_TRY_AGAIN_LATER
+      await websocket.close(code=code, reason=e.reason)
+      return
+    await asyncio.wait_for(websocket.send_json(event), MESSAGE_WS_SEND_TIMEOUT)
+
+async def receive_heartbeats(websocket: WebSocket):
+  # İstemciden gelen her çerçeve (ör. "pong") bağlantının canlı olduğunu gösterir
+  while True:
+    try:
+      await asyncio.wait_for(websocket.receive_text(), MESSAGE_WS_HEARTBEAT_SECONDS * 2)
+    except asyncio.TimeoutError:
+      await websocket.close(code=status.WS_1001_GOING_AWAY, reason="heartbeat timeout")
+      return
+    except WebSocketDisconnect:
+      return
+
+@router.websocket("/ws")
+async def messages_ws(websocket: WebSocket, token: str = ""):
+  """
+    Kullanıcıya gelen mesaj olaylarını gerçek zamanlı ileten WebSocket bağlantısı.
+
+    Mesaj oluşturma, güncelleme ve silme işlemleri `message.created`, `message.updated` ve
+    `message.deleted` olaylarını her iki tarafa yayınlar; istemcinin `GET /messages/` ile
+    yoklama yapması gerekmez.
+
+    Parametreler:
+    - token (str): Erişim token'ı; tarayıcılar WebSocket isteğine başlık ekleyemediğinden
+      sorgu parametresi olarak (`/messages/ws?token=...`) verilir.
+
+    İşleyiş:
+    - Olay olmadığında her `MESSAGE_WS_HEARTBEAT_SECONDS` saniyede bir `{"type": "ping"}` gönderilir.
+      İstemci bunlara herhangi bir mesajla (ör. "pong") yanıt vermelidir; iki katı süre boyunca
+      istemciden bir şey gelmezse bağlantı 1001 koduyla kapatılır.
+    - Olayları yeterince hızlı okumayan istemcinin kuyruğu dolarsa bağlantı 1013 koduyla kapatılır;
+      istemci yeniden bağlanıp kaçırdıklarını `GET /messages/conversations` ile okur.
+
+    Hata Durumları:
+    - Token geçersizse bağlantı 1008 koduyla kapatılır.
+  """
+  try:
+    user = await get_current_user(token)
+  except HTTPException:
+    await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+    return
+
+  await websocket.accept()
+  async with message_hub.subscribe(user["id"]) as subscription:
+    tasks = {
+      asyncio.create_task(send_events(websocket, subscription)),
+      asyncio.create_task(receive_heartbeats(websocket)),
+    }
+    _, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    for task in pending:
+      task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+  if websocket.application_state != WebSocketState.DISCONNECTED:
+    try:
+      await websocket.close()
+    except RuntimeError:
+      pass
 
 
 @router.get("/")
-def get_messages(db: db_dependency, user: user_dependency):
+async def get_messages(db: async_db_dependency, user: user_dependency):
   """
     Kullanıcıya ait gönderilen ve alınan tüm mesajları getirir.
 
@@ -41,15 +163,110 @@ def get_messages(db: db_dependency, user: user_dependency):
     Hata Durumları:
     - Mesaj bulunmazsa boş bir liste döner.
     """
-  sent_messages = db.query(Message).filter(Message.sender_id == user.get("id")).all()
-  received_messages = db.query(Message).filter(Message.receiver_id == user.get("id")).all()
+  sent_messages = (await db.execute(select(Message).where(Message.sender_id == user.get("id")))).scalars().all()
+  received_messages = (await db.execute(select(Message).where(Message.receiver_id == user.get("id")))).scalars().all()
   return {"sended": sent_messages, "received": received_messages}
 
+@router.get("/conversations", response_model=InboxPage)
+async def get_conversations(
+  db: async_db_dependency,
+  user: user_dependency,
+  cursor: Optional[str] = None,
+  limit: int = Query(default=INBOX_PAGE_SIZE, ge=1, le=MESSAGE_MAX_PAGE_SIZE),
+):
+  """
+    Kullanıcının gelen kutusunu, her mesajlaşılan kişi için bir satır olacak şekilde döndürür.
+
+    Satırlar `conversations` özet tablosundan son mesaj zamanına göre en yeniden eskiye
+    sayfalar halinde okunur; mesaj tablosunun tamamı okunmaz.
+
+    Parametreler:
+    - db (AsyncSession): Veritabanı oturumu.
+    - user (dict): Şu anki oturum açmış kullanıcı bilgileri.
+    - cursor (str, opsiyonel): Önceki sayfanın `next_cursor` değeri; verilmezse ilk sayfa döner.
+    - limit (int): Sayfadaki en fazla mesajlaşma sayısı.
+
+    Dönen Değer:
+    - InboxPage: Karşı taraf, son mesaj, zamanı ve okunmamış mesaj sayısı ile mesajlaşmalar.
+
+    Hata Durumları:
+    - İmleç geçersizse HTTP 400 döner.
+  """
+  try:
+    conversations, next_cursor = await read_inbox(db, user.get("id"), cursor, limit)
+  except InvalidCursorError as e:
+    raise HTTPException(status_code=400, detail=str(e))
+  return InboxPage(
+    items=[
+      ConversationOut(
+        partner_id=conversation.partner_id,
+        partner_username=conversation.partner.username,
+        partner_profile=conversation.partner.profile,
+        last_message=MessageOut.model_validate(conversation.last_message),
+        last_message_at=conversation.last_message_at,
+        unread_count=conversation.unread_count,
+      )
+      for conversation in conversations
+    ],
+    next_cursor=next_cursor,
+  )
+
+@router.get("/conversations/{partner_id}", response_model=MessagePage)
+async def get_conversation(
+  partner_id: int,
+  db: async_db_dependency,
+  user: user_dependency,
+  cursor: Optional[str] = None,
+  limit: int = Query(default=MESSAGE_PAGE_SIZE, ge=1, le=MESSAGE_MAX_PAGE_SIZE),
+):
+  """
+    Kullanıcı ile bir kişi arasındaki mesajları en yeniden eskiye sayfalar halinde döndürür.
+
+    Parametreler:
+    - partner_id (int): Mesajlaşılan kişinin ID'si.
+    - db (AsyncSession): Veritabanı oturumu.
+    - user (dict): Şu anki oturum açmış kullanıcı bilgileri.
+    - cursor (str, opsiyonel): Önceki sayfanın `next_cursor` değeri; verilmezse en yeni mesajlar döner.
+    - limit (int): Sayfadaki en fazla mesaj sayısı.
+
+    Dönen Değer:
+    - MessagePage: Mesajlar ve (devamı varsa) daha eski mesajların imleci.
+
+    Hata Durumları:
+    - İmleç geçersizse HTTP 400 döner.
+  """
+  try:
+    messages, next_cursor = await read_history(db, user.get("id"), partner_id, cursor, limit)
+  except InvalidCursorError as e:
+    raise HTTPException(status_code=400, detail=str(e))
+  return MessagePage(items=messages, next_cursor=next_cursor)
+
+@router.post("/conversations/{partner_id}/read")
+async def read_conversation(partner_id: int, db: async_db_dependency, user: user_dependency):
+  """
+    Bir kişiyle olan mesajlaşmayı okundu olarak işaretler ve okunmamış sayısını sıfırlar.
+
+    Parametreler:
+    - partner_id (int): Mesajlaşılan kişinin ID'si.
+    - db (AsyncSession): Veritabanı oturumu.
+    - user (dict): Şu anki oturum açmış kullanıcı bilgileri.
+
+    Hata Durumları:
+    - Böyle bir mesajlaşma yoksa HTTP 404 döner.
+  """
+  if not await mark_read(db, user.get("id"), partner_id):
+    raise HTTPException(status_code=404, detail="Conversation not found.")
+  await db.commit()
+  return { "detail": "Conversation marked as read" }
+
 @router.post("/")
-def create_message(db: db_dependency, user: user_dependency, message: MessageCreate):
+async def create_message(db: async_db_dependency, user: user_dependency, message: MessageCreate):
   """
     Yeni bir mesaj oluşturur ve veritabanına kaydeder.
 
+    İki tarafın gelen kutusu özeti (son mesaj, alıcının okunmamış sayısı) aynı transaction'da
+    güncellenir.
+
     Parametreler:
     - db (Session): Veritabanı oturumu.
     - user (dict): Şu anki oturum açmış kullanıcı bilgileri.
@@ -65,7 +282,7 @@ def create_message(db: db_dependency, user: user_dependency, message: MessageCre
   if user.get("id") != message.sender_id:
     raise HTTPException(status_code=403, detail="You are not allowed to send this message.")
   
-  receiver = db.query(User).filter(User.id == message.receiver_id).first()
+  receiver = await db.get(User, message.receiver_id)
   if not receiver:
     raise HTTPException(status_code=404, detail="Receiver not found.")
 
@@ -77,14 +294,18 @@ def create_message(db: db_dependency, user: user_dependency, message: MessageCre
     image_url=message.image_url,
     audio_url=message.audio_url,
     video_url=message.video_url,
+    created_at=utc_now(),
   )
 
   db.add(db_message)
-  db.commit()
-  db.refresh(db_message)
+  await db.flush()
+  await record_message(db, db_message)
+  await db.commit()
+  await publish_message_event("message.created", db_message)
+  return MessageOut.model_validate(db_message)
 
 @router.put("/{id}")
-def update_message(db: db_dependency, user: user_dependency, message: MessageCreate, id: int):
+async def update_message(db: async_db_dependency, user: user_dependency, message: MessageCreate, id: int):
   """
     Belirtilen bir mesajı günceller.
 
@@ -101,7 +322,7 @@ def update_message(db: db_dependency, user: user_dependency, message: MessageCre
     Dönen Değer:
     - dict: Güncellenmiş mesaj bilgileri.
     """
-  db_message = db.query(Message).filter(Message.id == id).first()
+  db_message = await db.get(Message, id)
 
   if not db_message:
     raise HTTPException(status_code=404, detail="Message not found.")
@@ -121,14 +342,79 @@ def update_message(db: db_dependency, user: user_dependency, message: MessageCre
     if value:
       setattr(db_message, field, value)
 
-  db.commit()
-  db.refresh(db_message)
+  await db.commit()
+  await publish_message_event("message.updated", db_message)
       
+@router.post("/{id}/media", response_model=MessageOut)
+async def upload_message_media(
+  id: int,
+  request: Request,
+  db: async_db_dependency,
+  user: user_dependency,
+  background_tasks: BackgroundTasks,
+):
+  """
+    Mesaja görsel, ses veya video ekler.
+
+    İstek `file` alanında bir dosya içeren `multipart/form-data` olmalıdır; dosyanın türü
+    (`services.media.MEDIA_TYPES`) mesajın `image_url`, `audio_url` veya `video_url` alanından
+    hangisinin doldurulacağını belirler. Dosya `media_pipeline` ile işlenip saklandıktan sonra
+    mesaj güncellenir ve her iki tarafa `message.updated` olayı yayınlanır. Görseller için küçük
+    resim üretilmez. Aynı türde önceki bir ek varsa dosyası yanıt gönderildikten sonra silinir.
+
+    Parametreler:
+    - id (int): Medyanın ekleneceği mesajın ID'si.
+    - request (Request): Yüklenen dosyayı içeren istek.
+    - db (Session): Veritabanı oturumu.
+    - user (dict): Şu anki oturum açmış kullanıcı bilgileri.
+    - background_tasks (BackgroundTasks): Önceki ekin silinmesi için.
+
+    Hata Durumları:
+    - Mesaj bulunamazsa HTTP 404 döner.
+    - Kullanıcı mesajın göndericisi değilse HTTP 403 döner.
+    - Dosya türünün boyut sınırını aşıyorsa HTTP 413, türü desteklenmiyorsa HTTP 415,
+      `file` alanı yoksa HTTP 400 döner.
+
+    Dönen Değer:
+    - MessageOut: Güncellenmiş mesaj.
+  """
+  sender_id = await db.scalar(select(Message.sender_id).where(Message.id == id))
+  if sender_id is None:
+    raise HTTPException(status_code=404, detail="Message not found.")
+  if sender_id != user.get("id"):
+    raise HTTPException(status_code=403, detail="You are not allowed to update this message.")
+  # Okuma transaction'ı kapatılır; bağlantı yükleme ve işleme süresince tutulmaz
+  await db.commit()
+
+  uploaded = None
+  try:
+    uploaded = await media_pipeline.receive(request.headers, request.stream(), kinds=MEDIA_KINDS)
+    media = await media_pipeline.process(uploaded, f"messages/{id}", thumbnail=False)
+  except Exception as e:
+    raise media_error(e)
+  finally:
+    if uploaded is not None:
+      await uploaded.close()
+
+  db_message = await db.get(Message, id)
+  if not db_message:
+    await media_pipeline.discard(media)
+    raise HTTPException(status_code=404, detail="Message not found.")
+  previous = getattr(db_message, f"{media.kind}_url")
+  setattr(db_message, f"{media.kind}_url", media.url)
+  await db.commit()
+  background_tasks.add_task(media_pipeline.discard_urls, f"messages/{id}", [previous])
+  await publish_message_event("message.updated", db_message)
+  return MessageOut.model_validate(db_message)
+
 @router.delete("/{id}")
-def delete_message(id: int, db: db_dependency, user: user_dependency):
+async def delete_message(id: int, db: async_db_dependency, user: user_dependency):
   """
     Belirtilen bir mesajı siler.
 
+    Silinen mesaj son mesajsa gelen kutusu özetlerine kalan en yeni mesaj yazılır; alıcı
+    mesajı okumadıysa okunmamış sayısı azaltılır.
+
     Parametreler:
     - id (int): Silinecek mesajın ID'si.
     - db (Session): Veritabanı oturumu.
@@ -141,7 +427,7 @@ def delete_message(id: int, db: db_dependency, user: user_dependency):
     Dönen Değer:
     - dict: Silme işleminin başarı durumunu belirten bir mesaj.
     """
-  db_message = db.query(Message).filter(Message.id == id).first()
+  db_message = await db.get(Message, id)
 
   if not db_message:
     raise HTTPException(status_code=404, detail="Message not found.")
@@ -149,7 +435,10 @@ def delete_message(id: int, db: db_dependency, user: user_dependency):
   if db_message.sender_id != user.get("id") and db_message.receiver_id != user.get("id"):
     raise HTTPException(status_code=403, detail="You are not allowed to delete this message.")
   
-  db.delete(db_message)
-  db.commit()
+  await remove_message(db, db_message)
+  await db.delete(db_message)
+  await db.flush()
+  await db.commit()
+  await publish_message_event("message.deleted", db_message)
 
   return { "detail": "Message deleted successfully" }
\ No newline at end of file
@@ -1,12 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
-from datetime import datetime, timezone
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
+from sqlalchemy import select
+from typing import List, Optional
+from datetime import datetime
 from pydantic import BaseModel
 
-from dependencies.dependency import db_dependency, get_current_user
+from dependencies.dependency import async_db_dependency, get_current_user
+from models.mixins import utc_now
 from models.tweet import Tweet
 from models.user import User
+from services.counters import adjust_tweet_count
+from services.feed import fan_out_tweet, read_feed, trim_feeds_in_background
+from services.pagination import InvalidCursorError, cursor_for, keyset_condition
 
 router = APIRouter(
     prefix="/tweets",
@@ -23,62 +27,152 @@ class TweetOut(TweetBase):
     id: int
     user_id: int
     created_at: datetime
+    like_count: int = 0
+    repost_count: int = 0
+    comment_count: int = 0
+    bookmark_count: int = 0
 
     class Config:
         from_attributes = True
 
+class TweetPage(BaseModel):
+    items: List[TweetOut]
+    next_cursor: Optional[str] = None
+
+TWEET_PAGE_SIZE = 20
+TWEET_MAX_PAGE_SIZE = 100
+
 @router.post("/", response_model=TweetOut, status_code=status.HTTP_201_CREATED)
-def create_tweet(tweet: TweetCreate, db: db_dependency, current_user: User = Depends(get_current_user)):
+async def create_tweet(
+    tweet: TweetCreate,
+    db: async_db_dependency,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_user)
+):
     """
     Bu endpoint, kullanıcıların yeni bir tweet oluşturmasını sağlar.
+
+    Tweet, aynı transaction içinde yazarın takipçilerinin akışlarına da eklenir (fan-out) ve
+    yazarın tweet sayacı artırılır; akışların kırpılması yanıt gönderildikten sonra arka planda yapılır.
     
     Parametreler:
     - tweet: TweetCreate modeline göre tweet içeriği.
-    - db: Veritabanı oturumu (db_dependency) sağlanır.
+    - db: Veritabanı oturumu (async_db_dependency) sağlanır.
     - current_user: Kullanıcının kimliği, get_current_user fonksiyonu ile doğrulanır.
     
     Dönen Değer:
     - Yeni oluşturulmuş tweet, TweetOut modeline göre döndürülür.
     """
-    new_tweet = Tweet(content=tweet.content, user_id=current_user["id"], created_at=datetime.now(timezone.utc))
+    new_tweet = Tweet(content=tweet.content, user_id=current_user["id"], created_at=utc_now())
     db.add(new_tweet)
-    db.commit()
-    db.refresh(new_tweet)
+    await db.flush()
+    follower_ids = await fan_out_tweet(db, new_tweet)
+    await adjust_tweet_count(db, new_tweet.user_id, 1)
+    await db.commit()
+    if follower_ids:
+        background_tasks.add_task(trim_feeds_in_background, follower_ids)
     return new_tweet
 
-@router.get("/", response_model=List[TweetOut], status_code=status.HTTP_200_OK)
-def get_all_tweets(db: db_dependency):
+async def paginate_tweets(db, query, cursor: Optional[str], limit: int) -> TweetPage:
+    """
+    Tweet sorgusunu en yeniden eskiye `(created_at, id)` sırasıyla bir sayfa olarak çalıştırır.
+
+    Sayfanın devamı olup olmadığını anlamak için `limit + 1` satır okunur; OFFSET
+    kullanılmadığından sayfa maliyeti tablonun büyüklüğünden bağımsızdır.
+
+    Hata Durumları:
+    - İmleç geçersizse HTTP 400 döner.
+    """
+    if cursor:
+        try:
+            query = query.where(keyset_condition(Tweet.created_at, Tweet.id, cursor, before=True))
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    query = query.order_by(Tweet.created_at.desc(), Tweet.id.desc()).limit(limit + 1)
+    tweets = (await db.execute(query)).scalars().all()
+    has_more = len(tweets) > limit
+    tweets = tweets[:limit]
+    return TweetPage(items=tweets, next_cursor=cursor_for(tweets[-1]) if has_more else None)
+
+@router.get("/", response_model=TweetPage, status_code=status.HTTP_200_OK)
+async def get_all_tweets(
+    db: async_db_dependency,
+    cursor: Optional[str] = None,
+    limit: int = Query(default=TWEET_PAGE_SIZE, ge=1, le=TWEET_MAX_PAGE_SIZE),
+):
     """
-    Bu endpoint, tüm tweet'leri döndürür.
+    Bu endpoint, tüm tweet'leri en yeniden eskiye sayfalar halinde döndürür.
     
     Parametreler:
-    - db: Veritabanı oturumu (db_dependency) sağlanır.
+    - db: Veritabanı oturumu (async_db_dependency) sağlanır.
+    - cursor (str, opsiyonel): Önceki sayfanın `next_cursor` değeri; verilmezse ilk sayfa döner.
+    - limit (int): Sayfadaki en fazla tweet sayısı.
     
     Dönen Değer:
-    - Tweet'lerin bir listesi (TweetOut modeli ile döndürülür).
+    - TweetPage: Tweet'ler ve (devamı varsa) sonraki sayfanın imleci.
+
+    Hata Durumları:
+    - İmleç geçersizse HTTP 400 döner.
+    """
+    return await paginate_tweets(db, select(Tweet), cursor, limit)
+
+@router.get("/feed", response_model=TweetPage, status_code=status.HTTP_200_OK)
+async def get_feed(
+    db: async_db_dependency,
+    current_user: User = Depends(get_current_user),
+    cursor: Optional[str] = None,
+    limit: int = Query(default=TWEET_PAGE_SIZE, ge=1, le=TWEET_MAX_PAGE_SIZE),
+):
+    """
+    Bu endpoint, oturum açmış kullanıcının ana sayfa akışını en yeniden eskiye sayfalar halinde döndürür.
+
+    Akış; takip edilen yazarların, tweet oluşturulurken kullanıcının akışına yazılmış
+    tweet'lerinden, kullanıcının kendi tweet'lerinden ve takip edilen çok takipçili yazarların
+    okuma sırasında eklenen tweet'lerinden oluşur (bkz. `services.feed.read_feed`).
+
+    Parametreler:
+    - db: Veritabanı oturumu (async_db_dependency) sağlanır.
+    - current_user: Kullanıcının kimliği, get_current_user fonksiyonu ile doğrulanır.
+    - cursor (str, opsiyonel): Önceki sayfanın `next_cursor` değeri; verilmezse ilk sayfa döner.
+    - limit (int): Sayfadaki en fazla tweet sayısı.
+
+    Dönen Değer:
+    - TweetPage: Akıştaki tweet'ler ve (devamı varsa) sonraki sayfanın imleci.
+
+    Hata Durumları:
+    - İmleç geçersizse HTTP 400 döner.
     """
-    tweets = db.query(Tweet).all()
-    return tweets
+    try:
+        tweets, next_cursor = await read_feed(db, current_user["id"], cursor, limit)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return TweetPage(items=tweets, next_cursor=next_cursor)
 
-@router.get("/my_tweets", response_model=List[TweetOut], status_code=status.HTTP_200_OK)
-def get_user_tweets(db: db_dependency, current_user_id: int):
+@router.get("/my_tweets", response_model=TweetPage, status_code=status.HTTP_200_OK)
+async def get_user_tweets(
+    db: async_db_dependency,
+    current_user_id: int,
+    cursor: Optional[str] = None,
+    limit: int = Query(default=TWEET_PAGE_SIZE, ge=1, le=TWEET_MAX_PAGE_SIZE),
+):
     """
-    Bu endpoint, belirli bir kullanıcının tweet'lerini döndürür.
+    Bu endpoint, belirli bir kullanıcının tweet'lerini en yeniden eskiye sayfalar halinde döndürür.
     
     Parametreler:
-    - db: Veritabanı oturumu (db_dependency) sağlanır.
+    - db: Veritabanı oturumu (async_db_dependency) sağlanır.
     - current_user_id: Kullanıcının ID'si.
+    - cursor (str, opsiyonel): Önceki sayfanın `next_cursor` değeri; verilmezse ilk sayfa döner.
+    - limit (int): Sayfadaki en fazla tweet sayısı.
     
     Dönen Değer:
-    - Kullanıcıya ait tweet'lerin bir listesi (TweetOut modeli ile döndürülür).
+    - TweetPage: Kullanıcının tweet'leri ve (devamı varsa) sonraki sayfanın imleci.
+      Kullanıcının tweet'i yoksa boş bir sayfa döner.
     
     Hata Durumu:
-    - Eğer kullanıcıya ait tweet bulunamazsa, 404 Not Found hatası döner.
+    - Eğer kullanıcı bulunamazsa, 404 Not Found hatası döner.
+    - İmleç geçersizse HTTP 400 döner.
     """
-    current_user = db.query(User).filter(User.id == current_user_id).first()
+    current_user = await db.get(User, current_user_id)
     if not current_user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found.")
-    tweets = db.query(Tweet).filter(Tweet.user_id == current_user.id).order_by(Tweet.created_at.desc()).all()
-    if not tweets:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No tweets found for this user.")
-    return tweets
+    return await paginate_tweets(db, select(Tweet).where(Tweet.user_id == current_user.id), cursor, limit)
@@ -1,17 +1,27 @@
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 import cloudinary.uploader
 from pydantic import BaseModel
-from fastapi import APIRouter, Depends, status, HTTPException, File, UploadFile
+from fastapi import APIRouter, BackgroundTasks, Depends, status, HTTPException, File, UploadFile, Query, Header, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, insert, select
 from datetime import datetime
+import json
 import os
 import shutil
 import cloudinary
 from cloudinary.uploader import upload
 
-from models.user import User
-from dependencies.dependency import db_dependency
+from config.database import AsyncSessionLocal
+from models.user import User, follows
+from config.media import media_pipeline
+from dependencies.dependency import async_db_dependency, media_error
+from services.counters import adjust_follow_counts
+from services.feed import backfill_feed, remove_author_from_feed, update_fanout_mode
+from services.pagination import InvalidCursorError, decode_id_cursor, encode_id_cursor
+from services.follow_graph import FollowCache, is_following, relationship_states
+from services.user_profiles import PROFILE_FIELDS, load_profiles, profile_cache
 from .auth import get_current_user
 
 router = APIRouter(
@@ -33,6 +43,7 @@ class UserSchema(BaseModel):
   first_name: Optional[str] = None
   last_name: Optional[str] = None
   profile: Optional[str] = None
+  profile_thumbnail: Optional[str] = None
   bio: Optional[str] = None
   created_at: Optional[datetime] = None
 
@@ -42,23 +53,106 @@ class UserSchema(BaseModel):
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/token")
 
+# Toplu takip durumu isteğinde en fazla kaç kullanıcı sorulabileceği
+RELATIONSHIP_BATCH_MAX = int(os.getenv("RELATIONSHIP_BATCH_MAX", "300"))
+# Süreç içi takip durumu önbelleğindeki en fazla çift sayısı; 0 önbelleği kapatır
+FOLLOW_CACHE_SIZE = int(os.getenv("FOLLOW_CACHE_SIZE", "0"))
+
+follow_cache = FollowCache(max_entries=FOLLOW_CACHE_SIZE, enabled=FOLLOW_CACHE_SIZE > 0)
+
+# Toplu kullanıcı isteğinde en fazla kaç kullanıcı sorulabileceği
+USER_BATCH_MAX = int(os.getenv("USER_BATCH_MAX", "200"))
+
 @router.get("/")
-def get_user(db: db_dependency, user_id: int):
-  return db.query(User).filter(User.id == user_id).first()
+async def get_user(db: async_db_dependency, user_id: int):
+  return await db.get(User, user_id)
+
+class DirectoryUser(BaseModel):
+  id: int
+  username: str
+  first_name: Optional[str] = None
+  last_name: Optional[str] = None
+  profile: Optional[str] = None
+
+  class Config:
+    from_attributes = True
 
-@router.get("/users")
-def get_users(db: db_dependency):
+class UserPage(BaseModel):
+  items: List[DirectoryUser]
+  next_cursor: Optional[str] = None
+
+USER_DIRECTORY_PAGE_SIZE = 50
+USER_DIRECTORY_MAX_PAGE_SIZE = 200
+# Dışa aktarımda veritabanından tek seferde okunan satır sayısı
+USER_EXPORT_CHUNK_SIZE = int(os.getenv("USER_EXPORT_CHUNK_SIZE", "1000"))
+USER_EXPORT_ADMIN_TOKEN = os.getenv("USER_EXPORT_ADMIN_TOKEN")
+
+@router.get("/users", response_model=UserPage)
+async def get_users(
+  db: async_db_dependency,
+  cursor: Optional[str] = None,
+  limit: int = Query(default=USER_DIRECTORY_PAGE_SIZE, ge=1, le=USER_DIRECTORY_MAX_PAGE_SIZE),
+):
   """
-    Tüm kullanıcıları döndüren endpoint.
+    Kullanıcı dizinini kimlik sırasıyla sayfalar halinde döndüren endpoint.
+
+    Yalnızca dizinde gösterilen sütunlar seçilir; e-posta ve parola gibi alanlar dönmez.
+    Sayfalar OFFSET yerine birincil anahtar üzerindeki imleçle okunur.
 
     Parametreler:
-    - `db` (Session): Veritabanı bağlantısı.
+    - `db` (AsyncSession): Veritabanı bağlantısı.
+    - `cursor` (str, opsiyonel): Önceki sayfanın `next_cursor` değeri; verilmezse ilk sayfa döner.
+    - `limit` (int): Sayfadaki en fazla kullanıcı sayısı.
 
     Dönüş:
-    - Kullanıcıların bir listesi.
-    - Eğer veritabanında kullanıcı yoksa boş bir liste döndürür.
+    - Kullanıcılar ve (devamı varsa) sonraki sayfanın imleci.
+    - İmleç geçersizse 400 Bad Request hatası döner.
     """
-  return db.query(User).all()
+  query = select(*(getattr(User, field) for field in DirectoryUser.model_fields))
+  if cursor:
+    try:
+      query = query.where(User.id > decode_id_cursor(cursor))
+    except InvalidCursorError as e:
+      raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+  rows = (await db.execute(query.order_by(User.id).limit(limit + 1))).all()
+  page = rows[:limit]
+  return UserPage(
+    items=[DirectoryUser.model_validate(row) for row in page],
+    next_cursor=encode_id_cursor(page[-1].id) if len(rows) > limit else None,
+  )
+
+@router.get("/users/export")
+async def export_users(x_admin_token: Optional[str] = Header(default=None)):
+  """
+    Tüm kullanıcı tablosunu satır başına bir JSON nesnesi (NDJSON) olarak akışla döndüren endpoint.
+
+    Satırlar sunucu taraflı bir imleçten `USER_EXPORT_CHUNK_SIZE` büyüklüğünde parçalar halinde
+    okunup yazılır; tablonun boyutundan bağımsız olarak bellekte en fazla bir parça tutulur.
+    İstek oturumu yanıt gövdesi yazılmadan kapandığından akış kendi oturumunu açar.
+
+    Parametreler:
+    - `X-Admin-Token` başlığı: `USER_EXPORT_ADMIN_TOKEN` ile eşleşmelidir.
+
+    Dönüş:
+    - `application/x-ndjson` akışı; her satırda bir kullanıcının profil alanları (parola hariç).
+    - Yönetici anahtarı tanımlı değilse veya eşleşmiyorsa 403 Forbidden hatası döner.
+    """
+  if not USER_EXPORT_ADMIN_TOKEN or x_admin_token != USER_EXPORT_ADMIN_TOKEN:
+    raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allowed to export users.")
+
+  async def rows():
+    async with AsyncSessionLocal() as db:
+      result = await db.stream(
+        select(*(getattr(User, field) for field in PROFILE_FIELDS)).order_by(User.id)
+      )
+      async for chunk in result.partitions(USER_EXPORT_CHUNK_SIZE):
+        yield "".join(json.dumps(jsonable_encoder(dict(row._mapping))) + "\n" for row in chunk)
+
+  return StreamingResponse(
+    rows(),
+    media_type="application/x-ndjson",
+    headers={"Content-Disposition": 'attachment; filename="users.ndjson"'}
+  )
 
 @router.get("/me", response_model=UserSchema)
 async def get_current_user(current_user: UserSchema = Depends(get_current_user)):
@@ -74,114 +168,237 @@ async def get_current_user(current_user: UserSchema = Depends(get_current_user))
     """
   return current_user
 
+@router.get("/batch", response_model=Dict[int, Dict[str, Any]])
+async def get_users_batch(db: async_db_dependency, ids: List[int] = Query(default=[]), fields: Optional[str] = None):
+  """
+    Birden fazla kullanıcıyı tek seferde döndüren endpoint.
+
+    Önbellekte olmayan kullanıcılar tek bir `IN` sorgusuyla okunur. Önbellek kapalıyken
+    yalnızca istenen sütunlar seçilir; açıkken önbelleğe eksiksiz kayıt yazılabilmesi için
+    `PROFILE_FIELDS` sütunlarının tamamı seçilir.
+
+    Parametreler:
+    - `ids` (List[int]): İstenen kullanıcıların kimlikleri (`?ids=1&ids=2`), en fazla `USER_BATCH_MAX`.
+    - `fields` (str, opsiyonel): Virgülle ayrılmış alan listesi (ör. `username,profile`);
+      verilmezse tüm profil alanları döner.
+    - `db` (AsyncSession): Veritabanı bağlantısı.
+
+    Dönüş:
+    - Kullanıcı kimliğinden istenen alanlara bir eşleme; bulunamayan kullanıcılar yer almaz.
+    - Kullanıcı verilmezse, sayısı sınırı aşarsa veya bilinmeyen bir alan istenirse 400 Bad Request hatası döner.
+  """
+  user_ids = list(dict.fromkeys(ids))
+  if not 1 <= len(user_ids) <= USER_BATCH_MAX:
+    raise HTTPException(
+      status_code=status.HTTP_400_BAD_REQUEST,
+      detail=f"Between 1 and {USER_BATCH_MAX} ids must be requested"
+    )
+  requested = [field.strip() for field in fields.split(",") if field.strip()] if fields else list(PROFILE_FIELDS)
+  unknown = [field for field in requested if field not in PROFILE_FIELDS]
+  if unknown:
+    raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unknown fields: {', '.join(unknown)}")
+
+  profiles = await load_profiles(db, user_ids, requested)
+
+  return {
+    user_id: {field: profiles[user_id][field] for field in requested}
+    for user_id in user_ids
+    if user_id in profiles
+  }
+
+class Relationship(BaseModel):
+  user_id: int
+  is_following: bool
+  is_followed_by: bool
+
+@router.get("/relationships", response_model=List[Relationship])
+async def get_relationships(
+  current_user_id: int,
+  db: async_db_dependency,
+  ids: List[int] = Query(default=[]),
+):
+  """
+    Oturum açmış kullanıcının verilen kullanıcılarla olan takip durumlarını tek seferde döndüren endpoint.
+
+    Kullanıcı listesi gösteren sayfalar her takip butonu için ayrı istek atmak yerine bu
+    endpoint'i kullanır; tüm durumlar `follows` indeksleri üzerinde tek bir sorguyla okunur.
+
+    Parametreler:
+    - `current_user_id` (int): Oturum açmış olan kullanıcının benzersiz kimliği.
+    - `ids` (List[int]): Durumu sorulan kullanıcıların kimlikleri (`?ids=2&ids=3`), en fazla `RELATIONSHIP_BATCH_MAX`.
+    - `db` (AsyncSession): Veritabanı bağlantısı.
+
+    Dönüş:
+    - Her kullanıcı için takip edilip edilmediği (`is_following`) ve oturum açmış kullanıcıyı
+      takip edip etmediği (`is_followed_by`), istekteki sırayla.
+    - Kullanıcı verilmezse veya sayısı sınırı aşarsa 400 Bad Request hatası döner.
+  """
+  user_ids = list(dict.fromkeys(ids))
+  if not 1 <= len(user_ids) <= RELATIONSHIP_BATCH_MAX:
+    raise HTTPException(
+      status_code=status.HTTP_400_BAD_REQUEST,
+      detail=f"Between 1 and {RELATIONSHIP_BATCH_MAX} ids must be requested"
+    )
+  states = await relationship_states(db, current_user_id, user_ids, cache=follow_cache)
+  return [
+    Relationship(user_id=user_id, is_following=states[user_id][0], is_followed_by=states[user_id][1])
+    for user_id in user_ids
+  ]
+
 @router.get("/{user_id}")
-def get_user_by_id(user_id: int, db: db_dependency):
+async def get_user_by_id(user_id: int, db: async_db_dependency):
   """
     Belirtilen kullanıcı ID'sine göre kullanıcıyı döndüren endpoint.
 
     Parametreler:
     - `user_id` (int): Kullanıcının benzersiz kimliği.
-    - `db` (Session): Veritabanı bağlantısı.
+    - `db` (AsyncSession): Veritabanı bağlantısı.
 
     Dönüş:
     - İlgili kullanıcının bilgileri.
     - Eğer kullanıcı bulunamazsa, 404 Not Found hatası döner.
     """
   
-  user = db.query(User).filter(User.id == user_id).first()
+  user = await db.get(User, user_id)
   if user is None:
     raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
   return user
 
+class UserStats(BaseModel):
+  follower_count: int
+  following_count: int
+  tweet_count: int
+
+@router.get("/{user_id}/stats", response_model=UserStats)
+async def get_user_stats(user_id: int, db: async_db_dependency):
+  """
+    Kullanıcının takipçi, takip edilen ve tweet sayılarını döndüren endpoint.
+
+    Sayılar listeler yüklenmeden, `users` tablosundaki sayaç sütunlarından okunur.
+
+    Parametreler:
+    - `user_id` (int): Kullanıcının benzersiz kimliği.
+    - `db` (AsyncSession): Veritabanı bağlantısı.
+
+    Dönüş:
+    - Kullanıcının sayaçları.
+    - Eğer kullanıcı bulunamazsa, 404 Not Found hatası döner.
+    """
+  result = await db.execute(
+    select(User.follower_count, User.following_count, User.tweet_count).where(User.id == user_id)
+  )
+  stats = result.first()
+  if stats is None:
+    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+  return UserStats.model_validate(stats._mapping)
+
 @router.get("/{user_id}/following", response_model=List[UserSchema])
-def get_following(user_id: int, db: db_dependency):
+async def get_following(user_id: int, db: async_db_dependency):
   """
     Belirtilen kullanıcının takip ettiği kullanıcıları döndüren endpoint.
 
     Parametreler:
     - `user_id` (int): Kullanıcının benzersiz kimliği.
-    - `db` (Session): Veritabanı bağlantısı.
+    - `db` (AsyncSession): Veritabanı bağlantısı.
 
     Dönüş:
     - Kullanıcının takip ettiği kullanıcıların bir listesi.
     - Eğer kullanıcı bulunamazsa, 404 Hata döndürülür.
     """
 
-  user = db.query(User).filter(User.id == user_id).first()
+  user = await db.get(User, user_id)
   if not user:
     raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-  return user.following
+  result = await db.execute(
+    select(User)
+    .join(follows, follows.c.following_id == User.id)
+    .where(follows.c.follower_id == user_id)
+  )
+  return result.scalars().all()
 
 @router.get("/{user_id}/followers", response_model=List[UserSchema])
-def get_followers(user_id: int, db: db_dependency):
+async def get_followers(user_id: int, db: async_db_dependency):
   """
     Belirtilen kullanıcının takipçilerini döndüren endpoint.
 
     Parametreler:
     - `user_id` (int): Kullanıcının benzersiz kimliği.
-    - `db` (Session): Veritabanı bağlantısı.
+    - `db` (AsyncSession): Veritabanı bağlantısı.
 
     Dönüş:
     - Kullanıcının takipçilerinin bir listesi.
     - Eğer kullanıcı bulunamazsa, 404 Hata döndürülür.
     """
 
-  user = db.query(User).filter(User.id == user_id).first()
+  user = await db.get(User, user_id)
   if not user:
     raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-  return user.followers
+  result = await db.execute(
+    select(User)
+    .join(follows, follows.c.follower_id == User.id)
+    .where(follows.c.following_id == user_id)
+  )
+  return result.scalars().all()
 
 class FollowRequest(BaseModel):
    current_user_id: int
    user_id: int
 
 @router.post("/{user_id}/follow", status_code=status.HTTP_200_OK)
-def follow_user(user_id: int, follow_request: FollowRequest, db: db_dependency):
+async def follow_user(user_id: int, follow_request: FollowRequest, db: async_db_dependency):
     """
     Belirtilen kullanıcıyı takip etme işlemini gerçekleştiren endpoint.
 
     Parametreler:
     - `user_id` (int): Takip edilecek kullanıcının benzersiz kimliği.
     - `current_user_id` (int): Oturum açmış olan kullanıcının benzersiz kimliği.
-    - `db` (Session): Veritabanı bağlantısı.
+    - `db` (AsyncSession): Veritabanı bağlantısı.
 
     İşleyiş:
     - Verilen `user_id` ile takip edilecek kullanıcı veritabanında aranır.
     - Verilen `current_user_id` ile oturum açmış kullanıcı veritabanında aranır.
-    - Eğer `user_id`'ye sahip kullanıcı bulunamazsa, 404 Hata döndürülür.
+    - Eğer `user_id`'ye sahip kullanıcı veya oturum açmış kullanıcı bulunamazsa, 404 Hata döndürülür.
     - Eğer oturum açmış kullanıcı (`current_user`) daha önce belirtilen kullanıcıyı takip ediyorsa, 400 Hata döndürülür.
     - Kullanıcı kendisini takip etmeye çalışırsa, 400 Hata döndürülür.
-    - Belirtilen kullanıcı takip edilmek üzere `current_user.following` listesine eklenir ve veritabanı değişiklikleri kaydedilir.
+    - Takip ilişkisi `follows` tablosuna eklenir, iki kullanıcının takip sayaçları artırılır,
+      takip edilen kullanıcının son tweet'leri takipçinin ana sayfa akışına eklenir ve
+      veritabanı değişiklikleri tek transaction'da kaydedilir.
 
     Dönüş:
     - Takip başarılı olduğunda 200 OK ve bilgilendirici bir mesaj döndürülür.
     - Hatalı durumlarda uygun HTTP hatası ve açıklama döndürülür.
     """
-    user_to_follow = db.query(User).filter(User.id == follow_request.user_id).first()
-    current_user = db.query(User).filter(User.id == follow_request.current_user_id).first()
+    user_to_follow = await db.get(User, follow_request.user_id)
+    current_user = await db.get(User, follow_request.current_user_id)
 
-    if not user_to_follow:
+    if not user_to_follow or not current_user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
     
-    if user_to_follow in current_user.following:
+    if await is_following(db, current_user.id, user_to_follow.id):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="User is already following")
     
     if user_to_follow.id == current_user.id:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="You cannot follow yourself")
     
-    current_user.following.append(user_to_follow)
-    db.commit()
+    await db.execute(insert(follows).values(follower_id=current_user.id, following_id=user_to_follow.id))
+    await adjust_follow_counts(db, current_user.id, user_to_follow.id, 1)
+    await backfill_feed(db, current_user.id, user_to_follow.id)
+    await update_fanout_mode(db, user_to_follow.id)
+    await db.commit()
+    follow_cache.set((current_user.id, user_to_follow.id), True)
     return { "message": f"You are now following {user_to_follow}" }
 
 @router.delete("/{user_id}/unfollow", status_code=status.HTTP_200_OK)
-def unfollow_user(user_id: int, current_user_id: int, db: db_dependency):
+async def unfollow_user(user_id: int, current_user_id: int, db: async_db_dependency):
    """
    Belirtilen kullanıcıyı takipten çıkaran endpoint.
 
     Parametreler:
     - `user_id` (int): Takipten çıkarılacak kullanıcının benzersiz kimliği.
     - `current_user` (UserSchema): Oturum açmış olan kullanıcı.
-    - `db` (Session): Veritabanı bağlantısı.
+    - `db` (AsyncSession): Veritabanı bağlantısı.
+
+    Takip sayaçları azaltılır ve takipten çıkılan kullanıcının tweet'leri ana sayfa akışından da silinir.
 
     Dönüş:
     - Takipten çıkarma başarılıysa 200 OK.
@@ -189,44 +406,48 @@ def unfollow_user(user_id: int, current_user_id: int, db: db_dependency):
     - Eğer kullanıcı takip edilmiyorsa, 400 Hata döndürülür.
    """
 
-   current_user = db.query(User).filter(User.id == current_user_id).first()
-   user_to_unfollow = db.query(User).filter(User.id == user_id).first()
+   current_user = await db.get(User, current_user_id)
+   user_to_unfollow = await db.get(User, user_id)
 
    if not user_to_unfollow or not current_user:
       raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
    
-   if user_to_unfollow not in current_user.following:
+   if not await is_following(db, current_user.id, user_to_unfollow.id):
       raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="User is not following")
    
-   current_user.following.remove(user_to_unfollow)
-   db.commit()
+   await db.execute(
+      delete(follows)
+      .where(follows.c.follower_id == current_user.id, follows.c.following_id == user_to_unfollow.id)
+   )
+   await adjust_follow_counts(db, current_user.id, user_to_unfollow.id, -1)
+   await remove_author_from_feed(db, current_user.id, user_to_unfollow.id)
+   await db.commit()
+   follow_cache.set((current_user.id, user_to_unfollow.id), False)
    return {"message": f"You are no longer following {user_to_unfollow}"}
 
 class FollowerCheckResponse(BaseModel):
    is_following: bool
 
 @router.get("/{user_id}/is-following", response_model=FollowerCheckResponse)
-def check_if_user_is_following(user_id: int, current_user_id: int, db: db_dependency):
+async def check_if_user_is_following(user_id: int, current_user_id: int, db: async_db_dependency):
    """
    Belirtilen kullanıcının takipçi listesinde olup olmadığını kontrol eder.
     
     Parametreler:
     - `user_id` (int): Takip edilmek istenen kullanıcının benzersiz kimliği.
     - `current_user_id` (int): Oturum açmış olan kullanıcının benzersiz kimliği.
-    - `db` (Session): Veritabanı bağlantısı.
+    - `db` (AsyncSession): Veritabanı bağlantısı.
     
     Dönüş:
     - Kullanıcının takip edip etmediğine dair bir boolean değer döndürülür.
    """
-   user = db.query(User).filter(User.id == user_id).first()
-   current_user = db.query(User).filter(User.id == current_user_id).first()
+   user = await db.get(User, user_id)
+   current_user = await db.get(User, current_user_id)
 
    if not user or not current_user:
        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-   
-   is_following = any(follower.id == user_id for follower in current_user.following)
 
-   return FollowerCheckResponse(is_following=is_following)
+   return FollowerCheckResponse(is_following=await is_following(db, current_user.id, user.id, cache=follow_cache))
 
 class UpdateUserRequest(BaseModel):
     username: Optional[str] = None
@@ -240,10 +461,10 @@ class UpdateUserRequest(BaseModel):
         from_attributes = True
 
 @router.patch("/{user_id}", status_code=status.HTTP_200_OK)
-def update_user(
+async def update_user(
    user_id: int,
    user_update: UpdateUserRequest,
-   db: db_dependency,
+   db: async_db_dependency,
 ):
     """
     Kullanıcı bilgilerini güncellemek için bir endpoint.
@@ -251,7 +472,7 @@ def update_user(
     Parametreler:
     - `user_id` (int): Güncellenmesi istenen kullanıcının kimliği.
     - `user_update` (UpdateUserRequest): Güncelleme yapılacak alanlar.
-    - `db` (Session): Veritabanı bağlantısı.
+    - `db` (AsyncSession): Veritabanı bağlantısı.
     - `current_user` (UserSchema): Şu anda oturum açmış kullanıcı.
 
     Dönüş:
@@ -259,7 +480,7 @@ def update_user(
     - Eğer kullanıcı bulunamazsa, 404 Hata döndürülür.
     - Eğer kullanıcı güncelleme yetkisine sahip değilse, 403 Hata döndürülür.
     """
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
 
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
@@ -268,44 +489,65 @@ def update_user(
     updated_data = user_update.model_dump(exclude_unset=True)
     for key, value in updated_data.items():
        setattr(user, key, value)
+    if "profile" in updated_data:
+       # Elle verilen profil resminin küçük resmi yoktur
+       user.profile_thumbnail = None
 
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    profile_cache.invalidate(user.id)
     return user
 
-# İzin verilen MIME türleri ve maksimum dosya boyutu (örnek: 5 MB)
-ALLOWED_CONTENT_TYPES = ["image/jpeg", "image/png", "image/gif"]
-MAX_FILE_SIZE = 5 * 1024 * 1024  # 5 MB
-
-
 @router.patch("/{user_id}/profile-image", status_code=status.HTTP_200_OK)
-async def upload_profile_image(user_id: int, file: UploadFile, db: db_dependency):
+async def upload_profile_image(user_id: int, request: Request, db: async_db_dependency, background_tasks: BackgroundTasks):
    """
     Kullanıcının profil resmini güncelleyen endpoint.
 
+    İstek `file` alanında bir görsel içeren `multipart/form-data` olmalıdır. Gövde parça parça
+    okunur ve `MEDIA_IMAGE_MAX_BYTES` aşıldığı anda reddedilir. Görsel `media_pipeline` worker
+    havuzunda doğrulanır, küçültülür, küçük resmi üretilir ve saklanır; profil ancak işlem
+    tamamlandıktan sonra güncellenir. Önceki profil resmi ve küçük resmi yanıt gönderildikten
+    sonra saklama alanından silinir.
+
     Parametreler:
     - `user_id` (int): Kullanıcının benzersiz kimliği.
-    - `file` (UploadFile): Yüklenen profil resmi dosyası.
-    - `db` (Session): Veritabanı bağlantısı.
+    - `request` (Request): Yüklenen profil resmini içeren istek.
+    - `db` (AsyncSession): Veritabanı bağlantısı.
+    - `background_tasks` (BackgroundTasks): Önceki dosyaların silinmesi için.
 
     Dönüş:
-    - Profil resmi başarıyla yüklendiğinde 200 OK ve yeni profil resmi URL'si döner.
+    - Profil resmi başarıyla yüklendiğinde 200 OK, yeni profil resmi ve küçük resim URL'leri döner.
     - Kullanıcı bulunamazsa 404 Hata döner.
+    - Dosya çok büyükse 413, görsel değilse 415, `file` alanı yoksa 400 Hata döner.
     """
-   print("File:", file.filename)
-   user = db.query(User).filter(User.id == user_id).first()
-   if not user:
+   if await db.scalar(select(User.id).where(User.id == user_id)) is None:
       raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-   
+   # Okuma transaction'ı kapatılır; bağlantı yükleme ve işleme süresince tutulmaz
+   await db.commit()
+
+   uploaded = None
    try:
-      upload_result = cloudinary.uploader.upload(file.file)
-      profile_image_url = upload_result["secure_url"]
+      uploaded = await media_pipeline.receive(request.headers, request.stream(), kinds=("image",))
+      media = await media_pipeline.process(uploaded, f"profiles/{user_id}", kinds=("image",))
    except Exception as e:
-      raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
-   
-   user.profile = profile_image_url
-   db.commit()
-   db.refresh(user)
+      raise media_error(e)
+   finally:
+      if uploaded is not None:
+         await uploaded.close()
 
-   return { "message": "Profile image uploaded successfully", "profile": profile_image_url}
+   user = await db.get(User, user_id)
+   if not user:
+      await media_pipeline.discard(media)
+      raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+   previous = (user.profile, user.profile_thumbnail)
+   user.profile = media.url
+   user.profile_thumbnail = media.thumbnail_url
+   await db.commit()
+   profile_cache.invalidate(user.id)
+   background_tasks.add_task(media_pipeline.discard_urls, f"profiles/{user_id}", previous)
+
+   return {
+      "message": "Profile image uploaded successfully",
+      "profile": media.url,
+      "thumbnail": media.thumbnail_url,
+   }
   
\ No newline at end of file
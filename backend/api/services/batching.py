@@ -0,0 +1,167 @@
+import asyncio
+import time
+from concurrent.futures import Executor
+from typing import Any, Callable, List, Optional, Sequence
+
+
+class BatchQueueFullError(RuntimeError):
+    """Kuyruk `max_queue_size` sınırına ulaştığında yeni istekleri reddetmek için fırlatılır."""
+
+
+class MicroBatcher:
+    """
+    Eşzamanlı gelen çıkarım (inference) isteklerini tek bir batch'te toplayan asenkron kuyruk.
+
+    İşleyiş:
+    1. `submit` ile gelen her istek kuyruğa bir Future ile birlikte eklenir.
+    2. Arka plandaki döngü ilk isteği aldıktan sonra `max_wait_ms` süresi dolana veya
+       `max_batch_size` isteğe ulaşılana kadar yeni istekleri toplar.
+    3. Toplanan girdiler `predict_batch` fonksiyonuna tek seferde verilir (tek forward pass).
+    4. Her sonuç, isteği yapan çağırana kendi Future'ı üzerinden geri gönderilir.
+
+    Parametreler:
+    - predict_batch (Callable): Girdi listesini alıp aynı sırada çıktı listesi döndüren fonksiyon.
+    - max_batch_size (int): Bir batch'teki en fazla istek sayısı.
+    - max_wait_ms (float): İlk istekten sonra batch'in dolması için beklenecek en uzun süre (ms).
+    - executor (Executor, opsiyonel): `predict_batch`'in çalıştırılacağı executor.
+      Verilmezse event loop'un varsayılan thread havuzu kullanılır.
+    - max_concurrency (int): Aynı anda işlenebilecek batch sayısı. Çıkarım birden fazla
+      worker sürecine dağıtılıyorsa worker sayısına eşit olmalıdır.
+    - max_queue_size (int): Kuyrukta bekleyebilecek en fazla istek sayısı (0 = sınırsız).
+      Sınır aşıldığında istekler beklemek yerine hemen BatchQueueFullError ile reddedilir.
+    """
+
+    def __init__(
+        self,
+        predict_batch: Callable[[List[Any]], Sequence[Any]],
+        max_batch_size: int = 16,
+        max_wait_ms: float = 10.0,
+        executor: Optional[Executor] = None,
+        max_concurrency: int = 1,
+        max_queue_size: int = 0,
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.predict_batch = predict_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.executor = executor
+        self.max_concurrency = max_concurrency
+        self.max_queue_size = max_queue_size
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._tasks: set = set()
+        self._queue: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._worker is not None and not self._worker.done()
+
+    async def start(self):
+        """Batch döngüsünü mevcut event loop üzerinde başlatır."""
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Döngüyü durdurur; kuyrukta bekleyen istekler hata ile sonlandırılır."""
+        if not self.running:
+            return
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+        for task in list(self._tasks):
+            task.cancel()
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Batcher stopped"))
+
+    async def submit(self, item: Any) -> Any:
+        """
+        Bir girdiyi kuyruğa ekler ve ait olduğu batch işlendiğinde sonucunu döndürür.
+
+        Hata Durumları:
+        - Batcher başlatılmamışsa RuntimeError fırlatır.
+        - Kuyruk doluysa BatchQueueFullError fırlatır.
+        - `predict_batch` hata verirse, aynı hata batch'teki tüm çağıranlara iletilir.
+        """
+        if not self.running:
+            raise RuntimeError("Batcher is not running")
+        future = self._loop.create_future()
+        try:
+            self._queue.put_nowait((item, future))
+        except asyncio.QueueFull:
+            raise BatchQueueFullError("Inference queue is full")
+        return await future
+
+    def submit_threadsafe(self, item: Any, timeout: Optional[float] = None) -> Any:
+        """
+        Senkron (threadpool'da çalışan) route'lar için `submit` karşılığı.
+
+        İsteği batcher'ın event loop'una iletir ve sonuç gelene kadar çağıran thread'i bekletir.
+        """
+        if not self.running:
+            raise RuntimeError("Batcher is not running")
+        return asyncio.run_coroutine_threadsafe(self.submit(item), self._loop).result(timeout)
+
+    async def _collect(self) -> list:
+        first = await self._queue.get()
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait_ms / 1000
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        while True:
+            # Boş bir işleme yuvası olmadan yeni batch toplanmaz; bu sırada gelen istekler
+            # kuyrukta birikir ve bir sonraki batch'e daha çok istek sığar
+            await self._slots.acquire()
+            try:
+                batch = await self._collect()
+            except BaseException:
+                self._slots.release()
+                raise
+            task = asyncio.create_task(self._process(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _process(self, batch: list):
+        try:
+            # İstemcisi vazgeçmiş (iptal edilmiş) istekler modele gönderilmez
+            batch = [(item, future) for item, future in batch if not future.done()]
+            if not batch:
+                return
+            items = [item for item, _ in batch]
+            try:
+                results = await self._loop.run_in_executor(self.executor, self.predict_batch, items)
+                if len(results) != len(items):
+                    raise RuntimeError(f"predict_batch returned {len(results)} results for {len(items)} inputs")
+            except BaseException as e:
+                # stop() sırasında iptal edilen batch'lerin çağıranları da bekletilmez
+                error = e if isinstance(e, Exception) else RuntimeError("Batcher stopped")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(error)
+                if not isinstance(e, Exception):
+                    raise
+                return
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+        finally:
+            self._slots.release()
@@ -0,0 +1,229 @@
+import os
+import re
+import zlib
+from functools import lru_cache
+from typing import List, Mapping, Sequence, Tuple, Union
+
+# Chat modelinin yüklenmesi ve çıkarımı. Bu modül hem API sürecinde hem de inference
+# worker süreçlerinde import edildiğinden FastAPI/veritabanı bağımlılığı içermez.
+
+# Boş bırakılırsa yerleşik kelime tokenizer'ı, doluysa bu isimdeki HuggingFace tokenizer'ı kullanılır
+CHAT_TOKENIZER = os.getenv("CHAT_TOKENIZER", "")
+CHAT_MAX_INPUT_TOKENS = int(os.getenv("CHAT_MAX_INPUT_TOKENS", "128"))
+CHAT_VOCAB_SIZE = int(os.getenv("CHAT_VOCAB_SIZE", "30000"))
+
+# eager: düz PyTorch, quantized: dinamik int8 nicemleme, torchscript: trace edilmiş ve dondurulmuş graf
+INFERENCE_BACKENDS = ("eager", "quantized", "torchscript")
+CHAT_INFERENCE_BACKEND = os.getenv("CHAT_INFERENCE_BACKEND", "eager")
+
+PAD_TOKEN_ID = 0
+
+def load_model(path: str, mmap: bool = False, backend: str = CHAT_INFERENCE_BACKEND):
+    """
+    Model dosyasını diskten yükler, çıkarım moduna alır ve seçilen backend'e hazırlar.
+
+    `torch` burada import edilir; böylece modül importu (ve model gerektirmeyen route'lar)
+    torch'un yüklenmesini beklemez.
+
+    Parametreler:
+    - path (str): Model dosyasının yolu.
+    - mmap (bool): True ise ağırlıklar belleğe kopyalanmak yerine dosyadan eşlenir (memory map).
+      Aynı dosyayı yükleyen worker süreçleri böylece ağırlık sayfalarını işletim sistemi
+      önbelleği üzerinden paylaşır. `quantized` backend yeni ağırlıklar ürettiğinden bu
+      paylaşım yalnızca `eager` ve `torchscript` için geçerlidir.
+    - backend (str): `INFERENCE_BACKENDS` içinden biri.
+    """
+    import torch
+
+    if backend not in INFERENCE_BACKENDS:
+        raise ValueError(f"Unknown inference backend '{backend}', expected one of {INFERENCE_BACKENDS}")
+
+    model = torch.load(path, weights_only=False, mmap=mmap)
+    model.eval()
+    if backend == "quantized":
+        # Linear katmanların ağırlıkları int8'e çevrilir; aktivasyonlar çalışma anında nicelenir
+        model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    elif backend == "torchscript":
+        example = preprocess_batch(["bugün koç burcu için neler var", "leo"])
+        with torch.no_grad():
+            traced = torch.jit.trace(model, example, strict=False, check_trace=False)
+        model = torch.jit.freeze(traced)
+    return model
+
+
+def pad_batch(encoded: Sequence[Sequence[int]], pad_token_id: int = PAD_TOKEN_ID):
+    """
+    Token kimliği listelerini tek bir dolgulu (padded) tensöre ve dikkat maskesine dönüştürür.
+
+    Tüm kimlikler önce tek bir düz tensöre yazılır, ardından maske üzerinden tek
+    seferde yerleştirilir; böylece metin başına tensör oluşturulmaz.
+    """
+    import torch
+
+    lengths = torch.tensor([len(ids) for ids in encoded])
+    # Boş metinler için de en az bir sütun bulunur
+    max_length = max(int(lengths.max()), 1) if len(encoded) else 1
+    attention_mask = torch.arange(max_length).unsqueeze(0) < lengths.unsqueeze(1)
+    input_ids = torch.full((len(encoded), max_length), pad_token_id, dtype=torch.long)
+    input_ids[attention_mask] = torch.tensor([i for ids in encoded for i in ids], dtype=torch.long)
+    return input_ids, attention_mask.long()
+
+
+class WordTokenizer:
+    """
+    Metni küçük harfe çevirip kelimelere ayıran ve her kelimeyi sabit boyutlu bir sözlüğe
+    hash'leyen basit tokenizer. `crc32` kullanıldığından kimlikler süreçler arasında aynıdır.
+    0 numaralı kimlik padding için ayrılmıştır.
+    """
+
+    _WORD = re.compile(r"\w+")
+    pad_token_id = PAD_TOKEN_ID
+
+    def __init__(self, vocab_size: int = CHAT_VOCAB_SIZE, max_length: int = CHAT_MAX_INPUT_TOKENS):
+        self.vocab_size = vocab_size
+        self.max_length = max_length
+
+    def encode(self, text: str) -> List[int]:
+        words = self._WORD.findall(text.lower())[:self.max_length]
+        return [zlib.crc32(word.encode()) % (self.vocab_size - 1) + 1 for word in words]
+
+    def encode_batch(self, texts: List[str]):
+        """Metinleri tek bir dolgulu tensöre ve dikkat maskesine dönüştürür."""
+        return pad_batch([self.encode(text) for text in texts], self.pad_token_id)
+
+
+class PretrainedTokenizer:
+    """HuggingFace tokenizer'ı için `WordTokenizer` ile aynı arayüzü sağlayan sarmalayıcı."""
+
+    def __init__(self, name: str, max_length: int = CHAT_MAX_INPUT_TOKENS):
+        from transformers import AutoTokenizer
+
+        self.tokenizer = AutoTokenizer.from_pretrained(name)
+        self.max_length = max_length
+        self.pad_token_id = self.tokenizer.pad_token_id or 0
+
+    def encode(self, text: str) -> List[int]:
+        return self.tokenizer.encode(text, truncation=True, max_length=self.max_length)
+
+    def encode_batch(self, texts: List[str]):
+        encoded = self.tokenizer(
+            texts,
+            padding=True,
+            truncation=True,
+            max_length=self.max_length,
+            return_tensors="pt",
+        )
+        return encoded["input_ids"], encoded["attention_mask"]
+
+
+@lru_cache(maxsize=1)
+def get_tokenizer():
+    """Süreç başına bir kez oluşturulan tokenizer örneğini döndürür."""
+    if CHAT_TOKENIZER:
+        return PretrainedTokenizer(CHAT_TOKENIZER)
+    return WordTokenizer()
+
+def preprocess_input(text: str):
+    """
+    Kullanıcıdan gelen metni modelin kabul edebileceği bir formata dönüştürür.
+    
+    İşlem Adımları:
+    1. Metni önbellekteki tokenizer ile token kimliklerine ayırır.
+    2. Kimlikleri bir tensör olarak döndürür.
+
+    Tek metinlik yol; birden fazla metin için `preprocess_batch` kullanılmalıdır.
+
+    Parametreler:
+    - text (str): Kullanıcıdan gelen metin.
+
+    Dönen Değer:
+    - torch.Tensor: Token kimliklerini içeren tek boyutlu bir PyTorch tensörü.
+    """
+    import torch
+
+    return torch.tensor(get_tokenizer().encode(text), dtype=torch.long)
+
+def preprocess_batch(inputs: Sequence[Union[str, Sequence[int]]]) -> Tuple["torch.Tensor", "torch.Tensor"]:
+    """
+    Girdi listesini modele tek seferde verilebilecek bir batch'e dönüştürür.
+
+    Girdiler ham metin veya önceden tokenize edilmiş kimlik listeleri (ör. sohbet bağlamı)
+    olabilir; kimlik listeleri yeniden tokenize edilmez.
+
+    Parametreler:
+    - inputs (List[str | List[int]]): Kullanıcılardan gelen metinler veya token kimlikleri.
+
+    Dönen Değer:
+    - Tuple[torch.Tensor, torch.Tensor]: `(input_ids, attention_mask)`; ikisi de
+      `[len(inputs), en uzun girdinin token sayısı]` boyutundadır.
+    """
+    tokenizer = get_tokenizer()
+    if all(isinstance(item, str) for item in inputs):
+        return tokenizer.encode_batch(list(inputs))
+    encoded = [tokenizer.encode(item) if isinstance(item, str) else item for item in inputs]
+    return pad_batch(encoded, tokenizer.pad_token_id)
+
+def postprocess_output(output):
+    """
+    Modelden dönen çıktıyı anlamlı bir metne dönüştürür.
+    
+    İşlem Adımları:
+    1. Model çıktısındaki en yüksek olasılığa sahip sınıfı seçer.
+    2. Sınıfa göre 'Positive' (Olumlu) veya 'Negative' (Olumsuz) döner.
+
+    Parametreler:
+    - output: Modelden dönen PyTorch tensörü.
+
+    Dönen Değer:
+    - str: Tahmin edilen sınıf etiketi ('Positive' veya 'Negative').
+    """
+    return "Positive" if output.argmax().item() == 1 else "Negative"
+
+def postprocess_batch(outputs) -> List[str]:
+    """
+    Bir batch'in model çıktısını tek bir vektörel argmax ile etiketlere dönüştürür.
+
+    Parametreler:
+    - outputs: `[batch, sınıf sayısı]` boyutunda model çıktısı (logits).
+
+    Dönen Değer:
+    - List[str]: Her satır için 'Positive' veya 'Negative'.
+    """
+    return ["Positive" if label == 1 else "Negative" for label in outputs.argmax(dim=-1).tolist()]
+
+def model_logits(outputs):
+    """
+    Model çıktısından logits tensörünü alır.
+
+    HuggingFace modelleri çıktıyı `.logits` alanında döndürür; `strict=False` ile trace edilmiş
+    (torchscript) bir HuggingFace modeli ise aynı çıktıyı sözlük olarak, `return_dict=False`
+    ile çalışanlar demet (tuple) olarak döndürür. Düz modeller tensörün kendisini döndürür.
+    """
+    if isinstance(outputs, Mapping):
+        return outputs["logits"]
+    if isinstance(outputs, (tuple, list)):
+        return outputs[0]
+    return getattr(outputs, "logits", outputs)
+
+def run_model(model, texts: Sequence[Union[str, Sequence[int]]]) -> List[str]:
+    """
+    Birden fazla metni tek bir forward pass ile verilen modele verir.
+
+    İşlem Adımları:
+    1. Metinleri `preprocess_batch` ile tek bir dolgulu tensöre ve maskeye dönüştürür.
+    2. Modeli `(input_ids, attention_mask)` ile batch üzerinde bir kez çalıştırır.
+    3. Çıktıyı `postprocess_batch` ile etiketlere dönüştürür.
+
+    Parametreler:
+    - model: Çıkarım modundaki PyTorch modeli.
+    - texts (List[str | List[int]]): Kullanıcılardan gelen metinler veya sohbet bağlamının token kimlikleri.
+
+    Dönen Değer:
+    - List[str]: Girdi sırasıyla tahmin edilen etiketler.
+    """
+    import torch
+
+    input_ids, attention_mask = preprocess_batch(texts)
+    with torch.inference_mode():
+        outputs = model(input_ids, attention_mask)
+    return postprocess_batch(model_logits(outputs))
@@ -0,0 +1,167 @@
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Iterable, List, Optional, Tuple
+
+# Turun kimden geldiği ve token kimlikleri
+Turn = Tuple[str, List[int]]
+
+
+class ConversationContext:
+    """Bir kullanıcının son turlarını tokenize edilmiş halde tutar."""
+
+    __slots__ = ("turns", "token_count", "last_access")
+
+    def __init__(self):
+        self.turns: "deque[Turn]" = deque()
+        self.token_count = 0
+        self.last_access = time.monotonic()
+
+    def token_ids(self) -> List[int]:
+        return [token for _, ids in self.turns for token in ids]
+
+
+class ConversationContextStore:
+    """
+    Çok turlu yanıtlar için kullanıcı başına kayan (rolling) sohbet bağlamı deposu.
+
+    Her yeni mesaj yalnızca bir kez tokenize edilip bağlamın sonuna eklenir; bağlamı
+    kurmanın maliyeti sohbet geçmişinin uzunluğuna değil yeni mesajın uzunluğuna bağlıdır.
+    Bellekte bağlamı olmayan kullanıcılar için `loader` ile veritabanından yalnızca son
+    `max_turns` mesaj bir kez okunur.
+
+    Kırpma politikaları (`truncation`):
+    - "turns": Bütçe aşılınca en eski turlar bütün olarak atılır.
+    - "tokens": Bütçe aşılınca en eski token'lar atılır; en eski tur kısmen kalabilir.
+
+    Parametreler:
+    - tokenize (Callable): Metni token kimliklerine çeviren fonksiyon.
+    - max_turns (int): Kullanıcı başına tutulacak en fazla tur sayısı.
+    - max_tokens (int): Kullanıcı başına token bütçesi.
+    - truncation (str): "turns" veya "tokens".
+    - max_total_tokens (int): Tüm kullanıcılar için toplam token sınırı (bellek üst sınırı).
+    - idle_seconds (float): Bu süre boyunca kullanılmayan bağlamlar atılır.
+    """
+
+    TRUNCATION_POLICIES = ("turns", "tokens")
+
+    def __init__(
+        self,
+        tokenize: Callable[[str], List[int]],
+        max_turns: int = 10,
+        max_tokens: int = 512,
+        truncation: str = "turns",
+        max_total_tokens: int = 5_000_000,
+        idle_seconds: float = 30 * 60,
+    ):
+        if truncation not in self.TRUNCATION_POLICIES:
+            raise ValueError(f"Unknown truncation policy '{truncation}'")
+        self.tokenize = tokenize
+        self.max_turns = max_turns
+        self.max_tokens = max_tokens
+        self.truncation = truncation
+        self.max_total_tokens = max_total_tokens
+        self.idle_seconds = idle_seconds
+        self.total_tokens = 0
+        self._contexts: "OrderedDict[int, ConversationContext]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def ensure(self, user_id: int, loader: Callable[[], Iterable[Tuple[str, str]]]):
+        """
+        Kullanıcının bağlamı bellekte yoksa `loader`'ın döndürdüğü `(sender, text)` turlarıyla
+        (eskiden yeniye) oluşturur. Bağlam zaten varsa `loader` çağrılmaz.
+        """
+        with self._lock:
+            if user_id in self._contexts:
+                return
+        turns = list(loader())
+        with self._lock:
+            if user_id in self._contexts:
+                return
+            context = ConversationContext()
+            self._contexts[user_id] = context
+            for sender, text in turns[-self.max_turns:]:
+                self._append(context, sender, self.tokenize(text))
+            self._evict()
+
+    def append(self, user_id: int, sender: str, text: str, create: bool = True) -> Optional[List[int]]:
+        """
+        Yeni bir turu bağlama ekler, bütçeye göre kırpar ve bağlamın token kimliklerini döndürür.
+
+        `create=False` iken bağlamı bellekte olmayan kullanıcılar için hiçbir şey yapmaz ve
+        None döndürür; bu kullanıcıların bağlamı gerektiğinde veritabanından yüklenir.
+        """
+        with self._lock:
+            if not create and user_id not in self._contexts:
+                return None
+        ids = self.tokenize(text)
+        with self._lock:
+            context = self._contexts.get(user_id)
+            if context is None:
+                if not create:
+                    return None
+                context = self._contexts[user_id] = ConversationContext()
+            self._append(context, sender, ids)
+            self._contexts.move_to_end(user_id)
+            token_ids = context.token_ids()
+            self._evict()
+            return token_ids
+
+    def get(self, user_id: int) -> Optional[List[int]]:
+        with self._lock:
+            context = self._contexts.get(user_id)
+            if context is None:
+                return None
+            context.last_access = time.monotonic()
+            self._contexts.move_to_end(user_id)
+            return context.token_ids()
+
+    def discard(self, user_id: int):
+        with self._lock:
+            context = self._contexts.pop(user_id, None)
+            if context is not None:
+                self.total_tokens -= context.token_count
+
+    def _append(self, context: ConversationContext, sender: str, ids: List[int]):
+        # Tek başına bütçeyi aşan bir tur, en yeni token'ları korunarak kısaltılır
+        ids = ids[-self.max_tokens:]
+        context.turns.append((sender, ids))
+        context.token_count += len(ids)
+        self.total_tokens += len(ids)
+        context.last_access = time.monotonic()
+
+        while len(context.turns) > self.max_turns:
+            self._drop_oldest_turn(context)
+        while context.token_count > self.max_tokens:
+            overflow = context.token_count - self.max_tokens
+            oldest_sender, oldest_ids = context.turns[0]
+            if self.truncation == "tokens" and overflow < len(oldest_ids):
+                context.turns[0] = (oldest_sender, oldest_ids[overflow:])
+                context.token_count -= overflow
+                self.total_tokens -= overflow
+            else:
+                self._drop_oldest_turn(context)
+
+    def _drop_oldest_turn(self, context: ConversationContext):
+        _, ids = context.turns.popleft()
+        context.token_count -= len(ids)
+        self.total_tokens -= len(ids)
+
+    def _evict(self):
+        # En uzun süredir kullanılmayan bağlamlar baştadır
+        now = time.monotonic()
+        while self._contexts:
+            user_id, context = next(iter(self._contexts.items()))
+            idle = now - context.last_access > self.idle_seconds
+            if not idle and self.total_tokens <= self.max_total_tokens:
+                break
+            del self._contexts[user_id]
+            self.total_tokens -= context.token_count
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "users": len(self._contexts),
+                "total_tokens": self.total_tokens,
+                "max_total_tokens": self.max_total_tokens,
+            }
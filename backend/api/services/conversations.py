@@ -0,0 +1,174 @@
+from typing import List, Optional, Tuple
+
+from sqlalchemy import and_, insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from models.conversation import Conversation
+from models.message import Message
+from services.pagination import cursor_for, encode_cursor, keyset_condition
+
+
+async def _touch(db: AsyncSession, user_id: int, partner_id: int, message: Message, unread_delta: int):
+    values = {"last_message_id": message.id, "last_message_at": message.created_at}
+    result = await db.execute(
+        update(Conversation)
+        .where(Conversation.user_id == user_id, Conversation.partner_id == partner_id)
+        .values(unread_count=Conversation.unread_count + unread_delta, **values)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        await db.execute(
+            insert(Conversation).values(user_id=user_id, partner_id=partner_id, unread_count=unread_delta, **values)
+        )
+
+
+async def record_message(db: AsyncSession, message: Message):
+    """
+    Yeni mesajı her iki tarafın mesajlaşma özetine son mesaj olarak yazar ve alıcının okunmamış
+    sayısını artırır. Mesajın kimliği atanmış olmalıdır (flush edilmiş). Commit edilmez.
+    """
+    await _touch(db, message.sender_id, message.receiver_id, message, 0)
+    if message.receiver_id != message.sender_id:
+        await _touch(db, message.receiver_id, message.sender_id, message, 1)
+
+
+def _history_query(sender_id: int, receiver_id: int, cursor: Optional[str], limit: int, exclude_id: Optional[int] = None):
+    query = select(Message).where(Message.sender_id == sender_id, Message.receiver_id == receiver_id)
+    if exclude_id is not None:
+        query = query.where(Message.id != exclude_id)
+    if cursor:
+        query = query.where(keyset_condition(Message.created_at, Message.id, cursor, before=True))
+    return query.order_by(Message.created_at.desc(), Message.id.desc()).limit(limit)
+
+
+async def read_history(
+    db: AsyncSession,
+    user_id: int,
+    partner_id: int,
+    cursor: Optional[str],
+    limit: int,
+    exclude_id: Optional[int] = None,
+) -> Tuple[List[Message], Optional[str]]:
+    """
+    İki kullanıcı arasındaki mesajlardan en yeniden eskiye bir sayfa okur.
+    `exclude_id` verilirse o mesaj sayfaya alınmaz (ör. silinmek üzere olan mesaj).
+
+    Her yön `(sender_id, receiver_id, created_at)` indeksiyle ayrı ayrı en fazla `limit + 1`
+    satır olarak okunup birleştirilir; maliyet mesajlaşmanın uzunluğuna değil sayfa boyutuna
+    bağlıdır.
+
+    Dönen Değer:
+    - Tuple[List[Message], Optional[str]]: Sayfadaki mesajlar ve devamı varsa sonraki imleç.
+
+    Hata Durumları:
+    - İmleç geçersizse InvalidCursorError fırlatır.
+    """
+    messages = list((await db.execute(_history_query(user_id, partner_id, cursor, limit + 1, exclude_id))).scalars())
+    if partner_id != user_id:
+        messages += (await db.execute(_history_query(partner_id, user_id, cursor, limit + 1, exclude_id))).scalars()
+    messages.sort(key=lambda message: (message.created_at, message.id), reverse=True)
+    page = messages[:limit]
+    return page, cursor_for(page[-1]) if len(messages) > limit else None
+
+
+async def remove_message(db: AsyncSession, message: Message):
+    """
+    Silinecek mesajı mesajlaşma özetlerinden çıkarır. Mesaj silinmeden önce çağrılır; özetlerin
+    `last_message_id` yabancı anahtarı mesajı gösterirken mesaj silinemez. Özet değişiklikleri
+    flush edilir; mesaj çağıran tarafından silinir. Commit edilmez.
+
+    - Alıcı mesajı henüz okumadıysa (mesaj okunan son mesajdan sonra geldiyse) okunmamış sayısı
+      bir azaltılır.
+    - Mesaj son mesajsa, yerine kalan en yeni mesaj yazılır; hiç mesaj kalmadıysa özet silinir.
+    """
+    if message.receiver_id != message.sender_id:
+        await db.execute(
+            update(Conversation)
+            .where(
+                Conversation.user_id == message.receiver_id,
+                Conversation.partner_id == message.sender_id,
+                Conversation.unread_count > 0,
+                # Okunmamış: okunan son mesajdan `(created_at, id)` sırasında sonra gelen mesaj. Kimlik
+                # tek başına yetmez; SQLite silinen en büyük kimliği yeni mesaja yeniden verebilir.
+                or_(
+                    Conversation.last_read_at.is_(None),
+                    Conversation.last_read_at < message.created_at,
+                    and_(
+                        Conversation.last_read_at == message.created_at,
+                        Conversation.last_read_message_id < message.id,
+                    ),
+                ),
+            )
+            .values(unread_count=Conversation.unread_count - 1)
+            .execution_options(synchronize_session=False)
+        )
+
+    latest, _ = await read_history(db, message.sender_id, message.receiver_id, None, 1, exclude_id=message.id)
+    for user_id, partner_id in {(message.sender_id, message.receiver_id), (message.receiver_id, message.sender_id)}:
+        summary = await db.get(Conversation, (user_id, partner_id), populate_existing=True)
+        if summary is None or summary.last_message_id != message.id:
+            continue
+        if latest:
+            summary.last_message_id = latest[0].id
+            summary.last_message_at = latest[0].created_at
+        else:
+            await db.delete(summary)
+    await db.flush()
+
+
+async def mark_read(db: AsyncSession, user_id: int, partner_id: int) -> bool:
+    """
+    Kullanıcının bir kişiyle olan mesajlaşmasını son mesaja kadar okundu olarak işaretler.
+    Commit edilmez.
+
+    Dönen Değer:
+    - bool: Böyle bir mesajlaşma varsa True.
+    """
+    result = await db.execute(
+        update(Conversation)
+        .where(Conversation.user_id == user_id, Conversation.partner_id == partner_id)
+        .values(
+            unread_count=0,
+            last_read_message_id=Conversation.last_message_id,
+            last_read_at=Conversation.last_message_at,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount > 0
+
+
+async def read_inbox(
+    db: AsyncSession,
+    user_id: int,
+    cursor: Optional[str],
+    limit: int,
+) -> Tuple[List[Conversation], Optional[str]]:
+    """
+    Kullanıcının mesajlaşmalarını son mesaj zamanına göre en yeniden eskiye sayfalar halinde okur.
+
+    Özetler `(user_id, last_message_at, partner_id)` indeksiyle okunur; karşı taraf ve son mesaj
+    sayfadaki satırlar için birincil anahtarla yüklenir.
+
+    Dönen Değer:
+    - Tuple[List[Conversation], Optional[str]]: Sayfadaki mesajlaşmalar ve devamı varsa sonraki imleç.
+
+    Hata Durumları:
+    - İmleç geçersizse InvalidCursorError fırlatır.
+    """
+    query = (
+        select(Conversation)
+        .where(Conversation.user_id == user_id)
+        .options(selectinload(Conversation.partner), selectinload(Conversation.last_message))
+    )
+    if cursor:
+        query = query.where(
+            keyset_condition(Conversation.last_message_at, Conversation.partner_id, cursor, before=True)
+        )
+    query = query.order_by(Conversation.last_message_at.desc(), Conversation.partner_id.desc()).limit(limit + 1)
+    conversations = list((await db.execute(query)).scalars())
+    page = conversations[:limit]
+    next_cursor = None
+    if len(conversations) > limit:
+        next_cursor = encode_cursor(page[-1].last_message_at, page[-1].partner_id)
+    return page, next_cursor
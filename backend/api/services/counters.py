@@ -0,0 +1,93 @@
+from typing import Callable, Dict
+
+from sqlalchemy import func, select, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.bookmark import Bookmark
+from models.comment import Comment
+from models.like import Like
+from models.repost import Repost
+from models.tweet import Tweet
+from models.user import User, follows
+
+# Sayaç sütunu -> sayılan tablodaki, sayacın sahibini gösteren sütun
+USER_COUNTERS = {
+    "follower_count": follows.c.following_id,
+    "following_count": follows.c.follower_id,
+    "tweet_count": Tweet.__table__.c.user_id,
+}
+TWEET_COUNTERS = {
+    "like_count": Like.__table__.c.tweet_id,
+    "repost_count": Repost.__table__.c.tweet_id,
+    "comment_count": Comment.__table__.c.tweet_id,
+    "bookmark_count": Bookmark.__table__.c.tweet_id,
+}
+COUNTERS = ((User.__table__, USER_COUNTERS), (Tweet.__table__, TWEET_COUNTERS))
+
+RECONCILE_BATCH_SIZE = 1000
+
+
+async def _adjust(db: AsyncSession, model, row_id: int, column_name: str, delta: int):
+    # Sayaç okunmadan `sütun = sütun + delta` ile güncellenir; eşzamanlı yazmalar birbirini ezmez.
+    # Commit edilmez; sayaç, değişikliğin kendisiyle aynı transaction'da yazılır.
+    column = getattr(model, column_name)
+    await db.execute(
+        update(model)
+        .where(model.id == row_id)
+        .values({column: column + delta})
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def adjust_follow_counts(db: AsyncSession, follower_id: int, following_id: int, delta: int):
+    """Takip (`delta=1`) veya takipten çıkma (`delta=-1`) sonrası iki kullanıcının sayaçlarını günceller."""
+    await _adjust(db, User, follower_id, "following_count", delta)
+    await _adjust(db, User, following_id, "follower_count", delta)
+
+
+async def adjust_tweet_count(db: AsyncSession, user_id: int, delta: int):
+    await _adjust(db, User, user_id, "tweet_count", delta)
+
+
+async def adjust_engagement_count(db: AsyncSession, tweet_id: int, counter: str, delta: int):
+    """
+    Beğeni, repost, yorum veya kaydetme eklenip silindiğinde tweet'in ilgili sayacını günceller.
+
+    Hata Durumları:
+    - `counter` bir tweet sayacı değilse ValueError fırlatır.
+    """
+    if counter not in TWEET_COUNTERS:
+        raise ValueError(f"Unknown tweet counter: {counter}")
+    await _adjust(db, Tweet, tweet_id, counter, delta)
+
+
+def reconcile_counters(engine: Engine, batch_size: int = RECONCILE_BATCH_SIZE, log: Callable = print) -> Dict[str, int]:
+    """
+    Sayaç sütunlarını kaynak tablolardaki gerçek sayılarla karşılaştırır ve sapanları düzeltir.
+
+    Satırlar `batch_size` büyüklüğünde id aralıklarıyla, her aralık ayrı bir transaction'da
+    işlenir; böylece SQLite'ın tek yazma kilidi uzun süre tutulmaz. Her sayı, sayılan tablodaki
+    sahip sütununun indeksiyle hesaplanır.
+
+    Dönen Değer:
+    - Dict[str, int]: `tablo.sütun` başına düzeltilen satır sayısı.
+    """
+    fixed = {}
+    for table, counters in COUNTERS:
+        with engine.connect() as connection:
+            max_id = connection.execute(select(func.max(table.c.id))).scalar() or 0
+        for column_name, owner in counters.items():
+            actual = select(func.count()).where(owner == table.c.id).scalar_subquery()
+            column = table.c[column_name]
+            repaired = 0
+            for start in range(1, max_id + 1, batch_size):
+                with engine.begin() as connection:
+                    repaired += connection.execute(
+                        update(table)
+                        .where(table.c.id.between(start, start + batch_size - 1), column != actual)
+                        .values({column: actual})
+                    ).rowcount
+            fixed[f"{table.name}.{column_name}"] = repaired
+            log(f"{table.name}.{column_name}: {repaired} row(s) repaired")
+    return fixed
@@ -0,0 +1,197 @@
+import os
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, exists, insert, literal, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config.database import AsyncSessionLocal
+from models.feed import FeedEntry, FeedPullAuthor
+from models.tweet import Tweet
+from models.user import User, follows
+from services.pagination import cursor_for, keyset_condition
+
+# Kullanıcı başına akışta tutulacak en fazla tweet (daha eskileri silinir)
+FEED_MAX_ENTRIES = int(os.getenv("FEED_MAX_ENTRIES", "800"))
+# Takip edilince yazarın akışa eklenecek en yeni tweet sayısı
+FEED_BACKFILL_COUNT = int(os.getenv("FEED_BACKFILL_COUNT", "50"))
+# Bu sayıdan fazla takipçisi olan yazarların tweet'leri akışlara yazılmaz, okurken eklenir
+FEED_FANOUT_MAX_FOLLOWERS = int(os.getenv("FEED_FANOUT_MAX_FOLLOWERS", "1000"))
+
+
+async def is_pull_author(db: AsyncSession, author_id: int) -> bool:
+    return await db.get(FeedPullAuthor, author_id) is not None
+
+
+async def follower_count(db: AsyncSession, author_id: int) -> int:
+    # Sayaç, takip işleminin kendi transaction'ında güncellendiğinden yeni takipçiyi de içerir
+    result = await db.execute(select(User.follower_count).where(User.id == author_id))
+    return result.scalar_one()
+
+
+async def fan_out_tweet(db: AsyncSession, tweet: Tweet) -> Optional[List[int]]:
+    """
+    Yeni tweet'i yazarın tüm takipçilerinin akışına tek bir `INSERT … SELECT` ile ekler.
+
+    Commit edilmez; tweet'in kendisiyle aynı transaction'da yazılması için çağıran commit eder.
+    Yazar okuma sırasında birleştirilen (çok takipçili) bir yazarsa hiçbir şey yazılmaz.
+
+    Dönen Değer:
+    - Optional[List[int]]: Akışına yazılan takipçilerin kimlikleri (kırpma için); yazılmadıysa None.
+    """
+    if await is_pull_author(db, tweet.user_id):
+        return None
+    followers = select(follows.c.follower_id).where(follows.c.following_id == tweet.user_id)
+    follower_ids = list((await db.execute(followers)).scalars())
+    if not follower_ids:
+        return []
+    await db.execute(
+        insert(FeedEntry).from_select(
+            ["user_id", "tweet_id", "author_id", "created_at"],
+            select(
+                follows.c.follower_id,
+                literal(tweet.id),
+                literal(tweet.user_id),
+                literal(tweet.created_at, FeedEntry.created_at.type),
+            ).where(follows.c.following_id == tweet.user_id),
+        )
+    )
+    return follower_ids
+
+
+def feed_cutoff_query(user_id: int):
+    # Akışta tutulacak son tweet'ten sonraki ilk satır; `(user_id, created_at, tweet_id)` indeksinde
+    # en fazla `FEED_MAX_ENTRIES + 1` girdi okunur, sıralama veya tablo okuması yapılmaz
+    return (
+        select(FeedEntry.created_at, FeedEntry.tweet_id)
+        .where(FeedEntry.user_id == user_id)
+        .order_by(FeedEntry.created_at.desc(), FeedEntry.tweet_id.desc())
+        .offset(FEED_MAX_ENTRIES)
+        .limit(1)
+    )
+
+
+async def trim_feeds(db: AsyncSession, user_ids: Iterable[int]):
+    """
+    Verilen kullanıcıların akışlarında en yeni `FEED_MAX_ENTRIES` tweet dışındakileri siler.
+
+    Önce her kullanıcı için sınırın ötesindeki ilk girdi indeksten okunur; yalnızca sınırı aşan
+    akışlar için bu girdi ve daha eskileri indeks aralığıyla silinir. Okumalar silmelerden önce
+    yapıldığından SQLite'ın yazma kilidi yalnızca silmeler süresince tutulur. Commit edilmez.
+    """
+    cutoffs = []
+    for user_id in user_ids:
+        cutoff = (await db.execute(feed_cutoff_query(user_id))).first()
+        if cutoff is not None:
+            cutoffs.append((user_id, cutoff))
+    for user_id, (created_at, tweet_id) in cutoffs:
+        await db.execute(
+            delete(FeedEntry).where(
+                FeedEntry.user_id == user_id,
+                FeedEntry.created_at <= created_at,
+                or_(FeedEntry.created_at < created_at, FeedEntry.tweet_id <= tweet_id),
+            )
+        )
+
+
+async def trim_feeds_in_background(user_ids: List[int]):
+    """
+    Fan-out sonrası akışları istek yanıtlandıktan sonra kırpar.
+
+    Kırpma tweet oluşturma isteğinin yolunda yapılmaz; sınır bu nedenle kısa bir süre için
+    aşılabilir, okumalar zaten sayfa boyutuyla sınırlıdır.
+    """
+    async with AsyncSessionLocal() as db:
+        await trim_feeds(db, user_ids)
+        await db.commit()
+
+
+async def backfill_feed(db: AsyncSession, follower_id: int, author_id: int):
+    """
+    Yeni takip edilen yazarın son `FEED_BACKFILL_COUNT` tweet'ini takipçinin akışına ekler
+    ve akışı kırpar. Commit edilmez.
+    """
+    if await is_pull_author(db, author_id):
+        return
+    recent = (
+        select(literal(follower_id), Tweet.id, Tweet.user_id, Tweet.created_at)
+        .where(Tweet.user_id == author_id)
+        .order_by(Tweet.created_at.desc(), Tweet.id.desc())
+        .limit(FEED_BACKFILL_COUNT)
+    )
+    await db.execute(insert(FeedEntry).from_select(["user_id", "tweet_id", "author_id", "created_at"], recent))
+    await trim_feeds(db, [follower_id])
+
+
+async def remove_author_from_feed(db: AsyncSession, follower_id: int, author_id: int):
+    """Takipten çıkılan yazarın tweet'lerini takipçinin akışından siler. Commit edilmez."""
+    await db.execute(
+        delete(FeedEntry).where(FeedEntry.user_id == follower_id, FeedEntry.author_id == author_id)
+    )
+
+
+async def update_fanout_mode(db: AsyncSession, author_id: int):
+    """
+    Takipçi sayısı `FEED_FANOUT_MAX_FOLLOWERS` sınırını aşan yazarı okuma sırasında
+    birleştirilen yazarlara ekler. Commit edilmez.
+
+    Geçiş tek yönlüdür: takipçi sayısı sonradan düşse de yazar bu modda kalır; aksi halde
+    akışlara yazılmamış eski tweet'leri takipçilerin akışlarından kaybolurdu.
+    """
+    if await is_pull_author(db, author_id):
+        return
+    if await follower_count(db, author_id) > FEED_FANOUT_MAX_FOLLOWERS:
+        db.add(FeedPullAuthor(user_id=author_id))
+
+
+def followed_pull_authors_query(user_id: int):
+    # Çok takipçili yazarlar az sayıda olduğundan kullanıcının takip listesi taranmaz; her yazar
+    # için takip ilişkisi `follows` birincil anahtarıyla aranır
+    return select(FeedPullAuthor.user_id).where(
+        exists().where(follows.c.follower_id == user_id, follows.c.following_id == FeedPullAuthor.user_id)
+    )
+
+
+def _newest_first(tweet: Tweet) -> Tuple:
+    return (tweet.created_at, tweet.id)
+
+
+async def read_feed(db: AsyncSession, user_id: int, cursor: Optional[str], limit: int) -> Tuple[List[Tweet], Optional[str]]:
+    """
+    Kullanıcının ana sayfa akışından en yeniden eskiye bir sayfa okur.
+
+    İki kaynak birleştirilir:
+    1. Akış tablosundaki girdiler (`(user_id, created_at, tweet_id)` indeksiyle `limit + 1` satır).
+    2. Kullanıcının kendi tweet'leri ve takip ettiği çok takipçili yazarların tweet'leri
+       (`(user_id, created_at)` indeksiyle en fazla `limit + 1` satır).
+
+    Her iki kaynak da imleçten sonraki en yeni `limit + 1` satırı döndürdüğünden birleşimin
+    ilk `limit` satırı doğru sayfadır; maliyet takip edilen kişi veya tweet sayısına değil
+    sayfa boyutuna bağlıdır.
+
+    Dönen Değer:
+    - Tuple[List[Tweet], Optional[str]]: Sayfadaki tweet'ler ve devamı varsa sonraki imleç.
+
+    Hata Durumları:
+    - İmleç geçersizse InvalidCursorError fırlatır.
+    """
+    materialized = (
+        select(Tweet)
+        .join(FeedEntry, FeedEntry.tweet_id == Tweet.id)
+        .where(FeedEntry.user_id == user_id)
+    )
+    if cursor:
+        materialized = materialized.where(keyset_condition(FeedEntry.created_at, FeedEntry.tweet_id, cursor, before=True))
+    materialized = materialized.order_by(FeedEntry.created_at.desc(), FeedEntry.tweet_id.desc()).limit(limit + 1)
+
+    followed_pull_authors = followed_pull_authors_query(user_id)
+    pull_author_ids = [user_id, *(await db.execute(followed_pull_authors)).scalars()]
+    pulled = select(Tweet).where(Tweet.user_id.in_(pull_author_ids))
+    if cursor:
+        pulled = pulled.where(keyset_condition(Tweet.created_at, Tweet.id, cursor, before=True))
+    pulled = pulled.order_by(Tweet.created_at.desc(), Tweet.id.desc()).limit(limit + 1)
+
+    tweets = {tweet.id: tweet for tweet in (await db.execute(materialized)).scalars()}
+    tweets.update((tweet.id, tweet) for tweet in (await db.execute(pulled)).scalars())
+    merged = sorted(tweets.values(), key=_newest_first, reverse=True)
+    page = merged[:limit]
+    return page, cursor_for(page[-1]) if len(merged) > limit else None
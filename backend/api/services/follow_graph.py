@@ -0,0 +1,99 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, exists, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.user import follows
+from services.ttl_cache import TTLCache
+
+FollowKey = Tuple[int, int]
+
+
+class FollowCache(TTLCache):
+    """
+    `(takip eden, takip edilen)` çiftleri için LRU tahliyeli, süreç içi takip durumu önbelleği.
+
+    Okumalar yalnızca önbellekte olmayan çiftleri ekler (`fill`); takip ve takipten çıkma
+    commit edildikten sonra ise değer doğrudan yazılır (`set`, write-through). Böylece yazmadan
+    önce başlamış bir okuma, yazmanın değerini eski sonucuyla ezemez. Kayıtların süresi dolmaz.
+
+    Önbellek süreç içidir; birden fazla worker ile çalışırken bir worker'daki takip işlemi diğer
+    worker'ların önbelleğine yansımaz. Bu nedenle varsayılan olarak kapalıdır.
+
+    Parametreler:
+    - max_entries (int): Önbellekte tutulacak en fazla çift sayısı.
+    - enabled (bool): False ise önbellek tamamen devre dışıdır.
+    """
+
+    def __init__(self, max_entries: int = 100000, enabled: bool = True):
+        super().__init__(max_entries=max_entries, ttl_seconds=None, enabled=enabled)
+
+    def fill(self, values: Dict[FollowKey, bool]):
+        super().fill(values, replace=False)
+
+
+async def is_following(db: AsyncSession, follower_id: int, following_id: int, cache: Optional[FollowCache] = None) -> bool:
+    """
+    Takip ilişkisini `follows` birincil anahtarı üzerinde tek bir EXISTS sorgusuyla kontrol eder.
+
+    `cache` verilirse önce önbelleğe bakılır. Yazma kararları (takip/takipten çıkma) önbelleksiz
+    çağrılmalıdır.
+    """
+    key = (follower_id, following_id)
+    cached = cache.get(key) if cache is not None else None
+    if cached is not None:
+        return cached
+    result = await db.execute(
+        select(exists().where(follows.c.follower_id == follower_id, follows.c.following_id == following_id))
+    )
+    value = bool(result.scalar())
+    if cache is not None:
+        cache.fill({key: value})
+    return value
+
+
+def relationship_query(viewer_id: int, user_ids: Iterable[int]):
+    # İki yön de tek sorguda okunur: takip edilenler birincil anahtarla,
+    # takipçiler `(following_id, follower_id)` indeksiyle aranır
+    user_ids = list(user_ids)
+    return select(follows.c.follower_id, follows.c.following_id).where(
+        or_(
+            and_(follows.c.follower_id == viewer_id, follows.c.following_id.in_(user_ids)),
+            and_(follows.c.following_id == viewer_id, follows.c.follower_id.in_(user_ids)),
+        )
+    )
+
+
+async def relationship_states(
+    db: AsyncSession,
+    viewer_id: int,
+    user_ids: List[int],
+    cache: Optional[FollowCache] = None,
+) -> Dict[int, Tuple[bool, bool]]:
+    """
+    Bir kullanıcının verilen kullanıcılarla olan takip durumlarını tek sorguda döndürür.
+
+    Dönen Değer:
+    - Dict[int, Tuple[bool, bool]]: Kullanıcı kimliği -> (izleyen onu takip ediyor mu,
+      o izleyeni takip ediyor mu).
+    """
+    states = {}
+    missing = []
+    for user_id in user_ids:
+        following = cache.get((viewer_id, user_id)) if cache is not None else None
+        followed_by = cache.get((user_id, viewer_id)) if cache is not None else None
+        if following is None or followed_by is None:
+            missing.append(user_id)
+        else:
+            states[user_id] = (following, followed_by)
+
+    if missing:
+        rows = {tuple(row) for row in await db.execute(relationship_query(viewer_id, missing))}
+        found = {}
+        for user_id in missing:
+            found[(viewer_id, user_id)] = (viewer_id, user_id) in rows
+            found[(user_id, viewer_id)] = (user_id, viewer_id) in rows
+            states[user_id] = (found[(viewer_id, user_id)], found[(user_id, viewer_id)])
+        if cache is not None:
+            cache.fill(found)
+    return states
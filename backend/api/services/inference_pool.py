@@ -0,0 +1,178 @@
+import multiprocessing
+import os
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FuturesTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Set
+
+from services.chat_model import load_model, run_model
+
+
+class InferenceTimeoutError(TimeoutError):
+    """Bir batch, izin verilen sürede worker tarafından tamamlanmadığında fırlatılır."""
+
+
+class InferenceWorkerCrashedError(RuntimeError):
+    """Bir worker süreci çöktüğünde (ör. segfault, OOM) fırlatılır; havuz yeniden kurulur."""
+
+
+# Worker süreçlerindeki model örneği (her süreçte bir kez yüklenir)
+_worker_model = None
+
+def _init_worker(model_path: str, num_threads: int, pid_queue, generation: int):
+    global _worker_model
+    # Havuz, takılan worker'ları sonlandırabilmek için hangi süreçlerin hangi havuza ait olduğunu bilir
+    pid_queue.put((generation, os.getpid()))
+    import torch
+
+    # Süreç başına thread sayısı sınırlanmazsa worker'lar çekirdekleri paylaşmak için yarışır
+    torch.set_num_threads(num_threads)
+    _worker_model = load_model(model_path, mmap=True)
+
+def _worker_predict(texts: List[str]) -> List[str]:
+    return run_model(_worker_model, texts)
+
+
+class InferencePool:
+    """
+    Chat modelini ayrı worker süreçlerinde çalıştıran çıkarım havuzu.
+
+    CPU ağırlıklı PyTorch çıkarımı API sürecinin thread havuzunu ve GIL'i meşgul etmez;
+    tweet, kullanıcı ve mesaj route'ları chat yükünden etkilenmez. Her worker modeli
+    `mmap=True` ile yüklediğinden ağırlıklar süreçler arasında işletim sistemi sayfa
+    önbelleği üzerinden paylaşılır.
+
+    Parametreler:
+    - model_path (str): Worker'ların yükleyeceği model dosyası.
+    - workers (int): Worker süreç sayısı.
+    - timeout (float): Bir batch için beklenecek en uzun süre (saniye).
+    - threads_per_worker (int): Her worker'ın PyTorch thread sayısı.
+    """
+
+    def __init__(self, model_path: str, workers: int = 2, timeout: float = 30.0, threads_per_worker: int = 1):
+        self.model_path = model_path
+        self.workers = workers
+        self.timeout = timeout
+        self.threads_per_worker = threads_per_worker
+        self.restarts = 0
+        self.restart_error: Optional[str] = None
+        self._lock = threading.Lock()
+        # fork yerine spawn: torch thread havuzu ve uvicorn durumu fork edilmez
+        self._context = multiprocessing.get_context("spawn")
+        self._pid_queue = self._context.Queue()
+        self._worker_pids: Dict[int, Set[int]] = {}
+        self._warmup_batches: List[List[str]] = []
+        self._generation = 0
+        self._restarting = False
+        self._closed = False
+        self._executor = self._create_executor(self._generation)
+
+    def _create_executor(self, generation: int) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=self._context,
+            initializer=_init_worker,
+            initargs=(self.model_path, self.threads_per_worker, self._pid_queue, generation),
+        )
+
+    def _warm(self, executor: ProcessPoolExecutor):
+        futures = [executor.submit(_worker_predict, texts) for texts in self._warmup_batches]
+        for future in futures:
+            future.result()
+
+    def _restart(self, broken: ProcessPoolExecutor, terminate: bool = False):
+        with self._lock:
+            # Aynı hatayı gören diğer çağıranlar havuzu ikinci kez yeniden kurmasın
+            if self._executor is not broken or self._restarting:
+                return
+            self._restarting = True
+        # Yeni havuz arka planda ısındırılıp öyle devreye alınır; soğuk havuza gelen ilk batch'ler
+        # süreç başlatma ve model yükleme süresini beklemez (ve yeniden zaman aşımına düşmez)
+        threading.Thread(
+            target=self._replace,
+            args=(broken, self._generation, terminate),
+            name="inference-pool-restart",
+            daemon=True,
+        ).start()
+
+    def _replace(self, broken: ProcessPoolExecutor, broken_generation: int, terminate: bool):
+        generation = broken_generation + 1
+        executor = self._create_executor(generation)
+        try:
+            self._warm(executor)
+            self.restart_error = None
+        except Exception as e:
+            # Hata `restart_error` içinde saklanır; havuz yine de devreye alınır ve ilk batch'te
+            # yeniden denenir
+            self.restart_error = str(e)
+        with self._lock:
+            if self._closed:
+                executor.shutdown(wait=False, cancel_futures=True)
+                return
+            self._executor = executor
+            self._generation = generation
+            self._restarting = False
+            self.restarts += 1
+        # Eski havuzda çalışan batch'ler bitebilir; yalnızca kuyrukta bekleyenler iptal edilir
+        broken.shutdown(wait=False, cancel_futures=True)
+        if terminate:
+            # shutdown çalışan bir batch'i durdurmaz. `timeout` sonunda eski havuzu bekleyen hiçbir
+            # çağıran kalmaz; hâlâ çalışan (takılan) worker'lar o zaman sonlandırılır
+            timer = threading.Timer(self.timeout, self._terminate_workers, args=(broken_generation,))
+            timer.daemon = True
+            timer.start()
+
+    def _terminate_workers(self, generation: int):
+        with self._lock:
+            while True:
+                try:
+                    worker_generation, pid = self._pid_queue.get_nowait()
+                except queue.Empty:
+                    break
+                self._worker_pids.setdefault(worker_generation, set()).add(pid)
+            pids = self._worker_pids.pop(generation, set())
+            for old_generation in [g for g in self._worker_pids if g < generation]:
+                del self._worker_pids[old_generation]
+        # Yalnızca hâlâ çalışan alt süreçler sonlandırılır; çıkmış bir worker'ın PID'i başka bir
+        # sürece verilmiş olabilir
+        for process in multiprocessing.active_children():
+            if process.pid in pids:
+                process.terminate()
+
+    def run(self, texts: List[str]) -> List[str]:
+        """
+        Bir batch'i boştaki bir worker'da çalıştırır ve sonucu bekler.
+
+        Hata Durumları:
+        - Batch `timeout` içinde tamamlanmazsa InferenceTimeoutError fırlatır. Çalışan bir batch
+          iptal edilemediğinden yeni bir havuz arka planda ısındırılıp devreye alınır; eski havuzun
+          hâlâ çalışan worker'ları bir `timeout` sonra sonlandırılır. O sırada eski havuzda çalışan
+          diğer batch'ler tamamlanabilir.
+        - Worker çökerse InferenceWorkerCrashedError fırlatır; havuz aynı şekilde yeniden kurulur
+          ve yeni havuz hazır olana kadar gelen batch'ler de bu hatayı alır.
+        """
+        executor = self._executor
+        try:
+            future = executor.submit(_worker_predict, texts)
+            return future.result(timeout=self.timeout)
+        except FuturesTimeoutError:
+            self._restart(executor, terminate=True)
+            raise InferenceTimeoutError(f"Inference did not finish in {self.timeout} seconds")
+        except BrokenProcessPool:
+            self._restart(executor)
+            raise InferenceWorkerCrashedError("Inference worker crashed")
+
+    def warm_up(self, batches: List[List[str]]):
+        """
+        Batch'leri aynı anda göndererek tüm worker'ların başlatılmasını ve modeli
+        yükleyip ısınmasını sağlar. Havuz hazır sayılmadan önce çağrılır; aynı batch'ler havuz
+        yeniden kurulduğunda yeni havuzu ısındırmak için de kullanılır.
+        """
+        self._warmup_batches = batches
+        self._warm(self._executor)
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            self._closed = True
+        self._executor.shutdown(wait=wait)
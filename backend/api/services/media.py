@@ -0,0 +1,301 @@
+import asyncio
+import os
+import secrets
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from io import BytesIO
+from typing import AsyncIterator, BinaryIO, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+from starlette.datastructures import Headers, UploadFile
+from starlette.formparsers import MultiPartException, MultiPartParser
+
+from services.media_storage import MediaStorage
+
+# Medya türü -> kabul edilen MIME türleri ve saklanırken kullanılan uzantı
+MEDIA_TYPES = {
+    "image": {"image/jpeg": ".jpg", "image/png": ".png", "image/gif": ".gif", "image/webp": ".webp"},
+    "audio": {"audio/mpeg": ".mp3", "audio/ogg": ".ogg", "audio/wav": ".wav", "audio/webm": ".weba", "audio/mp4": ".m4a"},
+    "video": {"video/mp4": ".mp4", "video/webm": ".webm", "video/quicktime": ".mov"},
+}
+MEDIA_KINDS = tuple(MEDIA_TYPES)
+# Saklanan dosyanın uzantısı -> MIME türü (silinecek dosyanın türü URL'sinden bulunur)
+EXTENSION_TYPES = {ext: content_type for types in MEDIA_TYPES.values() for content_type, ext in types.items()}
+
+# Pillow biçimi -> MIME türü; dosyanın içeriği istemcinin bildirdiği türden bağımsız doğrulanır
+IMAGE_FORMATS = {"JPEG": "image/jpeg", "PNG": "image/png", "GIF": "image/gif", "WEBP": "image/webp"}
+IMAGE_SAVE_OPTIONS = {"JPEG": {"quality": 85, "optimize": True}, "WEBP": {"quality": 85}, "PNG": {"optimize": True}}
+
+# Multipart başlıkları ve sınır satırları için dosya boyutuna eklenen pay
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+class MediaError(ValueError):
+    """Yüklenen medya kabul edilemediğinde fırlatılır (ör. dosya alanı yok, bozuk istek)."""
+
+
+class MediaTooLargeError(MediaError):
+    """Dosya, türü için izin verilen boyutu aştığında fırlatılır."""
+
+
+class UnsupportedMediaTypeError(MediaError):
+    """Dosya türü izin verilmeyen bir türse veya içeriği bildirilen türle uyuşmuyorsa fırlatılır."""
+
+
+class _UploadTooLarge(MultiPartException):
+    # Ayrıştırıcı yalnızca MultiPartException'da geçici dosyalarını kapatır; sınır aşımı bu yüzden
+    # bu türle bildirilir ve `read_upload` içinde MediaTooLargeError'a çevrilir
+    pass
+
+
+class MediaPipelineBusyError(RuntimeError):
+    """Bekleyen işlemler `max_pending` sınırına ulaştığında yeni yüklemeleri reddetmek için fırlatılır."""
+
+
+@dataclass
+class StoredMedia:
+    kind: str
+    url: str
+    thumbnail_url: Optional[str] = None
+    # Saklanan (anahtar, MIME türü) çiftleri; yükleme geri alınırsa bunlar silinir
+    objects: List[Tuple[str, str]] = field(default_factory=list)
+
+
+def media_kind(content_type: Optional[str]) -> Optional[str]:
+    for kind, types in MEDIA_TYPES.items():
+        if content_type in types:
+            return kind
+    return None
+
+
+async def read_upload(
+    headers: Headers,
+    stream: AsyncIterator[bytes],
+    max_bytes: int,
+    field_name: str = "file",
+) -> UploadFile:
+    """
+    `multipart/form-data` isteğindeki dosya alanını, istek gövdesini parça parça okuyarak ayrıştırır.
+
+    Dosya 1 MB'a kadar bellekte, sonrası geçici bir dosyada tutulur. `Content-Length` sınırı
+    aşıyorsa gövde hiç okunmadan, aşmıyorsa (veya başlık yoksa) okunan bayt sayısı sınırı
+    geçtiği anda istek reddedilir.
+
+    Dönen Değer:
+    - UploadFile: Yüklenen dosya; çağıran işi bitince kapatmalıdır.
+
+    Hata Durumları:
+    - Gövde `max_bytes`'ı aşıyorsa MediaTooLargeError fırlatır.
+    - İstek multipart değilse, bozuksa veya `field_name` alanında dosya yoksa MediaError fırlatır.
+    """
+    limit = max_bytes + MULTIPART_OVERHEAD
+    content_length = headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > limit:
+        raise MediaTooLargeError(f"File exceeds {max_bytes} bytes")
+    if not headers.get("content-type", "").startswith("multipart/form-data"):
+        raise MediaError("Expected a multipart/form-data upload")
+
+    async def limited():
+        received = 0
+        async for chunk in stream:
+            received += len(chunk)
+            if received > limit:
+                raise _UploadTooLarge(f"File exceeds {max_bytes} bytes")
+            yield chunk
+
+    try:
+        form = await MultiPartParser(headers, limited(), max_files=1, max_fields=10).parse()
+    except _UploadTooLarge as e:
+        raise MediaTooLargeError(e.message)
+    except MultiPartException as e:
+        raise MediaError(e.message)
+    upload = form.get(field_name)
+    if not isinstance(upload, UploadFile):
+        await form.close()
+        raise MediaError(f"A '{field_name}' file field is required")
+    return upload
+
+
+class MediaPipeline:
+    """
+    Yüklenen medyayı doğrulayıp işleyen ve `MediaStorage`'a yazan iş hattı.
+
+    Doğrulama, görsel yeniden boyutlandırma, küçük resim (thumbnail) üretimi ve saklama event
+    loop dışında, `max_workers` thread'lik bir havuzda yapılır (Pillow görsel işleme sırasında
+    GIL'i bırakır). Aynı anda en fazla `max_pending` işlem kabul edilir; fazlası
+    MediaPipelineBusyError ile reddedilir.
+
+    Görseller Pillow ile açılarak doğrulanır ve EXIF yönüne göre döndürülüp yeniden kodlanır;
+    böylece konum gibi EXIF bilgileri saklanmaz. `image_max_dimension`'dan büyük görseller
+    küçültülür. Hareketli GIF'ler olduğu gibi saklanır. Ses ve video dosyaları dönüştürülmez.
+
+    Parametreler:
+    - storage (MediaStorage): Dosyaların yazılacağı saklama alanı.
+    - limits (Dict[str, int]): Medya türü (`MEDIA_KINDS`) -> izin verilen en büyük dosya boyutu (bayt).
+    - max_workers (int): Aynı anda işlenebilecek en fazla dosya.
+    - max_pending (int): İşlenen ve bekleyen toplam en fazla dosya (0 = sınırsız).
+    - image_max_dimension (int): Saklanan görselin en uzun kenarı (piksel).
+    - thumbnail_size (int): Küçük resmin en uzun kenarı (piksel).
+    """
+
+    def __init__(
+        self,
+        storage: MediaStorage,
+        limits: Dict[str, int],
+        max_workers: int = 2,
+        max_pending: int = 0,
+        image_max_dimension: int = 2048,
+        thumbnail_size: int = 320,
+    ):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.storage = storage
+        self.limits = limits
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.image_max_dimension = image_max_dimension
+        self.thumbnail_size = thumbnail_size
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending = 0
+        self.processed = 0
+        self.rejected = 0
+        self.failed = 0
+
+    async def _run(self, fn, *args, limited: bool = True):
+        if limited and self.max_pending and self._pending >= self.max_pending:
+            self.rejected += 1
+            raise MediaPipelineBusyError("Too many media uploads in progress")
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="media")
+        self._pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            self._pending -= 1
+
+    async def receive(self, headers: Headers, stream: AsyncIterator[bytes], kinds: Sequence[str]) -> UploadFile:
+        """İzin verilen türlerin en büyük boyut sınırıyla `read_upload` çağırır."""
+        return await read_upload(headers, stream, max(self.limits[kind] for kind in kinds))
+
+    async def process(
+        self,
+        upload: UploadFile,
+        key_prefix: str,
+        kinds: Sequence[str] = MEDIA_KINDS,
+        thumbnail: bool = True,
+    ) -> StoredMedia:
+        """
+        Yüklenen dosyayı doğrular, işler ve saklar.
+
+        Parametreler:
+        - upload (UploadFile): `receive` ile okunan dosya.
+        - key_prefix (str): Saklama anahtarının öneki (ör. `profiles/12`).
+        - kinds (Sequence[str]): Kabul edilen medya türleri.
+        - thumbnail (bool): False ise görseller için küçük resim üretilmez; yalnızca
+          `thumbnail_url`'i saklayan çağıranlar True vermelidir.
+
+        Hata Durumları:
+        - Dosya türü `kinds` içinde değilse veya görsel okunamıyorsa UnsupportedMediaTypeError fırlatır.
+        - Dosya türünün boyut sınırını aşıyorsa MediaTooLargeError fırlatır.
+        - Havuz doluysa MediaPipelineBusyError fırlatır.
+        """
+        kind = media_kind(upload.content_type)
+        if kind is None or kind not in kinds:
+            raise UnsupportedMediaTypeError(f"Unsupported media type '{upload.content_type}'")
+        if upload.size is not None and upload.size > self.limits[kind]:
+            raise MediaTooLargeError(f"File exceeds {self.limits[kind]} bytes")
+        key = f"{key_prefix}/{secrets.token_hex(8)}"
+        try:
+            media = await self._run(self._store, kind, upload.file, upload.content_type, key, thumbnail)
+        except MediaError:
+            raise
+        except Exception:
+            self.failed += 1
+            raise
+        self.processed += 1
+        return media
+
+    async def discard(self, media: StoredMedia):
+        """Saklanmış ama kullanılmayacak bir yüklemenin dosyalarını siler."""
+        await self._run(self._delete, media, limited=False)
+
+    async def discard_urls(self, key_prefix: str, urls: Iterable[Optional[str]]):
+        """
+        Yerine yenisi yazılan medyanın dosyalarını URL'lerinden bulup siler.
+
+        Yalnızca bu saklama alanına `key_prefix` altında yazılmış dosyalar silinir; başka bir
+        yerden gelen (ör. kullanıcının elle girdiği) URL'ler ve bilinmeyen uzantılar atlanır.
+        """
+        media = StoredMedia(kind="", url="")
+        for url in urls:
+            key = self.storage.key_for_url(url) if url else None
+            content_type = EXTENSION_TYPES.get(os.path.splitext(key)[1]) if key else None
+            if content_type is not None and key.startswith(key_prefix + "/"):
+                media.objects.append((key, content_type))
+        if media.objects:
+            await self._run(self._delete, media, limited=False)
+
+    def _store(self, kind: str, source: BinaryIO, content_type: str, key: str, thumbnail: bool) -> StoredMedia:
+        source.seek(0)
+        if kind == "image":
+            return self._store_image(source, key, thumbnail)
+        stored_key = key + MEDIA_TYPES[kind][content_type]
+        url = self.storage.save(source, stored_key, content_type)
+        return StoredMedia(kind=kind, url=url, objects=[(stored_key, content_type)])
+
+    def _store_image(self, source: BinaryIO, key: str, thumbnail: bool) -> StoredMedia:
+        thumbnail_buffer = None
+        try:
+            with Image.open(source) as image:
+                image_format = image.format
+                if image_format not in IMAGE_FORMATS:
+                    raise UnsupportedMediaTypeError(f"Unsupported image format '{image_format}'")
+                animated = getattr(image, "is_animated", False)
+                oriented = ImageOps.exif_transpose(image)
+                if thumbnail:
+                    preview = oriented.copy()
+                    preview.thumbnail((self.thumbnail_size, self.thumbnail_size), Image.Resampling.LANCZOS)
+                    thumbnail_buffer = BytesIO()
+                    preview.convert("RGB").save(thumbnail_buffer, format="JPEG", quality=80)
+                if animated:
+                    source.seek(0)
+                    original = source
+                else:
+                    oriented.thumbnail((self.image_max_dimension, self.image_max_dimension), Image.Resampling.LANCZOS)
+                    original = BytesIO()
+                    oriented.save(original, format=image_format, **IMAGE_SAVE_OPTIONS.get(image_format, {}))
+        except (UnidentifiedImageError, Image.DecompressionBombError, OSError):
+            raise UnsupportedMediaTypeError("File is not a valid image")
+
+        content_type = IMAGE_FORMATS[image_format]
+        stored_key = key + MEDIA_TYPES["image"][content_type]
+        original.seek(0)
+        media = StoredMedia(kind="image", url=self.storage.save(original, stored_key, content_type))
+        media.objects.append((stored_key, content_type))
+        if thumbnail_buffer is not None:
+            thumbnail_key = f"{key}_thumb.jpg"
+            thumbnail_buffer.seek(0)
+            media.thumbnail_url = self.storage.save(thumbnail_buffer, thumbnail_key, "image/jpeg")
+            media.objects.append((thumbnail_key, "image/jpeg"))
+        return media
+
+    def _delete(self, media: StoredMedia):
+        for key, content_type in media.objects:
+            self.storage.delete(key, content_type)
+
+    def shutdown(self):
+        """Havuzu kapatır; sonraki ilk işlemde yeni bir havuz oluşturulur."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        return {
+            "storage": type(self.storage).__name__,
+            "max_workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "pending": self._pending,
+            "processed": self.processed,
+            "rejected": self.rejected,
+            "failed": self.failed,
+        }
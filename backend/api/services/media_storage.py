@@ -0,0 +1,121 @@
+import os
+import re
+import shutil
+from abc import ABC, abstractmethod
+from typing import BinaryIO, Optional
+from urllib.parse import urlparse
+
+import cloudinary.uploader
+
+STORAGE_BACKENDS = ("local", "cloudinary")
+
+# Dosyalar bu boyuttaki parçalarla kopyalanır; tamamı belleğe alınmaz
+COPY_CHUNK_SIZE = 1024 * 1024
+# Cloudinary URL'lerindeki sürüm bölümü (ör. `v1712345678/`)
+_CLOUDINARY_VERSION = re.compile(r"^v\d+/")
+
+
+class MediaStorage(ABC):
+    """
+    Medya dosyalarının saklandığı yer için arayüz.
+
+    `save` ve `delete` bloklayan çağrılardır; `MediaPipeline` bunları worker havuzunda çalıştırır.
+    Anahtarlar (`key`) `profiles/12/ab34.jpg` gibi `/` ile ayrılmış göreli yollardır.
+    """
+
+    @abstractmethod
+    def save(self, source: BinaryIO, key: str, content_type: str) -> str:
+        """Dosyayı `key` altında saklar ve herkese açık URL'sini döndürür."""
+
+    @abstractmethod
+    def delete(self, key: str, content_type: str):
+        ...
+
+    @abstractmethod
+    def key_for_url(self, url: str) -> Optional[str]:
+        """`save`'in döndürdüğü URL'den anahtarı çıkarır; URL bu saklama alanına ait değilse None."""
+
+
+class LocalStorage(MediaStorage):
+    """
+    Dosyaları yerel dosya sisteminde saklar; geliştirme ve test ortamları içindir.
+
+    Dosyalar `root` altına yazılır ve `base_url` üzerinden sunulur (bkz. `main.py` `/media` mount'u).
+    Yazma önce geçici bir dosyaya yapılır; yarım kalan yüklemeler hiçbir zaman sunulmaz.
+    """
+
+    def __init__(self, root: str, base_url: str):
+        self.root = os.path.abspath(root)
+        self.base_url = base_url.rstrip("/")
+
+    def _path(self, key: str) -> str:
+        path = os.path.abspath(os.path.join(self.root, key))
+        if not path.startswith(self.root + os.sep):
+            raise ValueError(f"Invalid media key '{key}'")
+        return path
+
+    def save(self, source: BinaryIO, key: str, content_type: str) -> str:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        partial = path + ".part"
+        with open(partial, "wb") as destination:
+            shutil.copyfileobj(source, destination, COPY_CHUNK_SIZE)
+        os.replace(partial, path)
+        return f"{self.base_url}/{key}"
+
+    def delete(self, key: str, content_type: str):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def key_for_url(self, url: str) -> Optional[str]:
+        prefix = self.base_url + "/"
+        return url[len(prefix):] if url.startswith(prefix) else None
+
+
+class CloudinaryStorage(MediaStorage):
+    """
+    Dosyaları Cloudinary'ye yükler. Hesap bilgileri `cloudinary.config` ile (veya
+    `CLOUDINARY_URL` ortam değişkeniyle) uygulama genelinde ayarlanır.
+    """
+
+    @staticmethod
+    def _public_id(key: str) -> str:
+        # Cloudinary uzantıyı biçimden kendisi belirler
+        return os.path.splitext(key)[0]
+
+    @staticmethod
+    def _resource_type(content_type: str) -> str:
+        # Cloudinary ses dosyalarını da "video" kaynak türüyle saklar
+        return "image" if content_type.startswith("image/") else "video"
+
+    def save(self, source: BinaryIO, key: str, content_type: str) -> str:
+        result = cloudinary.uploader.upload(
+            source,
+            public_id=self._public_id(key),
+            resource_type=self._resource_type(content_type),
+        )
+        return result["secure_url"]
+
+    def delete(self, key: str, content_type: str):
+        cloudinary.uploader.destroy(self._public_id(key), resource_type=self._resource_type(content_type))
+
+    def key_for_url(self, url: str) -> Optional[str]:
+        # https://res.cloudinary.com/<hesap>/<kaynak türü>/upload/v<sürüm>/<public_id>.<uzantı>
+        parsed = urlparse(url)
+        if parsed.hostname != "res.cloudinary.com" or "/upload/" not in parsed.path:
+            return None
+        return _CLOUDINARY_VERSION.sub("", parsed.path.split("/upload/", 1)[1], count=1)
+
+
+def create_storage(backend: str = "local", root: str = "./media", base_url: str = "/media") -> MediaStorage:
+    """
+    Hata Durumları:
+    - `backend` `STORAGE_BACKENDS` içinde değilse ValueError fırlatır.
+    """
+    if backend not in STORAGE_BACKENDS:
+        raise ValueError(f"Unknown media storage backend '{backend}', expected one of {STORAGE_BACKENDS}")
+    if backend == "cloudinary":
+        return CloudinaryStorage()
+    return LocalStorage(root, base_url)
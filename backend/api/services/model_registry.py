@@ -0,0 +1,140 @@
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Any, Callable, Optional
+
+
+class ModelNotReadyError(RuntimeError):
+    """Model henüz yüklenmemişken tahmin istendiğinde fırlatılır."""
+
+
+class ModelRegistry:
+    """
+    Chat modelini arka planda yükleyen, ısındıran (warm-up) ve çalışırken değiştirilebilen kayıt.
+
+    İşleyiş:
+    - `load_in_background` modeli ayrı bir thread'de yükler; uygulama bu sırada diğer
+      route'lara (örneğin `/auth/token`) hizmet vermeye devam eder.
+    - Yüklenen model önce `warmup` fonksiyonundan geçirilir, ancak bundan sonra aktif modelle
+      yer değiştirir. Böylece hot-swap sırasında istekler her zaman ısınmış bir modele gider.
+    - Yükleme başarısız olursa (varsa) önceki model hizmet vermeye devam eder.
+
+    Parametreler:
+    - loader (Callable): Dosya yolunu alıp modeli döndüren fonksiyon.
+    - warmup (Callable, opsiyonel): Yeni yüklenen modelle birkaç çıkarım yapan fonksiyon.
+    - unload (Callable, opsiyonel): Yerine yenisi geçen (veya kapatılan) modeli serbest bırakan
+      fonksiyon; örneğin bir worker havuzunu kapatmak için kullanılır.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[str], Any],
+        warmup: Optional[Callable[[Any], None]] = None,
+        unload: Optional[Callable[[Any], None]] = None,
+    ):
+        self.loader = loader
+        self.warmup = warmup
+        self.unload = unload
+        self._lock = threading.Lock()
+        self._model = None
+        self._loader_thread: Optional[threading.Thread] = None
+        self.version: Optional[str] = None
+        self.loaded_at: Optional[datetime] = None
+        self.loading_version: Optional[str] = None
+        self.error: Optional[str] = None
+
+    @property
+    def ready(self) -> bool:
+        return self._model is not None
+
+    @property
+    def loading(self) -> bool:
+        return self._loader_thread is not None and self._loader_thread.is_alive()
+
+    def get(self):
+        """
+        Aktif modeli döndürür.
+
+        Hata Durumları:
+        - Henüz hazır bir model yoksa ModelNotReadyError fırlatır.
+        """
+        model = self._model
+        if model is None:
+            raise ModelNotReadyError("Model is not loaded yet")
+        return model
+
+    def load(self, path: str, version: Optional[str] = None):
+        """
+        Modeli senkron olarak yükler, ısındırır ve aktif model yapar.
+
+        Parametreler:
+        - path (str): Model dosyasının yolu.
+        - version (str, opsiyonel): Sürüm etiketi; verilmezse dosya adı kullanılır.
+        """
+        version = version or os.path.splitext(os.path.basename(path))[0]
+        self.loading_version = version
+        model = None
+        try:
+            model = self.loader(path)
+            if self.warmup is not None:
+                self.warmup(model)
+        except Exception as e:
+            self.error = f"{version}: {e}"
+            if model is not None and self.unload is not None:
+                self.unload(model)
+            raise
+        finally:
+            self.loading_version = None
+        with self._lock:
+            previous = self._model
+            self._model = model
+            self.version = version
+            self.loaded_at = datetime.now(timezone.utc)
+            self.error = None
+        if previous is not None and self.unload is not None:
+            self.unload(previous)
+
+    def close(self):
+        """Aktif modeli serbest bırakır; uygulama kapanırken çağrılır."""
+        with self._lock:
+            model = self._model
+            self._model = None
+            self.version = None
+        if model is not None and self.unload is not None:
+            self.unload(model)
+
+    def load_in_background(self, path: str, version: Optional[str] = None) -> bool:
+        """
+        Modeli arka plandaki bir thread'de yükler.
+
+        Dönen Değer:
+        - bool: Yükleme başlatıldıysa True, zaten devam eden bir yükleme varsa False.
+        """
+        with self._lock:
+            if self.loading:
+                return False
+            self._loader_thread = threading.Thread(
+                target=self._load_quietly,
+                args=(path, version),
+                name="model-loader",
+                daemon=True,
+            )
+            self._loader_thread.start()
+        return True
+
+    def _load_quietly(self, path: str, version: Optional[str]):
+        try:
+            self.load(path, version)
+        except Exception:
+            # Hata `self.error` içinde saklanır ve /health/ready üzerinden görülebilir
+            pass
+
+    def status(self) -> dict:
+        return {
+            "ready": self.ready,
+            "version": self.version,
+            "loaded_at": self.loaded_at,
+            "loading": self.loading,
+            "loading_version": self.loading_version,
+            "error": self.error,
+        }
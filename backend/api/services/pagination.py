@@ -0,0 +1,70 @@
+import base64
+from datetime import datetime
+from typing import Optional, Tuple
+
+from sqlalchemy import and_, or_
+
+
+class InvalidCursorError(ValueError):
+    """Çözülemeyen veya bozuk bir sayfalama imleci verildiğinde fırlatılır."""
+
+
+def encode_cursor(created_at: datetime, id: int) -> str:
+    """
+    Bir satırın `(created_at, id)` konumunu istemciye verilecek opak bir imlece dönüştürür.
+    """
+    raw = f"{created_at.isoformat()}|{id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    `encode_cursor` ile üretilmiş imleci `(created_at, id)` ikilisine çözer.
+
+    Hata Durumları:
+    - İmleç geçersizse InvalidCursorError fırlatır.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise InvalidCursorError("Invalid cursor") from e
+
+def keyset_condition(created_column, id_column, cursor: str, before: bool):
+    """
+    `(created_at, id)` sıralamasında imlecin öncesindeki (before=True) veya sonrasındaki
+    satırları seçen filtre ifadesini döndürür. `(…, created_at)` üzerindeki bir indeksle
+    OFFSET kullanmadan doğrudan ilgili konuma atlanır.
+
+    Dıştaki `created_at <= …` (veya `>=`) koşulu sonucu değiştirmez; yalnızca sorgu
+    planlayıcısının OR ifadesine rağmen indekste aralık araması yapabilmesini sağlar.
+    """
+    created_at, id = decode_cursor(cursor)
+    if before:
+        return and_(created_column <= created_at, or_(created_column < created_at, id_column < id))
+    return and_(created_column >= created_at, or_(created_column > created_at, id_column > id))
+
+def cursor_for(row) -> Optional[str]:
+    if row is None:
+        return None
+    return encode_cursor(row.created_at, row.id)
+
+def encode_id_cursor(id: int) -> str:
+    """Yalnızca `id` ile sıralanan listeler için opak imleç."""
+    return base64.urlsafe_b64encode(f"id|{id}".encode()).decode().rstrip("=")
+
+def decode_id_cursor(cursor: str) -> int:
+    """
+    `encode_id_cursor` ile üretilmiş imleci `id` değerine çözer.
+
+    Hata Durumları:
+    - İmleç geçersizse InvalidCursorError fırlatır.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        prefix, id = raw.split("|", 1)
+        if prefix != "id":
+            raise ValueError(prefix)
+        return int(id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise InvalidCursorError("Invalid cursor") from e
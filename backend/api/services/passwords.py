@@ -0,0 +1,89 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
+from passlib.context import CryptContext
+
+
+class PasswordHasherBusyError(RuntimeError):
+    """Bekleyen hash işlemleri `max_pending` sınırına ulaştığında yeni istekleri reddetmek için fırlatılır."""
+
+
+class PasswordHasher:
+    """
+    Parola hash'leme ve doğrulamayı event loop dışında, sınırlı bir thread havuzunda yapar.
+
+    bcrypt kasıtlı olarak yavaştır (maliyet faktörüne göre yüzlerce ms CPU); event loop üzerinde
+    çalıştırılırsa aynı worker'daki tüm istekler bekler. İşlemler `max_workers` thread'lik bir
+    havuzda çalışır (bcrypt hash sırasında GIL'i bırakır). Aynı anda en fazla `max_pending` işlem
+    kabul edilir; fazlası kuyrukta birikmek yerine hemen PasswordHasherBusyError ile reddedilir.
+
+    Parametreler:
+    - rounds (int): bcrypt maliyet faktörü (log2 tur sayısı). Farklı maliyetle üretilmiş hash'ler
+      `verify_and_update` ile doğrulanırken yeni maliyetle yeniden hash'lenir.
+    - max_workers (int): Aynı anda çalışabilecek en fazla hash işlemi.
+    - max_pending (int): Çalışan ve bekleyen toplam en fazla işlem (0 = sınırsız).
+    """
+
+    def __init__(self, rounds: int = 12, max_workers: int = 1, max_pending: int = 0):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.rounds = rounds
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending = 0
+        self.rejected = 0
+        self.rehashed = 0
+
+    async def _run(self, fn, *args):
+        if self.max_pending and self._pending >= self.max_pending:
+            self.rejected += 1
+            raise PasswordHasherBusyError("Too many password hash operations in progress")
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="password-hash")
+        self._pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            self._pending -= 1
+
+    async def hash(self, password: str) -> str:
+        """
+        Hata Durumları:
+        - Havuz doluysa PasswordHasherBusyError fırlatır.
+        """
+        return await self._run(self.context.hash, password)
+
+    async def verify_and_update(self, password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+        """
+        Parolayı doğrular; hash güncel parametrelerle üretilmemişse yeni hash'i de döndürür.
+
+        Dönen Değer:
+        - Tuple[bool, Optional[str]]: Parola doğruysa True; yeniden hash gerekiyorsa yeni hash,
+          gerekmiyorsa None.
+
+        Hata Durumları:
+        - Havuz doluysa PasswordHasherBusyError fırlatır.
+        """
+        valid, new_hash = await self._run(self.context.verify_and_update, password, hashed)
+        if new_hash is not None:
+            self.rehashed += 1
+        return valid, new_hash
+
+    def shutdown(self):
+        """Havuzu kapatır; sonraki ilk işlemde yeni bir havuz oluşturulur."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        return {
+            "rounds": self.rounds,
+            "max_workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "pending": self._pending,
+            "rejected": self.rejected,
+            "rehashed": self.rehashed,
+        }
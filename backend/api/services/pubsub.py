@@ -0,0 +1,161 @@
+import asyncio
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Set
+
+HUB_BACKENDS = ("memory",)
+
+
+class SubscriptionClosed(Exception):
+    """Abonelik hub tarafından kapatıldığında (yavaş tüketici, kapanış) `Subscription.get` fırlatır."""
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+_CLOSED = object()
+
+
+class Subscription:
+    """
+    Tek bir bağlantının (ör. bir WebSocket) olay kuyruğu.
+
+    Kuyruk `max_queue_size` ile sınırlıdır. Dolu kuyruğa olay gelirse tüketici yavaş kabul
+    edilir ve abonelik kapatılır; yayıncı hiçbir zaman yavaş bir tüketiciyi beklemez.
+    İstemci yeniden bağlanıp kaçırdığı mesajları geçmişten okur.
+    """
+
+    def __init__(self, user_id: int, max_queue_size: int):
+        self.user_id = user_id
+        self.closed_reason = None
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+
+    def offer(self, event: Dict[str, Any]) -> bool:
+        """Olayı kuyruğa ekler; abonelik kapalıysa veya kuyruk doluysa False döner."""
+        if self.closed_reason is not None:
+            return False
+        try:
+            self._queue.put_nowait(event)
+            return True
+        except asyncio.QueueFull:
+            self.close("slow consumer")
+            return False
+
+    def close(self, reason: str):
+        if self.closed_reason is not None:
+            return
+        self.closed_reason = reason
+        # Bekleyen olaylar atılır; tüketici bir sonraki `get` çağrısında kapanışı görür
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        self._queue.put_nowait(_CLOSED)
+
+    async def get(self) -> Dict[str, Any]:
+        """
+        Sıradaki olayı bekler.
+
+        Hata Durumları:
+        - Abonelik kapatıldıysa SubscriptionClosed fırlatır.
+        """
+        event = await self._queue.get()
+        if event is _CLOSED:
+            raise SubscriptionClosed(self.closed_reason)
+        return event
+
+
+class PubSubHub(ABC):
+    """
+    Kullanıcılara gerçek zamanlı olay dağıtan hub arayüzü.
+
+    Olaylar kullanıcı kimliğine yayınlanır ve o kullanıcının açık tüm aboneliklerine iletilir.
+    Süreç içi uygulama (`InProcessHub`) yalnızca aynı süreçteki bağlantılara ulaşır; birden fazla
+    worker için aynı arayüzle bir mesaj aracısı (ör. Redis pub/sub) kullanan bir uygulama yazılıp
+    `create_hub` üzerinden seçilebilir.
+    """
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+    @abstractmethod
+    async def publish(self, user_id: int, event: Dict[str, Any]):
+        ...
+
+    @abstractmethod
+    def subscribe(self, user_id: int) -> "AsyncIterator[Subscription]":
+        ...
+
+    @abstractmethod
+    def stats(self) -> dict:
+        ...
+
+
+class InProcessHub(PubSubHub):
+    """
+    Olayları aynı süreçteki aboneliklere doğrudan ileten hub.
+
+    Parametreler:
+    - max_queue_size (int): Bağlantı başına bekleyebilecek en fazla olay; aşılırsa bağlantı
+      yavaş tüketici olarak kapatılır.
+    """
+
+    def __init__(self, max_queue_size: int = 100):
+        self.max_queue_size = max_queue_size
+        self._subscriptions: Dict[int, Set[Subscription]] = {}
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+
+    @property
+    def connections(self) -> int:
+        return sum(len(subscriptions) for subscriptions in self._subscriptions.values())
+
+    async def stop(self):
+        # Açık bağlantılar kapanışta beklenmeden sonlandırılır
+        for subscriptions in list(self._subscriptions.values()):
+            for subscription in list(subscriptions):
+                subscription.close("shutdown")
+
+    async def publish(self, user_id: int, event: Dict[str, Any]):
+        self.published += 1
+        for subscription in list(self._subscriptions.get(user_id, ())):
+            if subscription.offer(event):
+                self.delivered += 1
+            else:
+                self.dropped += 1
+
+    @asynccontextmanager
+    async def subscribe(self, user_id: int) -> AsyncIterator[Subscription]:
+        subscription = Subscription(user_id, self.max_queue_size)
+        self._subscriptions.setdefault(user_id, set()).add(subscription)
+        try:
+            yield subscription
+        finally:
+            subscriptions = self._subscriptions.get(user_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[user_id]
+
+    def stats(self) -> dict:
+        return {
+            "backend": "memory",
+            "connections": self.connections,
+            "users": len(self._subscriptions),
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+        }
+
+
+def create_hub(backend: str = "memory", max_queue_size: int = 100) -> PubSubHub:
+    """
+    Hata Durumları:
+    - `backend` `HUB_BACKENDS` içinde değilse ValueError fırlatır.
+    """
+    if backend not in HUB_BACKENDS:
+        raise ValueError(f"Unknown pub/sub backend '{backend}', expected one of {HUB_BACKENDS}")
+    return InProcessHub(max_queue_size=max_queue_size)
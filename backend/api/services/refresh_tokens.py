@@ -0,0 +1,99 @@
+import secrets
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import delete, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.mixins import utc_now
+from models.refresh_token import RefreshToken
+
+
+def _new_id() -> str:
+    return secrets.token_hex(16)
+
+
+def issue_refresh_token(
+    db: AsyncSession,
+    user_id: int,
+    expires_at: datetime,
+    family_id: Optional[str] = None,
+) -> RefreshToken:
+    """
+    Yeni bir yenileme token'ı kaydı ekler. Commit edilmez.
+
+    `family_id` verilmezse yeni bir aile (yeni bir oturum) başlatılır.
+    """
+    token = RefreshToken(jti=_new_id(), family_id=family_id or _new_id(), user_id=user_id, expires_at=expires_at)
+    db.add(token)
+    return token
+
+
+async def revoke_family(db: AsyncSession, family_id: str):
+    """Ailedeki henüz iptal edilmemiş tüm token'ları iptal eder. Commit edilmez."""
+    await db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=utc_now())
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def rotate_refresh_token(
+    db: AsyncSession,
+    jti: str,
+    user_id: int,
+    expires_at: datetime,
+) -> Optional[RefreshToken]:
+    """
+    Geçerli bir yenileme token'ını iptal eder ve aynı ailede yerine yenisini verir. Commit edilmez;
+    çağıran, sonuç None olsa da commit etmelidir (tekrar kullanımda aile iptali yazılır).
+
+    Token birincil anahtarla tek okumada bulunur. İptal koşullu bir `UPDATE` ile yapılır; aynı
+    token'la eşzamanlı gelen iki istekten yalnızca biri yeni token alır. İstemci aynı anda tek bir
+    yenileme isteği göndermelidir.
+
+    Dönen Değer:
+    - Optional[RefreshToken]: Yeni token kaydı; token bilinmiyorsa, süresi dolmuşsa, başka bir
+      kullanıcıya aitse veya daha önce kullanılmışsa None. Daha önce kullanılmış bir token
+      gelirse ailenin tamamı iptal edilir.
+    """
+    current = await db.get(RefreshToken, jti)
+    if current is None or current.user_id != user_id or current.expires_at <= utc_now():
+        return None
+    if current.revoked_at is not None:
+        await revoke_family(db, current.family_id)
+        return None
+
+    result = await db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.jti == jti, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=utc_now())
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        # Eşzamanlı bir istek token'ı az önce yeniledi; o isteğin verdiği token geçerli kalır
+        return None
+    return issue_refresh_token(db, user_id, expires_at, family_id=current.family_id)
+
+
+async def revoke_refresh_token(db: AsyncSession, jti: str):
+    """Token'ın ailesini (oturumu) iptal eder; token bilinmiyorsa bir şey yapmaz. Commit edilmez."""
+    current = await db.get(RefreshToken, jti)
+    if current is not None:
+        await revoke_family(db, current.family_id)
+
+
+def prune_refresh_tokens(engine: Engine, log=print) -> int:
+    """
+    Süresi dolmuş yenileme token'ı kayıtlarını siler; süresi dolan token zaten reddedildiğinden
+    iptal kaydına gerek kalmaz. Periyodik (ör. cron) çalıştırılabilir.
+
+    Dönen Değer:
+    - int: Silinen kayıt sayısı.
+    """
+    with engine.begin() as connection:
+        deleted = connection.execute(delete(RefreshToken).where(RefreshToken.expires_at <= utc_now())).rowcount
+    log(f"{deleted} expired refresh token(s) pruned")
+    return deleted
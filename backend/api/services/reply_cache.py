@@ -0,0 +1,72 @@
+import re
+from datetime import datetime, timedelta
+from typing import Any, Hashable, Optional
+from zoneinfo import ZoneInfo
+
+from services.ttl_cache import TTLCache
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_WHITESPACE = re.compile(r"\s+")
+
+def normalize_text(text: str) -> str:
+    """
+    Metni önbellek anahtarı için normalleştirir.
+
+    Küçük harfe çevirir, noktalama işaretlerini kaldırır ve boşlukları tek boşluğa indirir.
+    Böylece "Leo için bugün ne var?" ve "leo için bugün ne var" aynı anahtara düşer.
+    """
+    text = _PUNCTUATION.sub(" ", text.casefold())
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+class ReplyCache(TTLCache):
+    """
+    Bot yanıtları için LRU tahliyeli, günlük yenilenen önbellek.
+
+    Anahtar; normalleştirilmiş metin, burç yorumlarının geçerli olduğu takvim günü ve
+    çağıranın verdiği ek bağlam (ör. model sürümü) bileşenlerinden oluşur. Her kayıt,
+    günlük burç yorumlarının yenilendiği saatte (`rollover_hour`) veya `ttl_seconds` sonunda
+    (hangisi önceyse) geçersiz olur.
+
+    Parametreler:
+    - max_entries (int): Önbellekte tutulacak en fazla kayıt sayısı.
+    - ttl_seconds (float): Bir kaydın en uzun yaşam süresi.
+    - rollover_hour (int): Günlük yorumların yenilendiği saat (0-23).
+    - timezone (str): Takvim gününün hesaplandığı saat dilimi.
+    - enabled (bool): False ise önbellek tamamen devre dışıdır.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        ttl_seconds: float = 24 * 60 * 60,
+        rollover_hour: int = 0,
+        timezone: str = "UTC",
+        enabled: bool = True,
+    ):
+        super().__init__(max_entries=max_entries, ttl_seconds=ttl_seconds, enabled=enabled)
+        self.rollover_hour = rollover_hour
+        self.timezone = ZoneInfo(timezone)
+
+    def _now(self) -> datetime:
+        return datetime.now(self.timezone)
+
+    def horoscope_day(self, now: Optional[datetime] = None):
+        """Yenilenme saatine göre geçerli burç gününü döndürür."""
+        now = now or self._now()
+        return (now - timedelta(hours=self.rollover_hour)).date()
+
+    def next_rollover(self, now: Optional[datetime] = None) -> datetime:
+        now = now or self._now()
+        rollover = now.replace(hour=self.rollover_hour, minute=0, second=0, microsecond=0)
+        if rollover <= now:
+            rollover += timedelta(days=1)
+        return rollover
+
+    def make_key(self, text: str, *context: Hashable) -> tuple:
+        return (normalize_text(text), self.horoscope_day(), *context)
+
+    def set(self, key: Hashable, value: Any):
+        now = self._now()
+        expires_at = min(self.next_rollover(now), now + timedelta(seconds=self.ttl_seconds))
+        super().set(key, value, (expires_at - now).total_seconds())
@@ -0,0 +1,43 @@
+import hashlib
+import time
+from typing import Any, Dict, Optional
+
+from services.ttl_cache import TTLCache
+
+
+class TokenCache(TTLCache):
+    """
+    Doğrulanmış erişim token'ları için LRU tahliyeli önbellek.
+
+    Anahtar token'ın SHA-256 özetidir (token'ın kendisi saklanmaz); değer çözülmüş claim'lerdir.
+    Her kaydın süresi token'ın `exp` zamanından hesaplanır; ayrıca her okumada `exp` yeniden
+    kontrol edilir, böylece süresi dolmuş bir token önbellekten asla döndürülmez. `exp`
+    içermeyen token'lar önbelleğe alınmaz.
+
+    Parametreler:
+    - max_entries (int): Önbellekte tutulacak en fazla token sayısı.
+    - enabled (bool): False ise önbellek tamamen devre dışıdır.
+    """
+
+    def __init__(self, max_entries: int = 10000, enabled: bool = True):
+        super().__init__(max_entries=max_entries, ttl_seconds=None, enabled=enabled)
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        claims = super().get(self._key(token))
+        if claims is not None and claims["exp"] <= time.time():
+            # Sistem saati ileri alındıysa kaydın süresi `exp`'ten sonra dolabilir
+            self.invalidate(self._key(token))
+            return None
+        return claims
+
+    def set(self, token: str, claims: Dict[str, Any]):
+        expires_at = claims.get("exp")
+        if not isinstance(expires_at, (int, float)):
+            return
+        ttl_seconds = expires_at - time.time()
+        if ttl_seconds > 0:
+            super().set(self._key(token), claims, ttl_seconds)
@@ -0,0 +1,133 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional, Tuple
+
+
+class TTLCache:
+    """
+    Süreli (TTL) ve LRU tahliyeli, süreç içi anahtar-değer önbelleği.
+
+    Veritabanından okunan değerler `fill` ile eklenir. Okumaya başlamadan önce `token()` ile
+    alınan değer `fill`'e verilir; arada herhangi bir `invalidate` çağrıldıysa okunan değerler
+    eski olabileceğinden önbelleğe yazılmaz. Böylece güncellemeden önce başlamış bir okuma,
+    geçersiz kılınmış bir kaydı eski haliyle geri getiremez.
+
+    Yazmadan sonra bilinen değer `set` ile doğrudan yazılabilir (write-through). `set` kayda
+    özel bir süre de alabilir (ör. token'ın kendi `exp` zamanı).
+
+    Parametreler:
+    - max_entries (int): Önbellekte tutulacak en fazla kayıt sayısı.
+    - ttl_seconds (float, opsiyonel): Bir kaydın varsayılan en uzun yaşam süresi; None ise kayıtlar
+      yalnızca LRU tahliyesiyle çıkar.
+    - enabled (bool): False ise önbellek tamamen devre dışıdır.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: Optional[float] = 30, enabled: bool = True):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self._invalidations = 0
+        self._lock = threading.Lock()
+
+    def _expires_at(self, ttl_seconds: Optional[float]) -> float:
+        if ttl_seconds is None:
+            return float("inf")
+        return time.monotonic() + ttl_seconds
+
+    def _lookup(self, key: Hashable, now: float) -> Tuple[bool, Any]:
+        # Kilit çağıran tarafından tutulur
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] > now:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[0]
+        if entry is not None:
+            del self._entries[key]
+        self.misses += 1
+        return False, None
+
+    def _store(self, key: Hashable, value: Any, expires_at: float):
+        # Kilit çağıran tarafından tutulur
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Anahtarın değerini döndürür; önbellekte yoksa veya süresi dolduysa None."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            return self._lookup(key, time.monotonic())[1]
+
+    def get_many(self, keys: Iterable[Hashable]) -> Dict[Hashable, Any]:
+        """Önbellekte bulunan ve süresi dolmamış anahtarların değerlerini döndürür."""
+        if not self.enabled:
+            return {}
+        now = time.monotonic()
+        found = {}
+        with self._lock:
+            for key in keys:
+                hit, value = self._lookup(key, now)
+                if hit:
+                    found[key] = value
+        return found
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None):
+        """Değeri yazar; `ttl_seconds` verilmezse önbelleğin varsayılan süresi kullanılır."""
+        if not self.enabled:
+            return
+        expires_at = self._expires_at(self.ttl_seconds if ttl_seconds is None else ttl_seconds)
+        with self._lock:
+            self._store(key, value, expires_at)
+
+    def token(self) -> int:
+        with self._lock:
+            return self._invalidations
+
+    def fill(self, values: Dict[Hashable, Any], token: Optional[int] = None, replace: bool = True):
+        """
+        Okunan değerleri ekler.
+
+        Parametreler:
+        - token (int, opsiyonel): Okumadan önce `token()` ile alınan değer; arada `invalidate`
+          çağrıldıysa hiçbir değer yazılmaz.
+        - replace (bool): False ise yalnızca önbellekte olmayan anahtarlar eklenir; okuma
+          sırasında `set` ile yazılmış daha yeni bir değer ezilmez.
+        """
+        if not self.enabled or not values:
+            return
+        expires_at = self._expires_at(self.ttl_seconds)
+        with self._lock:
+            if token is not None and token != self._invalidations:
+                return
+            for key, value in values.items():
+                if replace or key not in self._entries:
+                    self._store(key, value, expires_at)
+
+    def invalidate(self, key: Hashable):
+        with self._lock:
+            self._invalidations += 1
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._invalidations += 1
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
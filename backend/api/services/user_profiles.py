@@ -0,0 +1,52 @@
+import os
+from typing import Any, Dict, List, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.user import User
+from services.ttl_cache import TTLCache
+
+# Sık istenen profiller için kısa süreli önbellek; 0 önbelleği kapatır
+USER_PROFILE_CACHE_SIZE = int(os.getenv("USER_PROFILE_CACHE_SIZE", "10000"))
+USER_PROFILE_CACHE_TTL = float(os.getenv("USER_PROFILE_CACHE_TTL", "30"))
+
+# Profil olarak okunabilecek alanlar; parola gibi alanlar hiçbir zaman seçilmez
+PROFILE_FIELDS = (
+    "id", "username", "email", "first_name", "last_name", "profile", "profile_thumbnail", "bio", "created_at",
+)
+
+# Profiller her zaman `PROFILE_FIELDS` alanlarının tamamıyla saklanır; kullanıcıyı güncelleyen
+# route'lar commit sonrası kaydı `profile_cache.invalidate(user_id)` ile geçersiz kılar
+profile_cache = TTLCache(
+    max_entries=USER_PROFILE_CACHE_SIZE,
+    ttl_seconds=USER_PROFILE_CACHE_TTL,
+    enabled=USER_PROFILE_CACHE_SIZE > 0,
+)
+
+
+async def load_profiles(
+    db: AsyncSession,
+    user_ids: List[int],
+    fields: Sequence[str] = PROFILE_FIELDS,
+) -> Dict[int, Dict[str, Any]]:
+    """
+    Kullanıcı profillerini önce önbellekten, kalanları tek bir `IN` sorgusuyla veritabanından okur.
+
+    Önbellek kapalıyken yalnızca `fields` sütunları seçilir; açıkken önbelleğe eksiksiz kayıt
+    yazılabilmesi için `PROFILE_FIELDS` sütunlarının tamamı seçilir.
+
+    Dönen Değer:
+    - Dict[int, Dict[str, Any]]: Kullanıcı kimliğinden profil alanlarına; bulunamayanlar yer almaz.
+      Sözlükler önbellekle paylaşılır, değiştirilmemelidir.
+    """
+    profiles = profile_cache.get_many(user_ids)
+    missing = [user_id for user_id in user_ids if user_id not in profiles]
+    if missing:
+        token = profile_cache.token()
+        columns = PROFILE_FIELDS if profile_cache.enabled else dict.fromkeys(["id", *fields])
+        result = await db.execute(select(*(getattr(User, column) for column in columns)).where(User.id.in_(missing)))
+        loaded = {row.id: dict(row._mapping) for row in result}
+        profile_cache.fill(loaded, token)
+        profiles.update(loaded)
+    return profiles
@@ -0,0 +1,147 @@
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional
+
+
+class WriteBehindWriter:
+    """
+    ORM nesnelerini tamponda toplayıp kısa aralıklarla tek bir transaction'da toplu yazan yazıcı.
+
+    Her `submit` çağrısı bir Future döndürür; Future, nesneler commit edildikten sonra
+    `serialize` çıktılarıyla (ör. veritabanı kimlikleri atanmış yanıt modelleri) tamamlanır.
+    Böylece aynı aralıkta gelen tüm sohbet turları tek bir commit'i (ve tek bir fsync'i)
+    paylaşır, çağıranlar da yine kaydedilmiş satırları geri alır.
+
+    Tampon `flush_interval_ms` dolduğunda veya `max_batch_size` nesneye ulaştığında yazılır.
+    `stop` çağrıldığında tamponda kalan her şey yazılmadan dönülmez.
+
+    Parametreler:
+    - session_factory (Callable): Yeni bir SQLAlchemy oturumu döndüren fonksiyon.
+    - serialize (Callable): Flush edilmiş bir nesneyi çağırana döndürülecek değere çevirir.
+    - flush_interval_ms (float): Tamponun en uzun bekleme süresi.
+    - max_batch_size (int): Beklemeden yazmayı tetikleyen nesne sayısı.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable,
+        serialize: Callable[[Any], Any],
+        flush_interval_ms: float = 50.0,
+        max_batch_size: int = 500,
+    ):
+        self.session_factory = session_factory
+        self.serialize = serialize
+        self.flush_interval_ms = flush_interval_ms
+        self.max_batch_size = max_batch_size
+        self.flushes = 0
+        self.written = 0
+        self._pending: List[tuple] = []
+        self._pending_count = 0
+        self._condition = threading.Condition()
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Tamponda kalanları yazar ve yazıcı thread'ini durdurur."""
+        if not self.running:
+            return
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+        self._thread.join()
+        self._thread = None
+
+    def submit(self, objects: List[Any]) -> Future:
+        """
+        Nesneleri bir sonraki toplu yazıma ekler.
+
+        Dönen Değer:
+        - Future: Commit sonrası `serialize` edilmiş nesnelerin listesi; yazım başarısız
+          olursa aynı hatayı fırlatır. Toplu yazım başarısız olursa her çağıranın nesneleri
+          ayrı bir transaction'da yeniden denenir; böylece hata yalnızca hatalı nesneleri
+          gönderen çağırana döner.
+
+        Hata Durumları:
+        - Yazıcı çalışmıyorsa RuntimeError fırlatır.
+        """
+        future = Future()
+        with self._condition:
+            if not self.running or self._stopping:
+                raise RuntimeError("Write-behind writer is not running")
+            # İlk kayıt bekleme süresini başlatır, boyut sınırı ise beklemeden yazmayı tetikler
+            first = not self._pending
+            self._pending.append((objects, future))
+            self._pending_count += len(objects)
+            if first or self._pending_count >= self.max_batch_size:
+                self._condition.notify()
+        return future
+
+    def _run(self):
+        while True:
+            with self._condition:
+                if not self._pending and not self._stopping:
+                    self._condition.wait()
+                if self._pending and not self._stopping and self._pending_count < self.max_batch_size:
+                    # İlk kayıttan sonra tamponun dolması için kısa bir süre beklenir
+                    deadline = time.monotonic() + self.flush_interval_ms / 1000
+                    while not self._stopping and self._pending_count < self.max_batch_size:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._condition.wait(remaining)
+                batch, self._pending, self._pending_count = self._pending, [], 0
+                stopping = self._stopping
+            if batch:
+                self._flush(batch)
+            if stopping:
+                with self._condition:
+                    if not self._pending:
+                        return
+
+    def _write(self, batch: List[tuple]) -> List[List[Any]]:
+        with self.session_factory() as db:
+            db.add_all([obj for objects, _ in batch for obj in objects])
+            db.flush()
+            # Commit nesneleri expire ettiğinden sonuçlar commit'ten önce alınır
+            results = [[self.serialize(obj) for obj in objects] for objects, _ in batch]
+            db.commit()
+        return results
+
+    def _flush(self, batch: List[tuple]):
+        try:
+            results = self._write(batch)
+        except Exception as e:
+            if len(batch) == 1:
+                batch[0][1].set_exception(e)
+                return
+            # Transaction geri alındı; tek bir hatalı satır diğer çağıranları düşürmesin diye
+            # her çağıranın nesneleri ayrı ayrı yeniden yazılır ve hata yalnızca sahibine iletilir
+            for item in batch:
+                self._flush([item])
+            return
+        self.flushes += 1
+        self.written += sum(len(objects) for objects, _ in batch)
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
+
+    def stats(self) -> dict:
+        with self._condition:
+            pending = self._pending_count
+        return {
+            "running": self.running,
+            "pending": pending,
+            "flushes": self.flushes,
+            "written": self.written,
+        }
@@ -0,0 +1,51 @@
+import os
+import sys
+import tempfile
+import uuid
+
+import pytest
+
+# Uygulama modülleri yapılandırmayı import sırasında okur; ortam değişkenleri önce ayarlanır
+_workdir = tempfile.mkdtemp(prefix="x_app_tests_")
+os.environ.update(
+    DATABASE_URL=f"sqlite:///{os.path.join(_workdir, 'test.db')}",
+    DB_AUTO_MIGRATE="true",
+    AUTH_SECRET_KEY="test-secret",
+    AUTH_ALGORITHM="HS256",
+    BCRYPT_ROUNDS="4",
+    MEDIA_STORAGE_BACKEND="local",
+    MEDIA_ROOT=os.path.join(_workdir, "media"),
+    CHAT_MODEL_PATH=os.path.join(_workdir, "missing-model.pt"),
+)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+import main  # noqa: E402
+
+PASSWORD = "test-password"
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(main.app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def create_user(client):
+    """Benzersiz adla kullanıcı oluşturup giriş yapar; `(id, giriş yanıtı)` döndürür."""
+
+    def create():
+        username = f"user_{uuid.uuid4().hex[:12]}"
+        assert client.post("/auth/", json={"username": username, "password": PASSWORD}).status_code == 201
+        response = client.post("/auth/token", data={"username": username, "password": PASSWORD})
+        assert response.status_code == 200
+        login = response.json()
+        return login["user"]["id"], login
+
+    return create
+
+
+def auth_headers(login: dict) -> dict:
+    return {"Authorization": f"Bearer {login['access_token']}"}
@@ -0,0 +1,50 @@
+from conftest import auth_headers
+
+
+def send(client, sender, receiver_id):
+    sender_id, login = sender
+    response = client.post(
+        "/messages/",
+        json={"sender_id": sender_id, "receiver_id": receiver_id, "content": "hi"},
+        headers=auth_headers(login),
+    )
+    assert response.status_code == 200
+    return response.json()["id"]
+
+
+def delete(client, user, message_id):
+    assert client.delete(f"/messages/{message_id}", headers=auth_headers(user[1])).status_code == 200
+
+
+def unread_count(client, user, partner_id):
+    response = client.get("/messages/conversations", headers=auth_headers(user[1]))
+    assert response.status_code == 200
+    counts = {item["partner_id"]: item["unread_count"] for item in response.json()["items"]}
+    return counts[partner_id]
+
+
+def test_unread_count_survives_reused_message_id(client, create_user):
+    sender, receiver = create_user(), create_user()
+    for _ in range(3):
+        last_id = send(client, sender, receiver[0])
+    response = client.post(f"/messages/conversations/{sender[0]}/read", headers=auth_headers(receiver[1]))
+    assert response.status_code == 200
+
+    # SQLite silinen en büyük kimliği yeni mesaja yeniden verir
+    delete(client, sender, last_id)
+    reused_id = send(client, sender, receiver[0])
+    assert reused_id == last_id
+    assert unread_count(client, receiver, sender[0]) == 1
+
+    delete(client, sender, reused_id)
+    assert unread_count(client, receiver, sender[0]) == 0
+
+
+def test_deleting_read_message_keeps_unread_count(client, create_user):
+    sender, receiver = create_user(), create_user()
+    read_id = send(client, sender, receiver[0])
+    client.post(f"/messages/conversations/{sender[0]}/read", headers=auth_headers(receiver[1]))
+    send(client, sender, receiver[0])
+
+    delete(client, sender, read_id)
+    assert unread_count(client, receiver, sender[0]) == 1
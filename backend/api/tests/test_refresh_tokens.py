@@ -0,0 +1,106 @@
+import asyncio
+from datetime import timedelta
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from config.database import SQL_ALCHEMY_URL, create_async_db_engine, to_async_url
+from conftest import auth_headers
+from models.mixins import utc_now
+from models.refresh_token import RefreshToken
+from routes.auth import create_refresh_token, decode_refresh_token, refresh_token_expiry
+from services.refresh_tokens import issue_refresh_token, rotate_refresh_token
+
+
+def refresh(client, refresh_token):
+    return client.post("/auth/refresh", json={"refresh_token": refresh_token})
+
+
+def run_with_sessions(count, work):
+    """`work`'ü test için açılan ayrı engine üzerindeki `count` oturumla çalıştırır."""
+
+    async def run():
+        engine = create_async_db_engine(to_async_url(SQL_ALCHEMY_URL))
+        sessionmaker = async_sessionmaker(engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+        try:
+            sessions = [sessionmaker() for _ in range(count)]
+            try:
+                return await work(*sessions)
+            finally:
+                for session in sessions:
+                    await session.close()
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(run())
+
+
+def test_refresh_rotates_token(client, create_user):
+    _, login = create_user()
+    response = refresh(client, login["refresh_token"])
+    assert response.status_code == 200
+    rotated = response.json()
+    assert rotated["refresh_token"] != login["refresh_token"]
+    assert client.get("/auth/me", headers=auth_headers(rotated)).status_code == 200
+
+
+def test_reused_refresh_token_revokes_family(client, create_user):
+    _, login = create_user()
+    rotated = refresh(client, login["refresh_token"]).json()
+
+    assert refresh(client, login["refresh_token"]).status_code == 401
+    # Tekrar kullanım ailenin tamamını iptal eder; meşru istemcinin son token'ı da geçersizdir
+    assert refresh(client, rotated["refresh_token"]).status_code == 401
+
+
+def test_concurrent_refresh_has_single_winner(client, create_user):
+    user_id, login = create_user()
+    jti = decode_refresh_token(login["refresh_token"])["jti"]
+
+    async def rotate_concurrently(first, second):
+        async def rotate(db):
+            token = await rotate_refresh_token(db, jti, user_id, refresh_token_expiry())
+            await db.commit()
+            return token
+
+        # İkinci istek token'ı, birincinin işlemi henüz commit edilmemişken okur ve iptal
+        # UPDATE'inde birincinin yazma kilidini bekler
+        winner = await rotate_refresh_token(first, jti, user_id, refresh_token_expiry())
+        loser = asyncio.create_task(rotate(second))
+        await asyncio.sleep(0.2)
+        await first.commit()
+        results = [winner, await loser]
+        family_id = (await first.get(RefreshToken, jti)).family_id
+        family = (await first.execute(select(RefreshToken).where(RefreshToken.family_id == family_id))).scalars()
+        return results, list(family)
+
+    results, family = run_with_sessions(2, rotate_concurrently)
+    winners = [token for token in results if token is not None]
+    assert len(winners) == 1
+    assert len(family) == 2
+    assert [token.jti for token in family if token.revoked_at is None] == [winners[0].jti]
+
+
+def test_expired_refresh_token_is_rejected(client, create_user):
+    user_id, login = create_user()
+    username = login["user"]["username"]
+    jti = decode_refresh_token(login["refresh_token"])["jti"]
+    expired_jwt = create_refresh_token(username, user_id, jti, utc_now() - timedelta(seconds=1))
+    assert refresh(client, expired_jwt).status_code == 401
+
+    # İmza hâlâ geçerli olsa da sunucu tarafındaki kaydın süresi dolduysa reddedilir
+    async def issue_expired(db):
+        token = issue_refresh_token(db, user_id, utc_now() - timedelta(seconds=1))
+        await db.commit()
+        return token.jti
+
+    expired_jti = run_with_sessions(1, issue_expired)
+    unexpired_jwt = create_refresh_token(username, user_id, expired_jti, refresh_token_expiry())
+    assert refresh(client, unexpired_jwt).status_code == 401
+
+
+def test_refresh_token_is_not_an_access_token(client, create_user):
+    _, login = create_user()
+    headers = {"Authorization": f"Bearer {login['refresh_token']}"}
+    assert client.get("/auth/me", headers=headers).status_code == 401
+    assert client.get("/users/me", headers=headers).status_code == 401
@@ -0,0 +1,31 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from config.database import Base
+from models.chat_message import ChatMessage
+from models.user import User
+from services.write_behind import WriteBehindWriter
+
+
+@pytest.fixture
+def writer():
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine, tables=[User.__table__, ChatMessage.__table__])
+    writer = WriteBehindWriter(sessionmaker(bind=engine), serialize=lambda message: message.id, flush_interval_ms=200)
+    writer.start()
+    yield writer
+    writer.stop()
+
+
+def test_failed_row_only_fails_its_caller(writer):
+    valid = writer.submit([ChatMessage(sender="user", user_id=1, text="hi")])
+    invalid = writer.submit([ChatMessage(sender="user", user_id=1, text=None)])
+    other = writer.submit([ChatMessage(sender="bot", user_id=1, text="hello")])
+
+    assert len(valid.result(timeout=5)) == 1
+    assert len(other.result(timeout=5)) == 1
+    with pytest.raises(Exception):
+        invalid.result(timeout=5)
+    assert writer.stats()["written"] == 2
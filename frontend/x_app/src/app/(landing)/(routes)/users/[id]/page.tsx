@@ -172,14 +172,15 @@ interface UserTweetsProps {
 
 function UserTweets({ user }: UserTweetsProps) {
   const [tweets, setTweets] = useState<Tweet[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
 
   useEffect(() => {
     const fetchUsersTweets = async () => {
       if (user.id) {
         try {
-          const userTweets = await getUserTweets(Number(user.id));
-          setTweets(userTweets);
-          console.log(tweets);
+          const page = await getUserTweets(Number(user.id));
+          setTweets(page.items);
+          setNextCursor(page.next_cursor);
         } catch (error) {
           console.error("Error fetching tweets: ", error);
           throw error;
@@ -189,6 +190,17 @@ function UserTweets({ user }: UserTweetsProps) {
     fetchUsersTweets();
   }, [user.id]);
 
+  const loadMore = async () => {
+    if (!nextCursor) return;
+    try {
+      const page = await getUserTweets(Number(user.id), nextCursor);
+      setTweets((previous) => [...previous, ...page.items]);
+      setNextCursor(page.next_cursor);
+    } catch (error) {
+      console.error("Error fetching tweets: ", error);
+    }
+  };
+
   return (
     <div className="mt-10 px-5">
       {tweets.map((tweet) => (
@@ -245,6 +257,7 @@ function UserTweets({ user }: UserTweetsProps) {
           </div>
         </div>
       ))}
+      {nextCursor && <button onClick={loadMore}>Daha fazla</button>}
     </div>
   );
 }
@@ -1,6 +1,6 @@
 "use client";
 
-import React, { useState, useEffect, createContext } from "react";
+import React, { useState, useEffect, useRef, createContext } from "react";
 import axios from "axios";
 import { useRouter } from "next/navigation";
 import { jwtDecode } from "jwt-decode";
@@ -22,6 +22,11 @@ interface User {
   bio: string | null;
 }
 
+const REFRESH_URL = "http://localhost:8000/auth/refresh";
+const LOGOUT_URL = "http://localhost:8000/auth/logout";
+// Erişim token'ı süresi dolmadan bu kadar önce yenilenir (ms)
+const REFRESH_MARGIN_MS = 30 * 1000;
+
 export const AuthContext = createContext<AuthContextType | null>(null);
 
 interface AuthProviderProps {
@@ -34,21 +39,39 @@ export const AuthProvider: React.FC<AuthProviderProps> = ({ children }) => {
   const [token, setToken] = useState<string | null>(null);
   const router = useRouter();
 
-  const refreshToken = async () => {
-    try {
-      const response = await axios.post("/api/refresh-token", { token });
-      const { token: newToken, user: newUser } = response.data;
-
-      localStorage.setItem("token", newToken);
-      localStorage.setItem("user", JSON.stringify(newUser));
-
-      setToken(newToken);
-      setUser(newUser);
-      setIsAuthenticated(true);
-    } catch (error) {
-      console.error("Token yenileme hatası", error);
-      logout();
+  const refreshPromise = useRef<Promise<string | null> | null>(null);
+
+  /**
+   * Saklanan yenileme token'ı ile yeni bir erişim token'ı alır.
+   * Yenileme token'ı her kullanımda değiştiği için aynı anda tek bir istek gönderilir;
+   * eşzamanlı çağrılar aynı isteğin sonucunu bekler.
+   */
+  const refreshToken = (): Promise<string | null> => {
+    if (!refreshPromise.current) {
+      refreshPromise.current = (async () => {
+        try {
+          const response = await axios.post(REFRESH_URL, {
+            refresh_token: localStorage.getItem("refreshToken"),
+          });
+          const { access_token: newToken, refresh_token: newRefreshToken } = response.data;
+
+          localStorage.setItem("token", newToken);
+          localStorage.setItem("refreshToken", newRefreshToken);
+          axios.defaults.headers.common["Authorization"] = `Bearer ${newToken}`;
+
+          setToken(newToken);
+          setIsAuthenticated(true);
+          return newToken;
+        } catch (error) {
+          console.error("Token yenileme hatası", error);
+          logout();
+          return null;
+        } finally {
+          refreshPromise.current = null;
+        }
+      })();
     }
+    return refreshPromise.current;
   };
 
   useEffect(() => {
@@ -63,13 +86,17 @@ export const AuthProvider: React.FC<AuthProviderProps> = ({ children }) => {
 
     const interceptor = axios.interceptors.request.use(
       async (config) => {
-        if (token) {
+        // Yenileme ve çıkış istekleri erişim token'ı yerine yenileme token'ı taşır
+        if (token && config.url !== REFRESH_URL && config.url !== LOGOUT_URL) {
+          let accessToken: string | null = token;
           const tokenExpiration =
             (jwtDecode<{ exp: number }>(token) as { exp: number }).exp * 1000;
-          if (Date.now() >= tokenExpiration) {
-            await refreshToken();
+          if (Date.now() >= tokenExpiration - REFRESH_MARGIN_MS) {
+            accessToken = await refreshToken();
+          }
+          if (accessToken) {
+            config.headers.Authorization = `Bearer ${accessToken}`;
           }
-          config.headers.Authorization = `Bearer ${token}`;
         }
         return config;
       },
@@ -102,6 +129,7 @@ export const AuthProvider: React.FC<AuthProviderProps> = ({ children }) => {
 
       // Token'i ve kullanıcı bilgilerini ayrı sakla
       localStorage.setItem("token", accessToken);
+      localStorage.setItem("refreshToken", response.data.refresh_token);
       localStorage.setItem("user", JSON.stringify(user));
 
       axios.defaults.headers.common["Authorization"] = `Bearer ${accessToken}`;
@@ -116,7 +144,15 @@ export const AuthProvider: React.FC<AuthProviderProps> = ({ children }) => {
   };
 
   const logout = (): void => {
+    const storedRefreshToken = localStorage.getItem("refreshToken");
+    if (storedRefreshToken) {
+      // Oturum sunucuda da kapatılır; başarısız olsa bile yerel oturum temizlenir
+      axios
+        .post(LOGOUT_URL, { refresh_token: storedRefreshToken })
+        .catch(() => undefined);
+    }
     localStorage.removeItem("token");
+    localStorage.removeItem("refreshToken");
     localStorage.removeItem("user");
     delete axios.defaults.headers.common["Authorization"];
     setToken(null);
@@ -14,12 +14,16 @@ const Chatbot: React.FC = () => {
   const { user: currentUser } = useContext(AuthContext) || {};
   const [messages, setMessages] = useState<Message[]>([]);
   const [input, setInput] = useState("");
+  const [beforeCursor, setBeforeCursor] = useState<string | null>(null);
+  const [hasMore, setHasMore] = useState(false);
 
   useEffect(() => {
     const fetchMessages = async () => {
       try {
-        const chatMessages = await getChatMessages();
-        setMessages(chatMessages);
+        const page = await getChatMessages();
+        setMessages(page.items);
+        setBeforeCursor(page.before_cursor);
+        setHasMore(page.has_more);
       } catch (error) {
         console.error("Error fetching chat messages:", error);
       }
@@ -27,6 +31,18 @@ const Chatbot: React.FC = () => {
     fetchMessages();
   }, []);
 
+  const loadOlderMessages = async () => {
+    if (!hasMore || !beforeCursor) return;
+    try {
+      const page = await getChatMessages(beforeCursor);
+      setMessages((prevMessages) => [...page.items, ...prevMessages]);
+      setBeforeCursor(page.before_cursor);
+      setHasMore(page.has_more);
+    } catch (error) {
+      console.error("Error fetching chat messages:", error);
+    }
+  };
+
   const handleSendMessage = async () => {
     if (input.trim() === "") return;
 
@@ -58,6 +74,13 @@ const Chatbot: React.FC = () => {
 
         {/* Messages */}
         <div className="flex-1 overflow-y-auto p-4 space-y-3">
+          {hasMore && (
+            <div className="flex justify-center">
+              <button onClick={loadOlderMessages} className="text-sm text-blue-600 hover:underline">
+                Daha eski mesajlar
+              </button>
+            </div>
+          )}
           {messages.map((message, index) => (
             <div
               key={index}
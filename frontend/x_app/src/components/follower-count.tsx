@@ -1,14 +1,13 @@
 "use client";
 
 import { useEffect, useState } from "react";
-import { getFollowers } from "@/lib/userService";
+import { getUserStats } from "@/lib/userService";
 
 interface FollowerCountProps {
   userId: number;
 }
 
 export default function FollowerCount({ userId }: FollowerCountProps) {
-  const [followers, setFollowers] = useState<any[]>([]);
   const [loading, setLoading] = useState<boolean>(true);
   const [error, setError] = useState<string | null>(null);
   const [followerCount, setFollowerCount] = useState<number>(0);
@@ -16,9 +15,8 @@ export default function FollowerCount({ userId }: FollowerCountProps) {
   useEffect(() => {
     const fetchFollowers = async () => {
       try {
-        const followersData = await getFollowers(userId);
-        setFollowers(followersData);
-        setFollowerCount(followersData.length);
+        const stats = await getUserStats(userId);
+        setFollowerCount(stats.follower_count);
       } catch (error) {
         setError("Kullanıcıları yüklerken hata oluştu.");
       } finally {
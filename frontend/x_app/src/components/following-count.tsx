@@ -1,14 +1,13 @@
 "use client";
 
 import { useEffect, useState } from "react";
-import { getFollowings } from "@/lib/userService";
+import { getUserStats } from "@/lib/userService";
 
 interface FollowingCountProps {
   userId: number;
 }
 
 export default function FollowingCount({ userId }: FollowingCountProps) {
-  const [followings, setFollowings] = useState<any[]>([]);
   const [loading, setLoading] = useState<boolean>(true);
   const [error, setError] = useState<string | null>(null);
   const [followingCount, setFollowingCount] = useState<number>(0);
@@ -16,9 +15,8 @@ export default function FollowingCount({ userId }: FollowingCountProps) {
   useEffect(() => {
     const fetchFollowings = async () => {
       try {
-        const followingsData = await getFollowings(userId);
-        setFollowings(followingsData);
-        setFollowingCount(followingsData.length);
+        const stats = await getUserStats(userId);
+        setFollowingCount(stats.following_count);
       } catch (error) {
         setError("Takip edilenleri yüklerken hata oluştu.");
       } finally {
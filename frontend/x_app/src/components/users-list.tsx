@@ -4,23 +4,23 @@ import { fetchUsers } from "@/lib/userService";
 interface User {
   id: number;
   username: string;
-  email: string;
   first_name: string | null;
   last_name: string | null;
-  bio: string | null;
   profile: string | null;
 }
 
 const UsersList: React.FC = () => {
   const [users, setUsers] = useState<User[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [loading, setLoading] = useState<boolean>(true);
   const [error, setError] = useState<string | null>(null);
 
   useEffect(() => {
     const loadUsers = async () => {
       try {
-        const usersData = await fetchUsers();
-        setUsers(usersData);
+        const page = await fetchUsers();
+        setUsers(page.items);
+        setNextCursor(page.next_cursor);
         setLoading(false);
       } catch (error) {
         setError("Kullanıcıları yüklerken hata oluştu.");
@@ -30,6 +30,17 @@ const UsersList: React.FC = () => {
     loadUsers();
   }, []);
 
+  const loadMore = async () => {
+    if (!nextCursor) return;
+    try {
+      const page = await fetchUsers(nextCursor);
+      setUsers((previous) => [...previous, ...page.items]);
+      setNextCursor(page.next_cursor);
+    } catch (error) {
+      setError("Kullanıcıları yüklerken hata oluştu.");
+    }
+  };
+
   if (loading) {
     return <div>Loading...</div>;
   }
@@ -44,10 +55,13 @@ const UsersList: React.FC = () => {
       <ul>
         {users.map((user) => (
           <li key={user.id}>
-            {user.username} - {user.email}
+            {user.username}
+            {(user.first_name || user.last_name) &&
+              ` - ${[user.first_name, user.last_name].filter(Boolean).join(" ")}`}
           </li>
         ))}
       </ul>
+      {nextCursor && <button onClick={loadMore}>Daha fazla</button>}
     </div>
   );
 };
@@ -1,13 +1,15 @@
 import { api } from "./api";
 
-export const getChatMessages = async () => {
+export const getChatMessages = async (before?: string) => {
     try {
         const response = await api.get("/chat_messages", {
+            params: { before },
             headers: {
                 Authorization: `Bearer ${localStorage.getItem("token")}`
             }
         })
 
+        // Sayfa: { items, has_more, before_cursor, after_cursor }; mesajlar kronolojik sıradadır
         return response.data;
     } catch (err) {
         console.error("Mesajı alırken hata oluştu:", err)
@@ -2,15 +2,17 @@ import { api } from "./api";
 
 /**
  * Tweet'leri almak için kullanılan fonksiyon.
- * Bu fonksiyon, API'ye GET isteği göndererek tüm tweet'leri alır.
+ * Bu fonksiyon, API'ye GET isteği göndererek tweet'lerin bir sayfasını (en yeniden eskiye) alır.
  * Authorization başlığında kullanıcı token'ı kullanılır.
  * 
- * @returns {Promise<Array>} Tweet'lerin listesi
+ * @param {string} [cursor] - Önceki sayfanın `next_cursor` değeri; verilmezse ilk sayfa alınır
+ * @returns {Promise<{ items: any[], next_cursor: string | null }>} Tweet'ler ve sonraki sayfanın imleci
  * @throws {Error} API isteği sırasında oluşabilecek hatalar
  */
-export const fetchTweets = async () => {
+export const fetchTweets = async (cursor?: string) => {
     try {
         const response = await api.get("/tweets", {
+            params: { cursor },
             headers: {
                 Authorization: `Bearer ${localStorage.getItem("token")}`,  // Token başlıkta eklenir
                 "Content-Type": "application/json"
@@ -23,20 +25,47 @@ export const fetchTweets = async () => {
     }
 }
 
+/**
+ * Ana sayfa akışını almak için kullanılan fonksiyon.
+ * Bu fonksiyon, oturum açmış kullanıcının takip ettiği kişilerin ve kendisinin tweet'lerinden
+ * oluşan akışın bir sayfasını (en yeniden eskiye) alır.
+ * 
+ * @param {string} [cursor] - Önceki sayfanın `next_cursor` değeri; verilmezse ilk sayfa alınır
+ * @returns {Promise<{ items: any[], next_cursor: string | null }>} Akıştaki tweet'ler ve sonraki sayfanın imleci
+ * @throws {Error} API isteği sırasında oluşabilecek hatalar
+ */
+export const fetchFeed = async (cursor?: string) => {
+    try {
+        const response = await api.get("/tweets/feed", {
+            params: { cursor },
+            headers: {
+                Authorization: `Bearer ${localStorage.getItem("token")}`,  // Token başlıkta eklenir
+                "Content-Type": "application/json"
+            }
+        })
+        return response.data;
+    } catch (err) {
+        console.error("Akış alınırken hata oluştu", err)
+        throw err;
+    }
+}
+
 /**
  * Kullanıcının tweet'lerini almak için kullanılan fonksiyon.
  * Bu fonksiyon, API'ye GET isteği göndererek belirli bir kullanıcının tweet'lerini alır.
  * Kullanıcı ID'si URL parametresi olarak gönderilir ve Authorization başlığında kullanıcı token'ı kullanılır.
  * 
  * @param {Number} userId - Kullanıcının ID'si
- * @returns {Promise<Array>} Kullanıcının tweet'lerinin listesi
+ * @param {string} [cursor] - Önceki sayfanın `next_cursor` değeri; verilmezse ilk sayfa alınır
+ * @returns {Promise<{ items: any[], next_cursor: string | null }>} Kullanıcının tweet'leri ve sonraki sayfanın imleci
  * @throws {Error} API isteği sırasında oluşabilecek hatalar
  */
-export const getUserTweets = async (userId: Number) => {
+export const getUserTweets = async (userId: Number, cursor?: string) => {
     try {
         const response = await api.get("/tweets/my_tweets", {
             params: {
                 current_user_id: userId,  // Kullanıcı ID'si URL parametresi olarak gönderilir
+                cursor,
             },
             headers: {
                 Authorization: `Bearer ${localStorage.getItem("token")}`,  // Token başlıkta eklenir
@@ -3,21 +3,22 @@ import { api } from "@/lib/api";
 /**
  * Kullanıcıların listesini alır.
  * 
- * Bu fonksiyon, backend API'den kullanıcıların listesini çeker.
+ * Bu fonksiyon, backend API'den kullanıcı dizininin bir sayfasını çeker.
  * Authorization başlığı ile token'ı kullanarak doğrulama yapılır.
  * 
- * @returns {Promise<any>} API'den dönen kullanıcılar verisi.
+ * @param {string} [cursor] - Önceki sayfanın `next_cursor` değeri; verilmezse ilk sayfa alınır.
+ * @returns {Promise<{ items: any[], next_cursor: string | null }>} Kullanıcılar ve sonraki sayfanın imleci.
  * @throws {Error} Eğer API'den veri çekme sırasında bir hata oluşursa, hata fırlatılır.
  */
-export const fetchUsers = async () => {
+export const fetchUsers = async (cursor?: string) => {
   try {
     const response = await api.get("/users/users", {
+      params: { cursor },
       headers: {
         Authorization: `Bearer ${localStorage.getItem("token")}`,
         "Content-Type": "application/json"
       }
     })
-    console.log(response.data)
     return response.data;
   } catch (error) {
     console.error("Kullanıcıları alırken hata oluştu.", error)
@@ -50,6 +51,38 @@ export const getUserById = async (userId: string) => {
   }
 }
 
+/**
+ * Birden fazla kullanıcıyı tek istekte getirmek için kullanılan fonksiyon.
+ * 
+ * Avatar ve kart gibi birçok kullanıcı gösteren bileşenler her kullanıcı için ayrı
+ * `getUserById` isteği atmak yerine bu fonksiyonu kullanır.
+ * 
+ * @param {number[]} userIds - İstenen kullanıcıların ID'leri.
+ * @param {string[]} [fields] - Yalnızca bu alanlar döner (ör. ["username", "profile"]); verilmezse tüm profil alanları.
+ * @returns {Promise<Record<string, any>>} Kullanıcı ID'sinden kullanıcı alanlarına bir eşleme; bulunamayanlar yer almaz.
+ * @throws {Error} API isteği sırasında oluşabilecek hatalar
+ */
+export const getUsersByIds = async (userIds: number[], fields?: string[]) => {
+  try {
+    const response = await api.get("/users/batch", {
+      params: {
+        ids: userIds,
+        fields: fields?.join(",")
+      },
+      // Sunucu `ids=1&ids=2` biçimini bekler (`ids[]=` değil)
+      paramsSerializer: { indexes: null },
+      headers: {
+        Authorization: `Bearer ${localStorage.getItem("token")}`,
+        "Content-Type": "application/json"
+      }
+    });
+    return response.data;
+  } catch (error) {
+    console.error("Kullanıcıları alırken hata oluştu.", error)
+    throw error;
+  }
+}
+
 interface FollowResponse {
   message: string;
 }
@@ -180,6 +213,30 @@ export async function getFollowings(user_id: number) {
   }
 }
 
+/**
+ * Bir kullanıcının takipçi, takip edilen ve tweet sayılarını getirir.
+ * 
+ * Sayılar, listeler çekilmeden sunucudaki sayaçlardan okunur.
+ * 
+ * @param {number} userId - Sayıları çekilecek kullanıcının ID'si.
+ * @returns {Promise<{ follower_count: number, following_count: number, tweet_count: number }>} Kullanıcının sayaçları.
+ * @throws {Error} Eğer sayılar çekilirken bir hata oluşursa, hata fırlatılır.
+ */
+export async function getUserStats(userId: number) {
+  try {
+    const response = await api.get(`/users/${userId}/stats`, {
+      headers: {
+        Authorization: `Bearer ${localStorage.getItem("token")}`,
+        "Content-Type": "application/json"
+      }
+    })
+    return response.data;
+  } catch (error: any) {
+    console.error("Error fetching user stats: ", error)
+    throw error;
+  }
+}
+
 /**
  * Kullanıcının başka bir kullanıcıyı takip edip etmediğini kontrol eder.
  * 
@@ -210,6 +267,37 @@ export const checkIfUserIsFollowing = async (userId: number, currentUserId: numb
   }
 }
 
+/**
+ * Oturum açmış kullanıcının birden fazla kullanıcıyla olan takip durumlarını tek istekte getirir.
+ * 
+ * Kullanıcı listelerinde her takip butonu için ayrı `is-following` isteği atmak yerine kullanılır.
+ * 
+ * @param {number} currentUserId - Takip durumlarını soran kullanıcının ID'si.
+ * @param {number[]} userIds - Takip durumu sorulan kullanıcıların ID'leri.
+ * @returns {Promise<Array<{ user_id: number, is_following: boolean, is_followed_by: boolean }>>} Kullanıcı başına takip durumları.
+ * @throws {Error} Eğer takip durumları çekilirken bir hata oluşursa, hata fırlatılır.
+ */
+export async function getRelationships(currentUserId: number, userIds: number[]) {
+  try {
+    const response = await api.get("/users/relationships", {
+      params: {
+        current_user_id: currentUserId,
+        ids: userIds
+      },
+      // Sunucu `ids=1&ids=2` biçimini bekler (`ids[]=` değil)
+      paramsSerializer: { indexes: null },
+      headers: {
+        Authorization: `Bearer ${localStorage.getItem("token")}`,
+        "Content-Type": "application/json"
+      }
+    })
+    return response.data;
+  } catch (error: any) {
+    console.error("Error fetching relationships: ", error)
+    throw error;
+  }
+}
+
 interface UpdateUserData {
   username?: string;
   email?: string;